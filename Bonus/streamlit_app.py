@@ -1,73 +1,103 @@
+import hashlib, os, sys
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from source.offline import OfflineAnalysis
+from source.downsample import Downsample
+from source.ingest import BulkParser
+
+BUCKETS = 1500
 
 st.set_page_config(layout="wide", page_title="Temperature Analysis", page_icon="🌡️")
 st.title('Upload your temperature data')
 
-file_name = ''
+@st.cache_resource(max_entries=16)
+def parse_data(digest: str, _content: bytes) -> tuple:
+    """parse_data function to parse an upload once in bulk, keyed by the hash of its content"""
+    return BulkParser.parse(_content)
+
+@st.cache_data(max_entries=256)
+def analyse_data(digest: str, period: int, _data: np.ndarray) -> dict:
+    """analyse_data function to run the analysis in-process once per content hash and period"""
+    analysis = OfflineAnalysis(_data, period)
+    return {"weirdest": analysis.weirdest(), "switches": analysis.switch()}
+
+data = np.array([])
+digest = ''
 
 uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
 if uploaded_file:
     st.success('Your data was uploaded successfully')
-    
-    if uploaded_file is not None:
-        file_name = uploaded_file.name
+    content = uploaded_file.getvalue()
+    digest = hashlib.sha256(content).hexdigest()
+    data, rejected = parse_data(digest, content)
+    if rejected:
+        shown = ", ".join(map(str, rejected[:20])) + (", ..." if len(rejected) > 20 else "")
+        st.warning(f"{len(rejected)} lines are not numbers and were ignored: lines {shown}")
 else:
     st.warning('Please Upload your data before you proceed')
 
-data = []
-if uploaded_file is not None:
-    for line in uploaded_file:
-        try:
-            value = float(line.decode().strip())
-            data.append(value)
-        except ValueError:
-            pass
-        
 aberration_list = []
+period = None
 period_input = st.text_input('Enter a period')
 
 if period_input != '':
-    period = int(period_input)
-    os.system(f"python3 bonus.py {period} < {file_name}")
-
-    aberration_file = "file/aberration.txt"
-    with open(aberration_file, "r") as file:
-        for line in file:
-            aberration_list.append(float(line.strip()))
-
-    st.write("These are the aberrations in your data:", aberration_list)
-else:
+    try:
+        period = int(period_input)
+        if period < 0:
+            raise ValueError
+    except ValueError:
+        period = None
+        st.error("The period must be a positive integer")
+if period is not None and uploaded_file:
+    if len(data) == 0 or len(data) < period:
+        st.warning("Not enough data to compute the average")
+    else:
+        result = analyse_data(digest, period, data)
+        aberration_list = result["weirdest"]
+        st.write(f"Global tendency switched {result['switches']} times")
+        st.write("These are the aberrations in your data:", aberration_list)
+elif period_input == '':
     st.warning("Please enter a period")
 
-def plot_temparature(data, abbrev, period):
-    df = pd.DataFrame(data, columns=['Temperature'])
-    
+@st.cache_resource(max_entries=16)
+def bands(digest: str, period: int, _data: np.ndarray) -> pd.DataFrame:
+    """bands function to compute the moving average and the bollinger bands once per content hash and period"""
+    df = pd.DataFrame(_data, columns=['Temperature'])
     df['MA'] = df['Temperature'].rolling(window=period).mean()
     df['STD'] = df['Temperature'].rolling(window=period).std()
     df['Upper'] = df['MA'] + 2 * df['STD']
     df['Lower'] = df['MA'] - 2 * df['STD']
-    df['MA_shifted'] = df['MA'].shift(1)
-    df['Temperature_shifted'] = df['Temperature'].shift(1)
-    
-    df['Specified'] = df['Temperature'].where(df['Temperature'].isin(abbrev))
-    
+    return df
+
+def plot_temparature(data, abbrev, period, start, stop, method):
+    df = bands(digest, period, data)
+    specified = np.flatnonzero(np.isin(data, abbrev))
+    indexes = Downsample.select(data, BUCKETS, specified, start, stop, method)
+    view = df.iloc[indexes]
+    specified = specified[(specified >= start) & (specified < stop)]
+
     fig = go.Figure()
-    fig.add_trace(go.Scatter(y=df['Temperature'], mode='lines', name='Temperature', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(y=df['MA'], mode='lines', name='Moving Average', line=dict(color='green')))
-    fig.add_trace(go.Scatter(y=df['Upper'], mode='lines', name='Upper Bollinger Band', line=dict(color='red', dash='dash')))
-    fig.add_trace(go.Scatter(y=df['Lower'], mode='lines', name='Lower Bollinger Band', line=dict(color='red', dash='dash')))
-    fig.add_trace(go.Scatter(y=df['Specified'], mode='markers', name='Specified Temperatures', marker=dict(color='white', size=10)))
-    
+    fig.add_trace(go.Scattergl(x=indexes, y=view['Temperature'], mode='lines', name='Temperature', line=dict(color='blue')))
+    fig.add_trace(go.Scattergl(x=indexes, y=view['MA'], mode='lines', name='Moving Average', line=dict(color='green')))
+    fig.add_trace(go.Scattergl(x=indexes, y=view['Upper'], mode='lines', name='Upper Bollinger Band', line=dict(color='red', dash='dash')))
+    fig.add_trace(go.Scattergl(x=indexes, y=view['Lower'], mode='lines', name='Lower Bollinger Band', line=dict(color='red', dash='dash')))
+    fig.add_trace(go.Scattergl(x=specified, y=data[specified], mode='markers', name='Specified Temperatures', marker=dict(color='white', size=10)))
+
     fig.update_layout(autosize=True, margin=dict(l=0, r=0, t=30, b=0))
     st.plotly_chart(fig, use_container_width=True)
-    
+    st.caption(f"{len(indexes)} of {stop - start} points drawn")
+
 button = st.button('Plot Aberration and temperature', key='plot_button', help='Click to plot the aberration and temperature')
 if button:
-    if period_input == "":
+    st.session_state['plot'] = True
+if st.session_state.get('plot'):
+    if period is None:
         st.warning("Please enter a period")
-    else:
-        plot_temparature(data, aberration_list, period)
\ No newline at end of file
+    elif len(data) > 0:
+        start, stop = st.slider('Zoom on a range, drawn again at a higher resolution', 0, len(data), (0, len(data)))
+        method = st.radio('Downsampling', ('minmax', 'lttb'), horizontal=True)
+        if stop > start:
+            plot_temparature(data, aberration_list, period, start, stop, method)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+import itertools, json, multiprocessing, os, platform, random, resource, subprocess, sys, time
+from array import array
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from source.anomaly import Anomaly
+from source.window import RollingWindow
+from source.wizard import Groundhog, GroundhogError
+
+PERIODS = [7, 100, 1000, 10000]
+LENGTHS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+FULL = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+ENGINES = ("stream", "offline")
+LATENCIES = 1 << 20
+CHUNK = 1 << 16
+OFFLINE = 10 ** 7
+
+class Series:
+    """Series class to generate seeded synthetic series
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Random walk around a trend
+        2. The trend reverses at random points, so switches occur
+        3. Spikes of several standard deviations are injected, so there are
+        weird values to find
+
+    Methods
+    -------
+        walk(length: int, seed: int) -> Iterator[float]
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def walk(length: int, seed: int = 0, spikes: float = .001, reversals: float = .01):
+        """walk function to generate a random walk with spikes and trend reversals
+
+        Parameters
+        ----------
+            length (int): The number of values
+            seed (int): The seed of the generator
+            spikes (float): The probability of a spike at each value
+            reversals (float): The probability of a trend reversal at each value
+
+        Returns
+        -------
+            Iterator[float]: Return the values, rounded to 2 decimals like a temperature
+        """
+        rnd = random.Random(seed)
+        value, trend = 20.0, .05
+        for _ in range(length):
+            if rnd.random() < reversals:
+                trend = -trend
+            value += trend + rnd.gauss(0, 1)
+            spike = rnd.choice((-1, 1)) * rnd.uniform(5, 10) if rnd.random() < spikes else 0
+            yield round(value + spike, 2)
+
+class Benchmark:
+    """Benchmark class to measure the analysis engines
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Run every engine, period and length of the matrix in a fresh process,
+        so the peak memory of a case is its own
+        2. Measure the samples per second, the p50 and p99 latency of a sample
+        and the peak resident memory
+        3. Save the results as JSON and compare them with a previous run
+
+    Methods
+    -------
+        stream(period: int, length: int, seed: int) -> dict
+        offline(period: int, length: int, seed: int) -> dict
+        case(engine: str, period: int, length: int, seed: int) -> dict
+        compare(results: dict, previous: dict, tolerance: float) -> bool
+        run(args: list[str]) -> None
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def percentile(latencies: array, rank: float) -> float:
+        """percentile function to read a percentile of the latencies
+
+        Parameters
+        ----------
+            latencies (array): The latencies, in nanoseconds
+            rank (float): The percentile, between 0 and 100
+
+        Returns
+        -------
+            float: Return the percentile in microseconds, None without latencies
+        """
+        if not latencies:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * rank / 100))] / 1000
+
+    @staticmethod
+    def stream(period: int, length: int, seed: int) -> dict:
+        """stream function to measure the streaming engine of Groundhog
+
+        Parameters
+        ----------
+            period (int): The period of the analysis
+            length (int): The number of values
+            seed (int): The seed of the series
+
+        Logic
+        -----
+            1. Build the series in chunks of 2^16 values while the clock is
+            stopped, so neither the time nor the peak memory counts the input,
+            then time Groundhog.feed, which runs formating, and calculate_data,
+            which runs the bollinger normalization, for every value
+            2. Keep the latency of one value every length / 2^20, so the
+            measure does not grow with the series
+            3. Time the final report, which runs weirdest
+
+        Returns
+        -------
+            dict: Return the measures
+        """
+        groundhog = Groundhog()
+        groundhog.window = RollingWindow(period)
+        groundhog.anomaly = Anomaly()
+        groundhog.out = open(os.devnull, "w", buffering=1 << 20)
+        clock = time.perf_counter_ns
+        stride = max(1, length // LATENCIES)
+        latencies = array("q")
+        state = groundhog.calculate_data(period)
+        series = Series.walk(length, seed)
+        elapsed = 0
+        for first in range(0, length, CHUNK):
+            values = array("d", itertools.islice(series, CHUNK))
+            start = clock()
+            for i, value in enumerate(values, first):
+                before = clock()
+                groundhog.feed(value)
+                state = groundhog.calculate_data(period)
+                if i % stride == 0:
+                    latencies.append(clock() - before)
+            elapsed += clock() - start
+        before = clock()
+        try:
+            groundhog.report(*state)
+        except GroundhogError:
+            pass
+        report = clock() - before
+        groundhog.out.close()
+        return {"seconds": elapsed / 1e9, "samples_per_sec": length / elapsed * 1e9,
+            "p50_us": Benchmark.percentile(latencies, 50), "p99_us": Benchmark.percentile(latencies, 99),
+            "report_ms": report / 1e6}
+
+    @staticmethod
+    def offline(period: int, length: int, seed: int) -> dict:
+        """offline function to measure the offline engine
+
+        Parameters
+        ----------
+            period (int): The period of the analysis
+            length (int): The number of values
+            seed (int): The seed of the series
+
+        Logic
+        -----
+            1. Time the analysis, the formatting of every line and the report
+            2. The values are analysed together, so there is no latency per sample,
+            and the input is part of the peak memory of the engine
+
+        Returns
+        -------
+            dict: Return the measures
+        """
+        from source.offline import OfflineAnalysis
+        values = array("d", Series.walk(length, seed))
+        with open(os.devnull, "w", buffering=1 << 20) as out:
+            start = time.perf_counter_ns()
+            analysis = OfflineAnalysis(values, period)
+            for line in analysis.lines():
+                print(line, file=out)
+            analysis.switch()
+            analysis.weirdest()
+            elapsed = time.perf_counter_ns() - start
+        return {"seconds": elapsed / 1e9, "samples_per_sec": length / elapsed * 1e9,
+            "p50_us": None, "p99_us": None, "report_ms": None}
+
+    @staticmethod
+    def case(engine: str, period: int, length: int, seed: int) -> dict:
+        """case function to measure one case, in the process running it
+
+        Parameters
+        ----------
+            engine (str): The engine to measure
+            period (int): The period of the analysis
+            length (int): The number of values
+            seed (int): The seed of the series
+
+        Returns
+        -------
+            dict: Return the case and its measures
+        """
+        result = {"engine": engine, "period": period, "length": length}
+        result.update(getattr(Benchmark, engine)(period, length, seed))
+        result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return result
+
+    @staticmethod
+    def meta() -> dict:
+        """meta function to describe the machine and the revision measured
+
+        Returns
+        -------
+            dict: Return the description
+        """
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+        except OSError:
+            commit = ""
+        return {"python": platform.python_version(), "machine": platform.machine(),
+            "system": platform.system(), "cpus": os.cpu_count(), "commit": commit,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    @staticmethod
+    def compare(results: dict, previous: dict, tolerance: float) -> bool:
+        """compare function to display the throughput of each case against a previous run
+
+        Parameters
+        ----------
+            results (dict): The results of this run
+            previous (dict): The results of the previous run
+            tolerance (float): The slowdown allowed before a case is a regression
+
+        Returns
+        -------
+            bool: Return True if a case is slower than allowed
+        """
+        before = {(r["engine"], r["period"], r["length"]): r for r in previous["results"]}
+        regression = False
+        for result in results["results"]:
+            old = before.get((result["engine"], result["period"], result["length"]))
+            if old is None:
+                continue
+            ratio = result["samples_per_sec"] / old["samples_per_sec"]
+            slower = ratio < 1 - tolerance
+            regression |= slower
+            print(f'{result["engine"]}\tp={result["period"]}\tn={result["length"]}\t{ratio:.2f}x'
+                + ("\tregression" if slower else ""))
+        return regression
+
+    @staticmethod
+    def usage():
+        """
+        usage function to display the usage of the benchmarks
+        """
+        print("SYNOPSIS\n\tbenchmarks/bench.py [--periods list] [--lengths list] [--engines list] [--full]"
+            "\n\t\t[--seed n] [--output file] [--compare file] [--tolerance x]\nDESCRIPTION"
+            "\n\t--periods list the periods to measure, comma separated (7,100,1000,10000 by default)"
+            "\n\t--lengths list the stream lengths to measure (1e3 to 1e6 by default)"
+            "\n\t--full measure the lengths up to 1e8"
+            "\n\t--engines list the engines to measure (stream,offline by default, offline needs numpy"
+            " and stops at 1e7 values)"
+            "\n\t--seed n the seed of the series"
+            "\n\t--output file save the results as JSON"
+            "\n\t--compare file compare the throughput with a previous JSON, exit 84 on a regression"
+            "\n\t--tolerance x the slowdown allowed by --compare (0.1 by default)")
+
+    @staticmethod
+    def check_arg(args: list[str]) -> dict:
+        """check_arg function to parse the arguments
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if an argument is invalid
+
+        Returns
+        -------
+            dict: Return the options
+        """
+        options = {"periods": PERIODS, "lengths": LENGTHS, "engines": list(ENGINES), "seed": 0,
+            "output": "", "compare": "", "tolerance": .1}
+        args = iter(args)
+        try:
+            for arg in args:
+                if arg == "--full":
+                    options["lengths"] = FULL
+                elif arg in ("--periods", "--lengths"):
+                    options[arg[2:]] = list(int(float(x)) for x in next(args).split(","))
+                elif arg == "--engines":
+                    options["engines"] = next(args).split(",")
+                elif arg == "--seed":
+                    options["seed"] = int(next(args))
+                elif arg == "--tolerance":
+                    options["tolerance"] = float(next(args))
+                elif arg in ("--output", "--compare"):
+                    options[arg[2:]] = next(args)
+                else:
+                    raise GroundhogError("Invalid argument")
+        except (ValueError, StopIteration):
+            raise GroundhogError("Invalid argument")
+        if any(engine not in ENGINES for engine in options["engines"]):
+            raise GroundhogError("Invalid argument")
+        return options
+
+    @staticmethod
+    def run(args: list[str]) -> None:
+        """run function to measure the matrix and save the results
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Returns
+        -------
+            None
+        """
+        options = Benchmark.check_arg(args)
+        results = {"meta": Benchmark.meta(), "results": []}
+        context = multiprocessing.get_context("spawn")
+        for engine in options["engines"]:
+            if engine == "offline":
+                from source.offline import np
+                if np is None:
+                    continue
+            for period in options["periods"]:
+                for length in options["lengths"]:
+                    if engine == "offline" and length > OFFLINE:
+                        continue
+                    with context.Pool(1) as pool:
+                        result = pool.apply(Benchmark.case, (engine, period, length, options["seed"]))
+                    results["results"].append(result)
+                    latency = "" if result["p50_us"] is None else \
+                        f'\tp50={result["p50_us"]:.1f}us\tp99={result["p99_us"]:.1f}us'
+                    print(f'{engine}\tp={period}\tn={length}\t{result["samples_per_sec"]:.0f}/s'
+                        f'{latency}\trss={result["peak_rss_kb"]}kB', flush=True)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                if Benchmark.compare(results, json.load(file), options["tolerance"]):
+                    sys.exit(84)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "-h":
+        Benchmark.usage()
+        sys.exit(0)
+    try:
+        Benchmark.run(sys.argv[1:])
+    except GroundhogError as e:
+        sys.stdout.write(str(type(e).__name__) + ": {}\n".format(e))
+        sys.exit(84)
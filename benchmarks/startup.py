@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import json, os, subprocess, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from source.wizard import GroundhogError
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+TARGETS = {"script": [sys.executable, os.path.join(ROOT, "groundhog.py")], "build": [os.path.join(ROOT, "groundhog")]}
+RUNS = 50
+
+class Startup:
+    """Startup class to measure the cold start of the program
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Start `groundhog 7` with STOP as its input, like a cron or xargs job
+        2. Measure the time from the start of the process to the first byte
+        of its output, then let it exit
+        3. Compare the script run by the interpreter with the file built by make,
+        and the median with a previous run
+
+    Methods
+    -------
+        first_output(command: list[str]) -> float
+        measure(command: list[str], runs: int) -> dict
+        run(args: list[str]) -> None
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def first_output(command: list[str]) -> float:
+        """first_output function to time one start of the program
+
+        Parameters
+        ----------
+            command (list[str]): The command running the program
+
+        Returns
+        -------
+            float: Return the time to the first byte of output, in milliseconds
+        """
+        start = time.perf_counter_ns()
+        process = subprocess.Popen(command + ["7"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        process.stdin.write(b"STOP\n")
+        process.stdin.close()
+        process.stdout.read(1)
+        elapsed = time.perf_counter_ns() - start
+        process.stdout.read()
+        process.wait()
+        return elapsed / 1e6
+
+    @staticmethod
+    def measure(command: list[str], runs: int) -> dict:
+        """measure function to time several starts of the program
+
+        Parameters
+        ----------
+            command (list[str]): The command running the program
+            runs (int): The number of starts, after one to warm the file cache
+
+        Returns
+        -------
+            dict: Return the minimum, median and 90th percentile, in milliseconds
+        """
+        Startup.first_output(command)
+        times = sorted(Startup.first_output(command) for _ in range(runs))
+        return {"min_ms": times[0], "p50_ms": times[len(times) // 2], "p90_ms": times[len(times) * 9 // 10]}
+
+    @staticmethod
+    def usage():
+        """
+        usage function to display the usage of the startup benchmark
+        """
+        print("SYNOPSIS\n\tbenchmarks/startup.py [--runs n] [--output file] [--compare file] [--tolerance x]"
+            "\nDESCRIPTION\n\tTime `groundhog 7 <<< STOP` to its first output, run as a script and built by make"
+            "\n\t--runs n the number of starts measured (50 by default)"
+            "\n\t--output file save the results as JSON"
+            "\n\t--compare file compare the medians with a previous JSON, exit 84 on a regression"
+            "\n\t--tolerance x the slowdown allowed by --compare (0.1 by default)")
+
+    @staticmethod
+    def check_arg(args: list[str]) -> dict:
+        """check_arg function to parse the arguments
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if an argument is invalid
+
+        Returns
+        -------
+            dict: Return the options
+        """
+        options = {"runs": RUNS, "output": "", "compare": "", "tolerance": .1}
+        args = iter(args)
+        try:
+            for arg in args:
+                if arg == "--runs":
+                    options["runs"] = int(next(args))
+                elif arg == "--tolerance":
+                    options["tolerance"] = float(next(args))
+                elif arg in ("--output", "--compare"):
+                    options[arg[2:]] = next(args)
+                else:
+                    raise GroundhogError("Invalid argument")
+        except (ValueError, StopIteration):
+            raise GroundhogError("Invalid argument")
+        if options["runs"] < 1:
+            raise GroundhogError("Invalid argument")
+        return options
+
+    @staticmethod
+    def run(args: list[str]) -> None:
+        """run function to measure every target and save the results
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Returns
+        -------
+            None
+        """
+        options = Startup.check_arg(args)
+        results = {}
+        for name, command in TARGETS.items():
+            if not os.path.exists(command[-1]):
+                continue
+            results[name] = Startup.measure(command, options["runs"])
+            print(f'{name}\tmin={results[name]["min_ms"]:.1f}ms\tp50={results[name]["p50_ms"]:.1f}ms'
+                f'\tp90={results[name]["p90_ms"]:.1f}ms', flush=True)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                previous = json.load(file)
+            regression = False
+            for name, result in results.items():
+                if name in previous:
+                    ratio = result["p50_ms"] / previous[name]["p50_ms"]
+                    slower = ratio > 1 + options["tolerance"]
+                    regression |= slower
+                    print(f"{name}\t{ratio:.2f}x" + ("\tregression" if slower else ""))
+            if regression:
+                sys.exit(84)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "-h":
+        Startup.usage()
+        sys.exit(0)
+    try:
+        Startup.run(sys.argv[1:])
+    except GroundhogError as e:
+        sys.stdout.write(str(type(e).__name__) + ": {}\n".format(e))
+        sys.exit(84)
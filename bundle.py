@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import base64, marshal, os, sys, zlib
+from source.wizard import GroundhogError
+
+LAUNCHER = '''#!/usr/bin/env python3
+
+import binascii, marshal, sys, zlib
+from importlib.machinery import ModuleSpec
+
+class Bundle:
+    """Bundle class to import the modules packed in this file, from memory"""
+    def __init__(self, modules: dict):
+        self.modules = modules
+
+    def find_spec(self, name: str, path=None, target=None):
+        if name not in self.modules:
+            return None
+        return ModuleSpec(name, self, origin=f"{{__file__}}/{{name}}", is_package=self.modules[name][0])
+
+    def create_module(self, spec):
+        return None
+
+    def code(self, name: str):
+        return marshal.loads(zlib.decompress(self.modules[name][1]))
+
+    def exec_module(self, module) -> None:
+        exec(self.code(module.__name__), module.__dict__)
+
+VERSION = {version}
+PAYLOAD = b"{payload}"
+
+if __name__ == "__main__":
+    if sys.version_info[:2] != VERSION:
+        sys.stdout.write("GroundhogError: Built for another Python, run make again\\n")
+        sys.exit(84)
+    bundle = Bundle(marshal.loads(binascii.a2b_base64(PAYLOAD)))
+    sys.meta_path.insert(0, bundle)
+    exec(bundle.code("__main__"))
+'''
+
+class Bundler:
+    """Bundler class to build the program as one executable file
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Compile the entry point and every module of the source package,
+        without the docstrings
+        2. Pack their bytecode, each module compressed on its own, in a launcher
+        importing them from memory, so nothing is compiled nor searched on disk
+        at startup and only the modules imported are decompressed
+        3. The launcher is not a zip archive, so the interpreter does not go
+        through runpy like for a zipapp
+        4. The bytecode only runs on the Python version it was built with
+
+    Methods
+    -------
+        modules(entry: str) -> dict
+        build(entry: str, target: str) -> None
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def modules(entry: str) -> dict:
+        """modules function to compile the entry point and the source package
+
+        Parameters
+        ----------
+            entry (str): The entry point, run as __main__
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a file cannot be read or compiled
+
+        Returns
+        -------
+            dict: Return the is_package flag and the compressed bytecode of every module, by name
+        """
+        root = os.path.dirname(os.path.abspath(entry))
+        files = {"__main__": entry}
+        package = os.path.join(root, "source")
+        for name in sorted(os.listdir(package)):
+            if name.endswith(".py"):
+                files[f"source.{name[:-3]}"] = os.path.join(package, name)
+        modules = {"source": (True, zlib.compress(marshal.dumps(compile("", "source", "exec")), 9))}
+        try:
+            for name, path in files.items():
+                with open(path, "rb") as file:
+                    source = file.read()
+                code = compile(source, f"{os.path.basename(entry)}/{name}", "exec", optimize=2)
+                modules[name] = (False, zlib.compress(marshal.dumps(code), 9))
+        except (OSError, SyntaxError):
+            raise GroundhogError("Invalid source")
+        return modules
+
+    @staticmethod
+    def build(entry: str, target: str) -> None:
+        """build function to write the executable file
+
+        Parameters
+        ----------
+            entry (str): The entry point
+            target (str): The file to write
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the target cannot be written
+
+        Returns
+        -------
+            None
+        """
+        payload = base64.b64encode(marshal.dumps(Bundler.modules(entry))).decode()
+        try:
+            with open(target, "w") as file:
+                file.write(LAUNCHER.format(version=tuple(sys.version_info[:2]), payload=payload))
+            os.chmod(target, 0o755)
+        except OSError:
+            raise GroundhogError("Invalid target")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.stdout.write("USAGE\n\t./bundle.py entry.py target\n")
+        sys.exit(84)
+    try:
+        Bundler.build(sys.argv[1], sys.argv[2])
+    except GroundhogError as e:
+        sys.stdout.write(str(type(e).__name__) + ": {}\n".format(e))
+        sys.exit(84)
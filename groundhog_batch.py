@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+
+from source.pool import BatchDriver
+from source.wizard import GroundhogError
+from sys import argv, exit, stdout
+
+if __name__ == '__main__':
+    if len(argv) == 2 and argv[1] == "-h":
+        BatchDriver.usage()
+        exit(0)
+    try:
+        BatchDriver(argv[1:]).run()
+    except GroundhogError as e:
+        stdout.write(str(type(e).__name__) + ": {}\n".format(e))
+        exit(84)
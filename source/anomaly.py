@@ -1,4 +1,4 @@
-import statistics, math
+import heapq, math
 from sys import argv
 
 class Anomaly:
@@ -8,16 +8,96 @@ class Anomaly:
     ----------
         object (class): Inherit from object class
     
+    Attributes
+    ----------
+        top (int): The number of weirdest values to keep
+        heap (list[tuple]): Min-heap of the weirdest samples seen so far
+
     Methods
     -------
+        observe(index: int, value: float | int, mov_avg: float, stdev: float) -> float
+        keep(index: int, distance: float, value: float | int) -> None
+        weirdest() -> list[float | int]
         moving_average(data: list[float | int], period: int) -> float
         standard_deviation(data: list[float | int], period: int) -> float
         normalize(data: list[float | int], mov_avg: list[float | int], stdev: list[float | int]) -> float
+        bollinger(value: float | int, mov_avg: float, stdev: float) -> float
 
     Returns
     -------
         None
     """
+    __slots__ = ("top", "heap")
+
+    def __init__(self, top: int = 5):
+        """ Initialize the Anomaly class
+
+        Parameters
+        ----------
+            top (int): The number of weirdest values to keep
+
+        Returns
+        -------
+            None
+        """
+        self.top = top
+        self.heap = []
+
+    def observe(self, index: int, value: float | int, mov_avg: float, stdev: float) -> float:
+        """ observe function to normalize a sample and keep it if it is one of the weirdest
+
+        Parameters
+        ----------
+            index (int): The position of the sample in the input
+            value (float  |  int): The sample
+            mov_avg (float): The moving average of the window, rounded to 2 decimals
+            stdev (float): The standard deviation of the window, rounded to 2 decimals
+
+        Logic
+        -----
+            1. Normalize the sample inside its bollinger bands
+            2. Measure how far it is from the middle of the bands
+            3. Push it on a min-heap bounded to top entries, the closest one
+            being evicted first and the latest one first on a tie
+
+        Returns
+        -------
+            float: Return the normalized sample, None if the bands are empty
+        """
+        equalize = self.bollinger(value, mov_avg, stdev)
+        if equalize is None:
+            return None
+        self.keep(index, abs(equalize - .5), value)
+        return equalize
+
+    def keep(self, index: int, distance: float, value: float | int) -> None:
+        """ keep function to keep a sample if it is one of the weirdest
+
+        Parameters
+        ----------
+            index (int): The position of the sample in the input
+            distance (float): How weird the sample is, the larger the weirder
+            value (float  |  int): The sample
+
+        Returns
+        -------
+            None
+        """
+        entry = (distance, -index, value)
+        if len(self.heap) < self.top:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def weirdest(self) -> list[float | int]:
+        """ weirdest function to list the weirdest samples
+
+        Returns
+        -------
+            list[float  |  int]: Return the samples, furthest from their bands middle first
+        """
+        return list(value for _, _, value in sorted(self.heap, reverse=True))
+
     @staticmethod
     def moving_average(data: list[float | int], period: int) -> float:
         """moving_average function to calculate the moving average
@@ -32,7 +112,8 @@ class Anomaly:
             1. Check if the data is a list or a string
             2. Check if the length of the data is greater than the period
             3. Calculate the moving average (sum of the last n elements / n)
-            4. Return the moving average
+            4. Return the moving average, rounded to 2 decimals like the bands it
+            is printed with
 
         Returns
         -------
@@ -41,7 +122,7 @@ class Anomaly:
         try:
             if isinstance(data, (list, str)):
                 if len(data) >= period:
-                    return "{:.2f}".format(sum(data[-period:]) / period)
+                    return round(sum(data[-period:]) / period, 2)
         except (ZeroDivisionError, IndexError, FloatingPointError):
             return None
         return None
@@ -61,17 +142,18 @@ class Anomaly:
             2. Check if the length of the data is greater than the period
             3. Calculate the standard deviation (square root of the sum of the square of
             the difference between the data and the mean divided by the period)
-            4. Return the standard deviation
+            4. Return the standard deviation, rounded to 2 decimals
         
         Returns
         -------
             float: Return the standard deviation
         """
+        import statistics
         try:
             if isinstance(data, (list, str)):
                 if len(data) >= period:
-                    return "{:.2f}".format(math.sqrt(sum((x - statistics.mean(
-                        data[-period:])) ** 2 for x in data[-period:]) / period))
+                    return round(math.sqrt(sum((x - statistics.mean(
+                        data[-period:])) ** 2 for x in data[-period:]) / period), 2)
         except (ZeroDivisionError, IndexError, FloatingPointError):
             return None
         return None
@@ -101,9 +183,414 @@ class Anomaly:
             float: Return the normalized data
         """
         try:
-            upper_bb = float(mov_avg[-1]) + (2 * float(stdev[-1]))
-            lower_bb = float(mov_avg[-1]) - (2 * float(stdev[-1]))
-            equalize = (data[-1] - lower_bb) / (upper_bb - lower_bb)
+            return Anomaly.bollinger(data[-1], mov_avg[-1], stdev[-1])
+        except IndexError:
+            return None
+
+    @staticmethod
+    def bollinger(value: float | int, mov_avg: float, stdev: float) -> float:
+        """ bollinger function to place a single value inside its bollinger bands
+
+        Parameters
+        ----------
+            value (float  |  int): The value to place
+            mov_avg (float): The moving average of the window, rounded to 2 decimals
+            stdev (float): The standard deviation of the window, rounded to 2 decimals
+
+        Returns
+        -------
+            float: Return the normalized value, None if the bands are empty
+        """
+        try:
+            upper_bb = mov_avg + (2 * stdev)
+            lower_bb = mov_avg - (2 * stdev)
+            equalize = (value - lower_bb) / (upper_bb - lower_bb)
             return equalize
-        except (IndexError, ZeroDivisionError):
+        except ZeroDivisionError:
             return None
+
+class EwmaBands:
+    """EwmaBands class to place every value inside exponentially weighted bands
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Keep an exponentially weighted mean and variance, with the smoothing
+        factor 2 / (period + 1) of a period long moving average, so the state
+        of a series is three numbers whatever the period
+        2. Place each value inside the bands mean +- 2 standard deviations of
+        the values before it, with the same formula as Anomaly.bollinger
+        3. Give nothing before period values, or while the bands are empty
+        4. batch does the same update on many series at once, one row of a
+        state array per series, with the same floating point operations
+
+    Attributes
+    ----------
+        alpha (float): The smoothing factor
+        warmup (int): The number of values seen before the first position
+        mean (float): The weighted mean
+        var (float): The weighted variance
+        count (int): The number of values seen
+
+    Methods
+    -------
+        update(value: float) -> float
+        distance(output: float) -> float
+        load(state: np.ndarray) -> None
+        dump() -> tuple[float, float, float]
+        batch(state: np.ndarray, value: np.ndarray) -> tuple[np.ndarray, np.ndarray]
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("alpha", "warmup", "mean", "var", "count")
+    INITIAL = (0.0, 0.0, 0.0)
+
+    def __init__(self, period: int):
+        """Initialize the EwmaBands class
+
+        Parameters
+        ----------
+            period (int): The period the smoothing factor is derived from
+
+        Returns
+        -------
+            None
+        """
+        self.alpha = 2 / (max(period, 1) + 1)
+        self.warmup = max(period, 2)
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def place(self, value: float, mean: float, stdev: float) -> float:
+        """place function to place a value inside the bands
+
+        Parameters
+        ----------
+            value (float): The value
+            mean (float): The weighted mean of the values before it
+            stdev (float): Their weighted standard deviation
+
+        Returns
+        -------
+            float: Return the position of the value in the bands, nan if they are empty
+        """
+        equalize = Anomaly.bollinger(value, mean, stdev)
+        return math.nan if equalize is None else equalize
+
+    @staticmethod
+    def places(value, mean, stdev):
+        """places function to place many values inside their bands, like place
+
+        Parameters
+        ----------
+            value (np.ndarray): The values
+            mean (np.ndarray): Their weighted means
+            stdev (np.ndarray): Their weighted standard deviations
+
+        Returns
+        -------
+            np.ndarray: Return the positions, nan where the bands are empty
+        """
+        import numpy as np
+        upper_bb = mean + (2 * stdev)
+        lower_bb = mean - (2 * stdev)
+        width = upper_bb - lower_bb
+        return np.where(width != 0, (value - lower_bb) / width, np.nan)
+
+    @staticmethod
+    def distance(output: float) -> float:
+        """distance function to measure how weird a value is from its position
+
+        Parameters
+        ----------
+            output (float | np.ndarray): The position, or positions
+
+        Returns
+        -------
+            float: Return the distance to the middle of the bands, like Anomaly.observe
+        """
+        return abs(output - .5)
+
+    def update(self, value: float) -> float:
+        """update function to place a value, then add it to the weighted mean and variance
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            float: Return the position of the value, nan if there is not enough data
+        """
+        output = math.nan
+        if self.count >= self.warmup and self.var > 0:
+            output = self.place(value, self.mean, math.sqrt(self.var))
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            incr = self.alpha * diff
+            self.mean = self.mean + incr
+            self.var = (1 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+        return output
+
+    def load(self, state) -> None:
+        """load function to take the state of one series of batch
+
+        Parameters
+        ----------
+            state (np.ndarray): The count, mean and variance of the series
+
+        Returns
+        -------
+            None
+        """
+        self.count, self.mean, self.var = int(state[0]), float(state[1]), float(state[2])
+
+    def dump(self) -> tuple[float, float, float]:
+        """dump function to give the state back as a row of batch
+
+        Returns
+        -------
+            tuple[float, float, float]: Return the count, mean and variance
+        """
+        return self.count, self.mean, self.var
+
+    def batch(self, state, value):
+        """batch function to update many series at once, like update
+
+        Parameters
+        ----------
+            state (np.ndarray): The count, mean and variance of every series, one row each
+            value (np.ndarray): The new value of every series
+
+        Returns
+        -------
+            tuple[np.ndarray, np.ndarray]: Return the outputs, nan if there is not
+            enough data, and the new state
+        """
+        import numpy as np
+        count, mean, var = state[:, 0], state[:, 1], state[:, 2]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            output = self.places(value, mean, np.sqrt(var))
+            output = np.where((count >= self.warmup) & (var > 0), output, np.nan)
+            diff = value - mean
+            incr = self.alpha * diff
+            first = count == 0
+            mean = np.where(first, value, mean + incr)
+            var = np.where(first, var, (1 - self.alpha) * (var + diff * incr))
+        return output, np.column_stack((count + 1, mean, var))
+
+class EwmaScore(EwmaBands):
+    """EwmaScore class to score every value against the exponentially weighted mean and variance
+
+    Parameters
+    ----------
+        EwmaBands (class): Inherit from EwmaBands class
+
+    Logic
+    -----
+        1. Same state as EwmaBands, the output being the z-score of the value,
+        its distance to the weighted mean in weighted standard deviations
+        2. The weirdest values are the ones with the largest absolute score
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ()
+
+    def place(self, value: float, mean: float, stdev: float) -> float:
+        """place function to score a value against the weighted mean
+
+        Parameters
+        ----------
+            value (float): The value
+            mean (float): The weighted mean of the values before it
+            stdev (float): Their weighted standard deviation
+
+        Returns
+        -------
+            float: Return the z-score of the value, nan if the deviation is 0
+        """
+        return (value - mean) / stdev if stdev != 0 else math.nan
+
+    @staticmethod
+    def places(value, mean, stdev):
+        """places function to score many values, like place
+
+        Parameters
+        ----------
+            value (np.ndarray): The values
+            mean (np.ndarray): Their weighted means
+            stdev (np.ndarray): Their weighted standard deviations
+
+        Returns
+        -------
+            np.ndarray: Return the z-scores, nan where the deviation is 0
+        """
+        import numpy as np
+        return np.where(stdev != 0, (value - mean) / stdev, np.nan)
+
+    @staticmethod
+    def distance(output: float) -> float:
+        """distance function to measure how weird a value is from its score
+
+        Parameters
+        ----------
+            output (float | np.ndarray): The z-score, or z-scores
+
+        Returns
+        -------
+            float: Return the absolute score
+        """
+        return abs(output)
+
+class Cusum:
+    """Cusum class to detect the switches of the global tendency with a CUSUM
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Score every value with an EwmaScore, so the state of a series is
+        six numbers whatever the period
+        2. Add the scores above drift to a high sum and the ones below -drift
+        to a low sum, both floored at 0
+        3. When a sum goes over limit, the tendency goes up or down and both
+        sums start again from 0
+        4. A switch occurs when the tendency is not the same as before, the
+        tendency before the first one being up like Groundhog.switch_point
+
+    Attributes
+    ----------
+        reference (EwmaScore): The scores of the values
+        drift (float): The score ignored by the sums, in standard deviations
+        limit (float): The sum raising an alarm, in standard deviations
+        high (float): The sum of the scores above drift
+        low (float): The sum of the scores below -drift
+        up (bool): The current tendency
+
+    Methods
+    -------
+        update(value: float) -> bool
+        load(state: np.ndarray) -> None
+        dump() -> tuple
+        batch(state: np.ndarray, value: np.ndarray) -> tuple[np.ndarray, np.ndarray]
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("reference", "drift", "limit", "high", "low", "up")
+    INITIAL = EwmaBands.INITIAL + (0.0, 0.0, 1.0)
+
+    def __init__(self, period: int, drift: float = .5, limit: float = 5.0):
+        """Initialize the Cusum class
+
+        Parameters
+        ----------
+            period (int): The period the scores are smoothed over
+            drift (float): The score ignored by the sums
+            limit (float): The sum raising an alarm
+
+        Returns
+        -------
+            None
+        """
+        self.reference = EwmaScore(period)
+        self.drift = drift
+        self.limit = limit
+        self.high = 0.0
+        self.low = 0.0
+        self.up = True
+
+    def update(self, value: float) -> bool:
+        """update function to add a value to the sums
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            bool: Return True if the tendency switched on this value
+        """
+        score = self.reference.update(value)
+        if math.isnan(score):
+            return False
+        self.high = max(0.0, self.high + score - self.drift)
+        self.low = max(0.0, self.low - score - self.drift)
+        if self.high > self.limit:
+            up = True
+        elif self.low > self.limit:
+            up = False
+        else:
+            return False
+        self.high = self.low = 0.0
+        switch = up != self.up
+        self.up = up
+        return switch
+
+    def load(self, state) -> None:
+        """load function to take the state of one series of batch
+
+        Parameters
+        ----------
+            state (np.ndarray): The state of the EwmaScore, the high and low
+            sums and the tendency of the series
+
+        Returns
+        -------
+            None
+        """
+        self.reference.load(state[:3])
+        self.high, self.low, self.up = float(state[3]), float(state[4]), state[5] != 0
+
+    def dump(self) -> tuple:
+        """dump function to give the state back as a row of batch
+
+        Returns
+        -------
+            tuple: Return the state of the EwmaScore, the high and low sums and
+            the tendency (1 up, 0 down)
+        """
+        return self.reference.dump() + (self.high, self.low, float(self.up))
+
+    def batch(self, state, value):
+        """batch function to update many series at once, like update
+
+        Parameters
+        ----------
+            state (np.ndarray): The state of the EwmaScore, the high and low sums
+            and the tendency (1 up, 0 down) of every series, one row each
+            value (np.ndarray): The new value of every series
+
+        Returns
+        -------
+            tuple[np.ndarray, np.ndarray]: Return the switch flags and the new state
+        """
+        import numpy as np
+        score, reference = self.reference.batch(state[:, :3], value)
+        ready = ~np.isnan(score)
+        high = np.where(ready, np.maximum(0.0, state[:, 3] + score - self.drift), state[:, 3])
+        low = np.where(ready, np.maximum(0.0, state[:, 4] - score - self.drift), state[:, 4])
+        rising = high > self.limit
+        alarm = rising | (low > self.limit)
+        up = np.where(alarm, rising, state[:, 5] != 0)
+        switch = alarm & (up != (state[:, 5] != 0))
+        high = np.where(alarm, 0.0, high)
+        low = np.where(alarm, 0.0, low)
+        return switch, np.column_stack((reference, high, low, up))
+
+DETECTORS = {"bollinger": None, "ewma": EwmaBands, "zscore": EwmaScore}
+TRENDS = {"switch": None, "cusum": Cusum}
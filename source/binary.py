@@ -0,0 +1,252 @@
+import mmap, struct, sys
+from array import array
+from .wizard import Groundhog, GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"GHSERIES"
+NUMPY = b"\x93NUMPY"
+HEADER = struct.Struct("<8sQ")
+CHUNK = 1 << 16
+
+class BinarySeries:
+    """BinarySeries class to read a series stored as binary float64 values
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. The native format is a 16 bytes header, the magic GHSERIES and the
+        number of values as a little-endian uint64, followed by the values as
+        little-endian float64
+        2. The file is mapped in memory and read in place, never copied into a list
+        3. A .npy file holding a 1-D float64 array is mapped with numpy instead
+
+    Attributes
+    ----------
+        path (str): The path of the file
+        count (int): The number of values
+        view (memoryview | np.ndarray): The values, read in place
+
+    Methods
+    -------
+        is_binary(path: str) -> bool
+        lines() -> Iterator[float | str]
+        array() -> np.ndarray
+        convert(source: str, target: str) -> int
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, path: str):
+        """Initialize the BinarySeries class and map the file
+
+        Parameters
+        ----------
+            path (str): The path of the file
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the file cannot be read or is not a series
+            GroundhogError: Raise an exception if the file is a .npy file and numpy is not installed
+
+        Returns
+        -------
+            None
+        """
+        self.path = path
+        self.map = None
+        try:
+            with open(path, "rb") as file:
+                magic = file.read(len(MAGIC))
+                if magic.startswith(NUMPY):
+                    self.view = self.load_numpy(path)
+                else:
+                    self.view = self.load_native(file)
+        except (OSError, ValueError):
+            raise GroundhogError("Invalid file")
+        self.count = len(self.view)
+
+    @staticmethod
+    def is_binary(path: str) -> bool:
+        """is_binary function to check if a file holds a binary series
+
+        Parameters
+        ----------
+            path (str): The path of the file
+
+        Returns
+        -------
+            bool: Return True if the file starts with the magic of a binary series
+        """
+        try:
+            with open(path, "rb") as file:
+                magic = file.read(len(MAGIC))
+        except OSError:
+            return False
+        return magic == MAGIC or magic.startswith(NUMPY)
+
+    @staticmethod
+    def load_numpy(path: str):
+        """load_numpy function to map a .npy file
+
+        Parameters
+        ----------
+            path (str): The path of the file
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+            GroundhogError: Raise an exception if the array is not a 1-D float64 array
+
+        Returns
+        -------
+            np.ndarray: Return the mapped array
+        """
+        if np is None:
+            raise GroundhogError("numpy is required to read .npy files")
+        data = np.load(path, mmap_mode="r", allow_pickle=False)
+        if data.ndim != 1 or data.dtype != np.float64:
+            raise GroundhogError("Invalid file")
+        return data
+
+    def load_native(self, file):
+        """load_native function to map a file in the native format
+
+        Parameters
+        ----------
+            file (BinaryIO): The open file
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the header or the size is invalid
+
+        Returns
+        -------
+            memoryview | np.ndarray: Return the values
+        """
+        file.seek(0)
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise GroundhogError("Invalid file")
+        magic, count = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise GroundhogError("Invalid file")
+        end = HEADER.size + 8 * count
+        self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < end:
+            raise GroundhogError("Invalid file")
+        if np is not None:
+            return np.frombuffer(self.map, dtype="<f8", count=count, offset=HEADER.size)
+        if sys.byteorder != "little":
+            values = array("d", self.map[HEADER.size:end])
+            values.byteswap()
+            return memoryview(values)
+        return memoryview(self.map)[HEADER.size:end].cast("d")
+
+    def lines(self):
+        """lines function to read the values like Groundhog.read_lines reads a text input
+
+        Logic
+        -----
+            1. Yield the values by chunks turned into floats, so the rest of
+            Groundhog reads them the same way as parsed lines
+            2. The end of the file stands for STOP
+
+        Returns
+        -------
+            Iterator[float | str]: Return the values, then STOP
+        """
+        view = self.view
+        for start in range(0, self.count, CHUNK):
+            chunk = view[start:start + CHUNK]
+            yield from chunk.tolist()
+        yield "STOP"
+
+    def array(self):
+        """array function to read the whole series as a numpy array, without copying it
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+
+        Returns
+        -------
+            np.ndarray: Return the values
+        """
+        if np is None:
+            raise GroundhogError("numpy is required for the offline mode")
+        return np.asarray(self.view, dtype=np.float64)
+
+    @staticmethod
+    def convert(source: str, target: str) -> int:
+        """convert function to convert a text series into the native binary format
+
+        Parameters
+        ----------
+            source (str): The text file, one value per line up to STOP or the end, - for the standard input
+            target (str): The binary file to write
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a file cannot be opened
+            GroundhogError: Raise an exception if a line is not a number
+
+        Returns
+        -------
+            int: Return the number of values written
+        """
+        try:
+            stream = sys.stdin.buffer if source == "-" else open(source, "rb")
+            output = open(target, "wb")
+        except OSError:
+            raise GroundhogError("Invalid file")
+        count = 0
+        with output:
+            output.write(HEADER.pack(MAGIC, 0))
+            chunk = []
+            for line in Groundhog.read_lines(stream, "utf-8"):
+                if line == "STOP":
+                    break
+                chunk.append(line)
+                if len(chunk) == CHUNK:
+                    count += BinarySeries.write(output, chunk)
+                    chunk = []
+            count += BinarySeries.write(output, chunk)
+            output.seek(0)
+            output.write(HEADER.pack(MAGIC, count))
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        return count
+
+    @staticmethod
+    def write(output, lines: list[str]) -> int:
+        """write function to append parsed lines to a binary series
+
+        Parameters
+        ----------
+            output (BinaryIO): The binary file
+            lines (list[str]): The lines to parse
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a line is not a number
+
+        Returns
+        -------
+            int: Return the number of values written
+        """
+        try:
+            values = array("d", map(float, lines))
+        except ValueError:
+            values = array("d", map(Groundhog.check_input, lines))
+        if sys.byteorder != "little":
+            values.byteswap()
+        output.write(values.tobytes())
+        return len(values)
@@ -0,0 +1,238 @@
+import os, signal, struct, sys, zlib
+from .anomaly import Anomaly
+from .window import RollingWindow
+from .wizard import GroundhogError
+
+MAGIC = b"GHSTATE\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQ")
+SUMS = struct.Struct("<6d")
+SIZE = struct.Struct("<I")
+ENTRY = struct.Struct("<dqd")
+CRC = struct.Struct("<I")
+
+class Checkpoint:
+    """Checkpoint class to save and restore the streaming state of a Groundhog
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. The state is what the next values need: the switch state, the last
+        period + 2 values, the running sums of the window, the first values and
+        the heap of the weirdest values, so its size does not grow with the input
+        2. It is written in a versioned binary file ended by a CRC32, through a
+        temporary file renamed over the previous snapshot
+        3. Snapshots are taken every few values, on SIGUSR1, and on SIGTERM
+        before exiting, only between two values or while waiting for the next one
+        4. The values are read line by line, never ahead in blocks, so a value
+        taken from the input is always in the state saved on SIGTERM
+
+    Attributes
+    ----------
+        groundhog (Groundhog): The Groundhog to save
+        path (str): The file of the snapshots
+        every (int): Take a snapshot every that many values, never if 0
+        pending (int): The signal received while a value was being processed
+
+    Methods
+    -------
+        dump(groundhog: Groundhog) -> bytes
+        load(data: bytes, groundhog: Groundhog) -> None
+        save() -> None
+        resume(path: str) -> None
+        tick() -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, groundhog, path: str, every: int = 0):
+        """Initialize the Checkpoint class and install the signal handlers
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog to save
+            path (str): The file of the snapshots
+            every (int): Take a snapshot every that many values, never if 0
+
+        Returns
+        -------
+            None
+        """
+        self.groundhog = groundhog
+        self.path = path
+        self.every = every
+        self.pending = None
+        signal.signal(signal.SIGUSR1, self.handler)
+        signal.signal(signal.SIGTERM, self.handler)
+
+    @staticmethod
+    def dump(groundhog) -> bytes:
+        """dump function to serialize the streaming state of a Groundhog
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog to serialize
+
+        Returns
+        -------
+            bytes: Return the state
+        """
+        window = groundhog.window
+        anomaly = groundhog.anomaly
+        kept = window.values(window.period + 2)
+        flags = groundhog.check | groundhog.curr << 1
+        parts = [HEADER.pack(MAGIC, VERSION, flags, window.period, anomaly.top, window.count, groundhog.switch),
+            SUMS.pack(*window.total, *window.rise, window.mean, window.m2),
+            SIZE.pack(len(kept)), struct.pack(f"<{len(kept)}d", *kept),
+            SIZE.pack(len(groundhog.head)), struct.pack(f"<{len(groundhog.head)}d", *groundhog.head),
+            SIZE.pack(len(anomaly.heap))]
+        parts.extend(ENTRY.pack(distance, -index, value) for distance, index, value in anomaly.heap)
+        data = b"".join(parts)
+        return data + CRC.pack(zlib.crc32(data))
+
+    @staticmethod
+    def load(data: bytes, groundhog) -> None:
+        """load function to restore the streaming state of a Groundhog
+
+        Parameters
+        ----------
+            data (bytes): The state written by dump
+            groundhog (Groundhog): The Groundhog to restore
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the state is corrupted or has another version
+
+        Returns
+        -------
+            None
+        """
+        try:
+            if CRC.unpack_from(data, len(data) - CRC.size)[0] != zlib.crc32(data[:-CRC.size]):
+                raise GroundhogError("Invalid state file")
+            magic, version, flags, period, top, count, switch = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise GroundhogError("Invalid state file")
+            offset = HEADER.size
+            sums = SUMS.unpack_from(data, offset)
+            offset += SUMS.size
+            arrays = []
+            for _ in range(2):
+                size = SIZE.unpack_from(data, offset)[0]
+                arrays.append(list(struct.unpack_from(f"<{size}d", data, offset + SIZE.size)))
+                offset += SIZE.size + 8 * size
+            size = SIZE.unpack_from(data, offset)[0]
+            heap = list((distance, -index, value) for distance, index, value
+                in ENTRY.iter_unpack(data[offset + SIZE.size:offset + SIZE.size + ENTRY.size * size]))
+        except struct.error:
+            raise GroundhogError("Invalid state file")
+        kept, head = arrays
+        window = RollingWindow(period)
+        window.count = count
+        for back, value in enumerate(reversed(kept)):
+            window.buffer[(count - 1 - back) % window.size] = value
+        window.total, window.rise = list(sums[0:2]), list(sums[2:4])
+        window.mean, window.m2 = sums[4:6]
+        window.clean = max((count - back + period + 1 for back, value in enumerate(reversed(kept))
+            if not -RollingWindow.LARGE < value < RollingWindow.LARGE), default=0)
+        groundhog.window = window
+        groundhog.anomaly = Anomaly(top)
+        groundhog.anomaly.heap = heap
+        groundhog.head = head
+        groundhog.switch = switch
+        groundhog.check, groundhog.curr = bool(flags & 1), bool(flags & 2)
+        groundhog.state = groundhog.metrics()
+
+    def save(self) -> None:
+        """save function to write a snapshot of the Groundhog
+
+        Logic
+        -----
+            1. Flush the output first, so it holds every line of the saved values
+            2. Write a temporary file and rename it, so a crash keeps the previous snapshot
+
+        Returns
+        -------
+            None
+        """
+        (self.groundhog.out or sys.stdout).flush()
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(self.dump(self.groundhog))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def resume(groundhog, path: str) -> None:
+        """resume function to restore a Groundhog from a snapshot
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog to restore
+            path (str): The snapshot
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the snapshot cannot be read
+
+        Returns
+        -------
+            None
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            raise GroundhogError("Invalid state file")
+        Checkpoint.load(data, groundhog)
+        groundhog.resumed = True
+
+    def handler(self, signum, frame) -> None:
+        """handler function to take a snapshot on SIGUSR1 and SIGTERM
+
+        Logic
+        -----
+            1. While waiting for the next value the state is complete, so act now
+            2. Otherwise wait for the value to be processed, tick acting then
+
+        Returns
+        -------
+            None
+        """
+        if self.groundhog.reading:
+            self.act(signum)
+        else:
+            self.pending = signum
+
+    def act(self, signum: int) -> None:
+        """act function to take a snapshot, and exit on SIGTERM
+
+        Parameters
+        ----------
+            signum (int): The signal received
+
+        Returns
+        -------
+            None
+        """
+        self.pending = None
+        self.save()
+        if signum == signal.SIGTERM:
+            sys.exit(0)
+
+    def tick(self) -> None:
+        """tick function to call once a value has been processed
+
+        Returns
+        -------
+            None
+        """
+        if self.pending is not None:
+            self.act(self.pending)
+        elif self.every and self.groundhog.window.count % self.every == 0:
+            self.save()
@@ -0,0 +1,133 @@
+from .wizard import GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Downsample:
+    """Downsample class to pick the points of a series worth drawing
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Cut the range to draw in one bucket per pixel
+        2. Keep the lowest and the highest point of every bucket (min/max), or
+        the point making the largest triangle with its neighbours (LTTB), so
+        the spikes stay visible
+        3. Always keep the first and the last point of the range and the points
+        asked for, like the weirdest values
+
+    Methods
+    -------
+        minmax(values: np.ndarray, buckets: int) -> np.ndarray
+        lttb(values: np.ndarray, buckets: int) -> np.ndarray
+        select(values: np.ndarray, buckets: int, keep: np.ndarray, start: int, stop: int, method: str) -> np.ndarray
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def minmax(values, buckets: int):
+        """minmax function to keep the lowest and the highest point of every bucket
+
+        Parameters
+        ----------
+            values (np.ndarray): The values
+            buckets (int): The number of buckets
+
+        Returns
+        -------
+            np.ndarray: Return the sorted positions of the points kept, nan values being ignored
+        """
+        size = len(values)
+        if size <= 2 * buckets:
+            return np.arange(size)
+        width = -(-size // buckets)
+        padded = np.full(buckets * width, np.nan)
+        padded[:size] = values
+        padded = padded.reshape(buckets, width)
+        empty = np.isnan(padded)
+        low = np.where(empty, np.inf, padded).argmin(axis=1)
+        high = np.where(empty, -np.inf, padded).argmax(axis=1)
+        offset = np.arange(buckets) * width
+        indexes = np.concatenate((offset + low, offset + high))
+        return np.unique(indexes[indexes < size])
+
+    @staticmethod
+    def lttb(values, buckets: int):
+        """lttb function to downsample with the largest triangle three buckets method
+
+        Parameters
+        ----------
+            values (np.ndarray): The values
+            buckets (int): The number of points to keep
+
+        Logic
+        -----
+            1. Keep the first and the last point
+            2. In every bucket between them, keep the point making the largest
+            triangle with the point kept in the previous bucket and the average
+            of the next bucket
+
+        Returns
+        -------
+            np.ndarray: Return the sorted positions of the points kept
+        """
+        size = len(values)
+        if size <= buckets or buckets < 3:
+            return np.arange(size)
+        values = np.where(np.isnan(values), 0.0, values)
+        every = (size - 2) / (buckets - 2)
+        kept = [0]
+        for i in range(buckets - 2):
+            start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+            following = min(int((i + 2) * every) + 1, size)
+            following_x = (stop + following - 1) / 2
+            following_y = values[stop:following].mean()
+            previous = kept[-1]
+            x = np.arange(start, stop)
+            area = abs((previous - following_x) * (values[start:stop] - values[previous])
+                - (previous - x) * (following_y - values[previous]))
+            kept.append(start + int(area.argmax()))
+        kept.append(size - 1)
+        return np.array(kept)
+
+    @staticmethod
+    def select(values, buckets: int, keep=(), start: int = 0, stop: int = None, method: str = "minmax"):
+        """select function to pick the points to draw in a range
+
+        Parameters
+        ----------
+            values (np.ndarray): The whole series
+            buckets (int): The number of buckets, about the width of the plot in pixels
+            keep (np.ndarray): The positions to keep whatever happens, like the weirdest values
+            start (int): The first position of the range
+            stop (int): The position after the range, the end of the series if None
+            method (str): minmax or lttb
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed or the method is unknown
+
+        Returns
+        -------
+            np.ndarray: Return the sorted positions of the points to draw
+        """
+        if np is None:
+            raise GroundhogError("numpy is required to downsample")
+        if method not in ("minmax", "lttb"):
+            raise GroundhogError("Invalid downsampling method")
+        values = np.asarray(values, dtype=np.float64)
+        stop = len(values) if stop is None else min(stop, len(values))
+        start = max(0, min(start, stop))
+        if start == stop:
+            return np.arange(0)
+        indexes = getattr(Downsample, method)(values[start:stop], buckets) + start
+        keep = np.asarray(keep, dtype=np.int64)
+        keep = keep[(keep >= start) & (keep < stop)]
+        return np.union1d(np.union1d(indexes, keep), [start, stop - 1])
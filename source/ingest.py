@@ -0,0 +1,90 @@
+from .wizard import GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK = 1 << 13
+
+class BulkParser:
+    """BulkParser class to turn an uploaded buffer into a series in one pass
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Decode the whole buffer once and split it into lines
+        2. Convert the lines to a contiguous float64 array in one numpy call
+        3. If a line is not a number, convert the lines chunk by chunk, so
+        only the chunks holding a rejected line are parsed one line at a time
+        4. Report the rejected lines by their line number instead of dropping
+        them silently, the blank lines being skipped
+
+    Methods
+    -------
+        parse(content: bytes) -> tuple[np.ndarray, list[int]]
+        chunk(lines: list[str], first: int) -> tuple[np.ndarray, list[int]]
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def chunk(lines: list[str], first: int) -> tuple:
+        """chunk function to convert lines holding at least one rejected line
+
+        Parameters
+        ----------
+            lines (list[str]): The lines
+            first (int): The line number of the first line
+
+        Returns
+        -------
+            tuple[np.ndarray, list[int]]: Return the values and the line numbers of the rejected lines
+        """
+        values, rejected = [], []
+        for number, line in enumerate(lines, first):
+            try:
+                values.append(float(line))
+            except ValueError:
+                if line.strip():
+                    rejected.append(number)
+        return np.array(values, dtype=np.float64), rejected
+
+    @staticmethod
+    def parse(content: bytes) -> tuple:
+        """parse function to convert a buffer to a series
+
+        Parameters
+        ----------
+            content (bytes): The buffer, one value per line
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+
+        Returns
+        -------
+            tuple[np.ndarray, list[int]]: Return the values and the line numbers,
+            starting at 1, of the lines that are not numbers
+        """
+        if np is None:
+            raise GroundhogError("numpy is required to parse in bulk")
+        lines = content.decode("utf-8", "replace").splitlines()
+        try:
+            return np.array(lines, dtype=np.float64).reshape(-1), []
+        except ValueError:
+            pass
+        parts, rejected = [], []
+        for start in range(0, len(lines), CHUNK):
+            block = lines[start:start + CHUNK]
+            try:
+                parts.append(np.array(block, dtype=np.float64))
+            except ValueError:
+                values, numbers = BulkParser.chunk(block, start + 1)
+                parts.append(values)
+                rejected.extend(numbers)
+        return np.concatenate(parts), rejected
@@ -0,0 +1,611 @@
+import math
+from sys import exit
+from .window import RollingWindow
+from .wizard import GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LINES = 1 << 14
+ROUND = 32
+
+class KeyedGroundhog:
+    """KeyedGroundhog class to analyse many keyed series at once
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Read "key value" lines in batches
+        2. Give every new key a row in preallocated column arrays holding its
+        ring buffer, running sums, switch state and weirdest values
+        3. Split a batch in rounds where each key appears at most once, keeping
+        the order of each key, and update every row of a round in one
+        vectorized step with the same maths as RollingWindow
+        4. The rounds only shrink, so once they hold fewer than ROUND keys
+        (grouped or sorted input), the values left of each key are pushed one
+        by one to a RollingWindow over its row instead
+        5. Print the lines of the batch in input order, prefixed with their key
+        6. A detector or a trend detector keeps its state in one more row of
+        columns per key and updates a round with its batch variant
+
+    Attributes
+    ----------
+        period (int): The period of every series
+        top (int): The number of weirdest values to keep per key
+        keys (list[str]): The keys, in order of appearance
+        rows (dict): The row of every key
+        detector (EwmaBands): The detector ranking the weirdest values, None for the bollinger bands
+        trend (Cusum): The detector of the switches, None for the sign of r
+
+    Methods
+    -------
+        row(key: str) -> int
+        follow(row: int, values: list[float]) -> tuple[list]
+        feed(keys: list[str], values: list[float]) -> list[str]
+        report() -> bool
+        run(reader: Groundhog) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, period: int, top: int = 5, capacity: int = 1024, detector=None, trend=None):
+        """Initialize the KeyedGroundhog class
+
+        Parameters
+        ----------
+            period (int): The period of every series
+            top (int): The number of weirdest values to keep per key
+            capacity (int): The number of keys to preallocate
+            detector (EwmaBands): The detector ranking the weirdest values, None for the bollinger bands
+            trend (Cusum): The detector of the switches, None for the sign of r
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+
+        Returns
+        -------
+            None
+        """
+        if np is None:
+            raise GroundhogError("numpy is required for the keyed mode")
+        self.period = period
+        self.top = top
+        self.size = period + 2
+        self.keys = []
+        self.rows = {}
+        self.capacity = 0
+        self.ring = np.zeros((0, self.size))
+        self.count = np.zeros(0, dtype=np.int64)
+        self.total = np.zeros((0, 2))
+        self.rise = np.zeros((0, 2))
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.up = np.ones(0, dtype=bool)
+        self.switch = np.zeros(0, dtype=np.int64)
+        self.head = np.zeros((0, top))
+        self.top_distance = np.full((0, top), -1.0)
+        self.top_index = np.full((0, top), -1, dtype=np.int64)
+        self.top_value = np.zeros((0, top))
+        self.detector = detector
+        self.trend = trend
+        self.detected = np.zeros((0, len(detector.INITIAL) if detector else 0))
+        self.trended = np.zeros((0, len(trend.INITIAL) if trend else 0))
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        """grow function to make room for more keys
+
+        Parameters
+        ----------
+            capacity (int): The new number of rows
+
+        Returns
+        -------
+            None
+        """
+        extra = capacity - self.capacity
+        def extend(array, fill):
+            return np.concatenate((array, np.full((extra,) + array.shape[1:], fill, dtype=array.dtype)))
+        self.ring = extend(self.ring, 0.0)
+        self.count = extend(self.count, 0)
+        self.total = extend(self.total, 0.0)
+        self.rise = extend(self.rise, 0.0)
+        self.mean = extend(self.mean, 0.0)
+        self.m2 = extend(self.m2, 0.0)
+        self.up = extend(self.up, True)
+        self.switch = extend(self.switch, 0)
+        self.head = extend(self.head, 0.0)
+        self.top_distance = extend(self.top_distance, -1.0)
+        self.top_index = extend(self.top_index, -1)
+        self.top_value = extend(self.top_value, 0.0)
+        self.detected = extend(self.detected, self.detector.INITIAL if self.detector else 0.0)
+        self.trended = extend(self.trended, self.trend.INITIAL if self.trend else 0.0)
+        self.capacity = capacity
+
+    def row(self, key: str) -> int:
+        """row function to find the row of a key, adding it if it is new
+
+        Parameters
+        ----------
+            key (str): The key
+
+        Returns
+        -------
+            int: Return the row
+        """
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            if row == self.capacity:
+                self.grow(self.capacity * 2)
+        return row
+
+    @staticmethod
+    def accumulate(acc, rows, value) -> None:
+        """accumulate function to add values to compensated sums, like RollingWindow.accumulate
+
+        Parameters
+        ----------
+            acc (np.ndarray): The running sums and their compensation terms
+            rows (np.ndarray): The rows to update
+            value (np.ndarray): The values to add
+
+        Returns
+        -------
+            None
+        """
+        total = acc[rows, 0]
+        result = total + value
+        acc[rows, 1] += np.where(abs(total) >= abs(value), (total - result) + value, (value - result) + total)
+        acc[rows, 0] = result
+
+    def last(self, rows, count, back: int):
+        """last function to read a value from the end of the windows of some rows
+
+        Parameters
+        ----------
+            rows (np.ndarray): The rows
+            count (np.ndarray): Their number of values
+            back (int): How many values to go back, 0 being the latest value
+
+        Returns
+        -------
+            np.ndarray: Return the values
+        """
+        return self.ring[rows, (count - 1 - back) % self.size]
+
+    def values(self, row: int, length: int) -> list[float]:
+        """values function to copy the end of the window of a row, oldest value first
+
+        Parameters
+        ----------
+            row (int): The row
+            length (int): How many values to copy
+
+        Returns
+        -------
+            list[float]: Return the values
+        """
+        count = int(self.count[row])
+        return list(float(self.ring[row, (count - 1 - i) % self.size]) for i in range(min(count, length) - 1, -1, -1))
+
+    def exact(self, value, rows, method, length: int):
+        """exact function to recompute the values close to a rounding tie
+
+        Parameters
+        ----------
+            value (np.ndarray): The values computed from the running sums
+            rows (np.ndarray): Their rows
+            method (Callable): The exact formula of RollingWindow
+            length (int): The number of values it needs
+
+        Returns
+        -------
+            np.ndarray: Return the values, recomputed where needed
+        """
+        scaled = abs(value) * 100
+        tie = np.flatnonzero(abs(scaled % 1 - .5) < RollingWindow.TIE * np.maximum(1.0, scaled))
+        for i in tie.tolist():
+            value[i] = method(self.values(int(rows[i]), length), self.period)
+        return value
+
+    def resync(self, rows) -> None:
+        """resync function to rebuild the running sums of some rows from their buffers, like RollingWindow.resync
+
+        Parameters
+        ----------
+            rows (np.ndarray): The rows
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        for row in rows.tolist():
+            window = self.values(row, period + 1)
+            self.total[row] = (math.fsum(window[1:]), 0.0)
+            self.mean[row] = self.total[row, 0] / period
+            self.m2[row] = math.fsum((x - self.mean[row]) ** 2 for x in window[1:])
+            self.rise[row] = (math.fsum(max(0, x - y) for x, y in zip(window[1:], window[:-1])), 0.0)
+
+    def step(self, rows, value):
+        """step function to push one value to each of some distinct rows
+
+        Parameters
+        ----------
+            rows (np.ndarray): The rows, each at most once
+            value (np.ndarray): Their new values
+
+        Logic
+        -----
+            1. Same updates as RollingWindow.push on every row at once
+            2. Read r, g and s, detect the switches like Groundhog.switch_point
+            or with the batch variant of the trend detector
+            3. Normalize the values in their bands like Anomaly.observe, or
+            give them to the batch variant of the detector, and keep the
+            furthest ones of each row
+
+        Returns
+        -------
+            tuple[np.ndarray]: Return g, r, s and the switch flags of each value
+        """
+        period = self.period
+        size = self.size
+        nan = np.full(len(rows), np.nan)
+        count = self.count[rows] + 1
+        self.ring[rows, (count - 1) % size] = value
+        self.count[rows] = count
+        first = self.count[rows] <= self.top
+        self.head[rows[first], count[first] - 1] = value[first]
+        full = count > period
+        window_r = self.last(rows, count, period)
+        r = np.where(window_r == 0, ((value - window_r) / 1) * 100,
+            np.where(window_r < 0, (value - window_r) / -window_r * 100, (value / window_r - 1) * 100))
+        r = np.where(full, r, np.nan)
+        if self.trend is None:
+            up = np.rint(r) >= 0
+            switch = full & (up != self.up[rows])
+            self.up[rows] = np.where(full, up, self.up[rows])
+        else:
+            switch, self.trended[rows] = self.trend.batch(self.trended[rows], value)
+        self.switch[rows] += switch
+        if self.detector is not None:
+            output, self.detected[rows] = self.detector.batch(self.detected[rows], value)
+            ready = ~np.isnan(output)
+            self.keep(rows[ready], count[ready] - 1, value[ready], self.detector.distance(output[ready]))
+        if period == 0:
+            return nan, r, nan, switch
+        self.accumulate(self.rise, rows, np.where(count > 1, np.maximum(value - self.last(rows, count, 1), 0), 0))
+        self.accumulate(self.rise, rows, np.where(count > period + 1, -np.maximum(
+            self.last(rows, count, period) - self.last(rows, count, period + 1), 0), 0))
+        self.accumulate(self.total, rows, value)
+        old = window_r
+        self.accumulate(self.total, rows, np.where(full, -old, 0))
+        mean = self.mean[rows]
+        slide = mean + (value - old) / period
+        delta = value - mean
+        fill = mean + delta / count
+        self.m2[rows] += np.where(full, (value - old) * ((value - slide) + (old - mean)), delta * (value - fill))
+        self.mean[rows] = np.where(full, slide, fill)
+        self.resync(rows[count % (RollingWindow.RESYNC * period) == 0])
+        g = np.where(full, np.maximum(0.0, self.rise[rows, 0] + self.rise[rows, 1]) / period, np.nan)
+        g = self.exact(g, rows, RollingWindow.exact_average_temp, period + 1)
+        ready = count >= period
+        s = np.where(ready, np.sqrt(np.maximum(self.m2[rows], 0.0) / period), np.nan)
+        s = self.exact(s, rows, RollingWindow.exact_standard_deviation, period)
+        mov_avg = (self.total[rows, 0] + self.total[rows, 1]) / period
+        mov_avg = self.exact(mov_avg, rows, RollingWindow.exact_moving_average, period)
+        if self.detector is None:
+            self.observe(rows[ready], count[ready] - 1, value[ready], mov_avg[ready], s[ready])
+        return g, r, s, switch
+
+    def observe(self, rows, index, value, mov_avg, stdev) -> None:
+        """observe function to keep the weirdest values of each row, like Anomaly.observe
+
+        Parameters
+        ----------
+            rows (np.ndarray): The rows, each at most once
+            index (np.ndarray): The position of each value in its series
+            value (np.ndarray): The values
+            mov_avg (np.ndarray): Their moving averages
+            stdev (np.ndarray): Their standard deviations
+
+        Logic
+        -----
+            1. Round the bands to 2 decimals like the printed values
+            2. Keep the values by their distance to the middle of their bands
+
+        Returns
+        -------
+            None
+        """
+        mov_avg = np.array(list(float(f'{x:.2f}') for x in mov_avg.tolist()))
+        stdev = np.array(list(float(f'{x:.2f}') for x in stdev.tolist()))
+        upper_bb = mov_avg + (2 * stdev)
+        lower_bb = mov_avg - (2 * stdev)
+        width = upper_bb - lower_bb
+        keep = width != 0
+        rows, index, value = rows[keep], index[keep], value[keep]
+        self.keep(rows, index, value, abs((value - lower_bb[keep]) / width[keep] - .5))
+
+    def keep(self, rows, index, value, distance) -> None:
+        """keep function to keep the weirdest values of each row, like Anomaly.keep
+
+        Parameters
+        ----------
+            rows (np.ndarray): The rows, each at most once
+            index (np.ndarray): The position of each value in its series
+            value (np.ndarray): The values
+            distance (np.ndarray): How weird they are, the larger the weirder
+
+        Logic
+        -----
+            1. Replace the closest kept value of a row, the latest one on a tie,
+            when the new value is further
+
+        Returns
+        -------
+            None
+        """
+        kept = self.top_distance[rows]
+        lowest = kept.min(axis=1)
+        slot = np.where(kept == lowest[:, None], self.top_index[rows], np.iinfo(np.int64).min).argmax(axis=1)
+        further = distance > lowest
+        rows, slot = rows[further], slot[further]
+        self.top_distance[rows, slot] = distance[further]
+        self.top_index[rows, slot] = index[further]
+        self.top_value[rows, slot] = value[further]
+
+    def follow(self, row: int, values: list[float]) -> tuple[list]:
+        """follow function to push many values of one row, one by one
+
+        Parameters
+        ----------
+            row (int): The row
+            values (list[float]): Its next values, in order
+
+        Logic
+        -----
+            1. Load the row in a RollingWindow, whose sums are the same as the
+            columns, push the values to it and store it back
+            2. Switch, place and keep the values like step does, with the same
+            floating point operations, so the lines are the same, the detectors
+            taking the state of the row for their scalar update
+
+        Returns
+        -------
+            tuple[list]: Return g, r, s and the switch flags of each value
+        """
+        period, top = self.period, self.top
+        window = RollingWindow(period)
+        window.buffer = self.ring[row].tolist()
+        window.count = count = int(self.count[row])
+        window.total, window.rise = self.total[row].tolist(), self.rise[row].tolist()
+        window.mean, window.m2 = float(self.mean[row]), float(self.m2[row])
+        up = bool(self.up[row])
+        kept = (self.top_distance[row].tolist(), self.top_index[row].tolist(), self.top_value[row].tolist())
+        detector, trend = self.detector, self.trend
+        if detector is not None:
+            detector.load(self.detected[row])
+        if trend is not None:
+            trend.load(self.trended[row])
+        g, r, s, switch = [], [], [], []
+        for value in values:
+            if count < top:
+                self.head[row, count] = value
+            window.push(value)
+            count += 1
+            r_ = window.temperature_increase()
+            if trend is None:
+                flip = False
+                if count > period:
+                    rising = (round(r_) if math.isfinite(r_) else r_) >= 0
+                    flip, up = rising != up, rising
+            else:
+                flip = trend.update(value)
+            if detector is not None:
+                output = detector.update(value)
+                if not math.isnan(output):
+                    self.place(kept, count - 1, value, detector.distance(output))
+            g_, s_ = window.average_temp(), window.standard_deviation()
+            if detector is None and period and count >= period:
+                mov_avg = float(f'{window.moving_average():.2f}')
+                stdev = float(f'{s_:.2f}')
+                upper_bb = mov_avg + (2 * stdev)
+                lower_bb = mov_avg - (2 * stdev)
+                width = upper_bb - lower_bb
+                if width != 0:
+                    self.place(kept, count - 1, value, abs((value - lower_bb) / width - .5))
+            g.append(g_)
+            r.append(r_)
+            s.append(s_)
+            switch.append(flip)
+        self.ring[row] = window.buffer
+        self.count[row] = count
+        self.total[row], self.rise[row] = window.total, window.rise
+        self.mean[row], self.m2[row] = window.mean, window.m2
+        self.up[row] = up
+        self.switch[row] += sum(switch)
+        self.top_distance[row], self.top_index[row], self.top_value[row] = kept
+        if detector is not None:
+            self.detected[row] = detector.dump()
+        if trend is not None:
+            self.trended[row] = trend.dump()
+        return g, r, s, switch
+
+    @staticmethod
+    def place(kept: tuple[list], index: int, value: float, distance: float) -> None:
+        """place function to keep a weirdest value of one row, like keep
+
+        Parameters
+        ----------
+            kept (tuple[list]): The distances, positions and values kept by the row
+            index (int): The position of the value in its series
+            value (float): The value
+            distance (float): How weird it is, the larger the weirder
+
+        Returns
+        -------
+            None
+        """
+        distances, indexes, values = kept
+        lowest = min(distances)
+        if not distance > lowest:
+            return
+        slot = max(range(len(distances)), key=lambda i: indexes[i] if distances[i] == lowest else -1 << 63)
+        distances[slot], indexes[slot], values[slot] = distance, index, value
+
+    def feed(self, keys: list[str], values: list[float]) -> list[str]:
+        """feed function to process a batch of keyed values
+
+        Parameters
+        ----------
+            keys (list[str]): The key of every value
+            values (list[float]): The values
+
+        Raises
+        ------
+            GroundhogError: Raise an exception, with the lines of the values before
+            it as its lines attribute, if an increase is not a number
+
+        Returns
+        -------
+            list[str]: Return the lines to display, in input order
+        """
+        rows = np.array(list(self.row(key) for key in keys), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        size = len(rows)
+        order = np.argsort(rows, kind="stable")
+        start = np.ones(size, dtype=bool)
+        start[1:] = rows[order][1:] != rows[order][:-1]
+        rank = np.empty(size, dtype=np.int64)
+        rank[order] = np.arange(size) - np.maximum.accumulate(np.where(start, np.arange(size), 0))
+        g, r, s = np.empty(size), np.empty(size), np.empty(size)
+        switch = np.zeros(size, dtype=bool)
+        full = np.zeros(size, dtype=bool)
+        rounds = np.bincount(rank) if size else rank
+        small = np.flatnonzero(rounds < ROUND)
+        vectorized = int(small[0]) if len(small) else len(rounds)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for current in range(vectorized):
+                chosen = np.flatnonzero(rank == current)
+                g[chosen], r[chosen], s[chosen], switch[chosen] = self.step(rows[chosen], values[chosen])
+                full[chosen] = self.count[rows[chosen]] > self.period
+            rest = order[rank[order] >= vectorized]
+            for chosen in np.split(rest, np.flatnonzero(rows[rest][1:] != rows[rest][:-1]) + 1) if len(rest) else []:
+                row = int(rows[chosen[0]])
+                count = int(self.count[row])
+                g[chosen], r[chosen], s[chosen], switch[chosen] = self.follow(row, values[chosen].tolist())
+                full[chosen] = np.arange(count + 1, count + 1 + len(chosen)) > self.period
+        broken = np.flatnonzero(full & ~np.isfinite(r))
+        broken = int(broken[0]) if len(broken) else None
+        lines = []
+        for key, g_, r_, s_, switch_ in zip(keys, g.tolist(), r.tolist(), s.tolist(), switch.tolist()):
+            if broken is not None and len(lines) == broken:
+                error = GroundhogError("Invalid input, please enter a valid number")
+                error.lines = lines
+                raise error
+            line = f"{key}\tg={g_:.2f}\t\tr={r_:.0f}%\t\ts={s_:.2f}"
+            lines.append(line + "\t\ta switch occurs" if switch_ else line)
+        return lines
+
+    def weirdest(self, row: int) -> list[float]:
+        """weirdest function to list the weirdest values of a row, furthest first
+
+        Parameters
+        ----------
+            row (int): The row
+
+        Returns
+        -------
+            list[float]: Return the values, or the first values if none could be normalised
+        """
+        kept = self.top_distance[row] >= 0
+        if not kept.any():
+            return self.head[row, :min(int(self.count[row]), self.top)].tolist()
+        order = np.lexsort((self.top_index[row][kept], -self.top_distance[row][kept]))
+        return self.top_value[row][kept][order].tolist()
+
+    def report(self, out) -> bool:
+        """report function to display the switches and the weirdest values of every key
+
+        Parameters
+        ----------
+            out (TextIO): The output stream
+
+        Returns
+        -------
+            bool: Return True if a key does not have enough data
+        """
+        failed = False
+        for row, key in enumerate(self.keys):
+            count = int(self.count[row])
+            if count == 0 or count < self.period:
+                print(f"{key}\tGroundhogError: Not enough data to compute the average", file=out)
+                failed = True
+                continue
+            print(f"{key}\tGlobal tendency switched {int(self.switch[row])} times", file=out)
+            print(f"{key}\t{self.top} weirdest values are {self.weirdest(row)}", file=out)
+        return failed
+
+    def run(self, reader) -> None:
+        """run function to analyse the keyed input of reader
+
+        Parameters
+        ----------
+            reader (Groundhog): The Groundhog reading the input and owning the output
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a line is invalid, after the
+            lines of the values before it
+
+        Returns
+        -------
+            None
+        """
+        while True:
+            keys, values = [], []
+            error = end = None
+            for line in reader.lines:
+                if line == "STOP":
+                    end = line
+                    break
+                parts = line.split()
+                try:
+                    if len(parts) != 2:
+                        raise GroundhogError("Invalid Type")
+                    values.append(reader.check_input(parts[1]))
+                except GroundhogError as e:
+                    error = e
+                    break
+                keys.append(parts[0])
+                if len(keys) == LINES:
+                    break
+            else:
+                end = "EOF"
+            try:
+                lines = self.feed(keys, values)
+            except GroundhogError as e:
+                if e.lines:
+                    print("\n".join(e.lines), file=reader.out)
+                raise
+            if lines:
+                print("\n".join(lines), file=reader.out)
+            if error is not None:
+                raise error
+            if end == "EOF":
+                raise EOFError("EOF when reading a line")
+            if end == "STOP":
+                break
+        if not self.keys:
+            raise GroundhogError("Not enough data to compute the average")
+        exit(84 if self.report(reader.out) else 0)
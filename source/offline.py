@@ -0,0 +1,364 @@
+from .window import RollingWindow
+from .wizard import GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPSILON = 2 ** -52
+
+class OfflineAnalysis:
+    """OfflineAnalysis class to analyse a whole series at once with numpy
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Compute the rolling sums with blocked prefix sums, so the rounding
+        error depends on the period and not on the length of the series
+        2. Derive g, r, s, the moving average, the switches and the bollinger
+        normalization with array operations only
+        3. Recompute the few values whose error bound straddles a rounding tie
+        of their printed form with the exact formulas of RollingWindow, so the
+        printed digits match the streaming path
+
+    Attributes
+    ----------
+        period (int): The period of the analysis
+        top (int): The number of weirdest values to keep
+        values (np.ndarray): The series
+        g (np.ndarray): The average of the positive deltas, nan if not enough data
+        r (np.ndarray): The relative increase in percent, nan if not enough data
+        s (np.ndarray): The standard deviation rounded to 2 decimals, nan if not enough data
+        mov_avg (np.ndarray): The moving average rounded to 2 decimals, nan if not enough data
+        switches (np.ndarray): True where a switch occurs
+        normalised (np.ndarray): The bollinger normalization, nan if the bands are empty
+        broken (int): The first position whose increase is not a number, None if there is none
+        up (bool): The trend before the first tick
+
+    Methods
+    -------
+        rolling_sum(data: np.ndarray, period: int) -> np.ndarray
+        relative(current_r: np.ndarray, window_r: np.ndarray) -> np.ndarray
+        switch() -> int
+        candidates(start: int) -> np.ndarray
+        weirdest() -> list[float]
+        lines(start: int) -> Iterator[str]
+        write(out: TextIO, prefix: str) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, values, period: int, top: int = 5, up: bool = True):
+        """Initialize the OfflineAnalysis class and run the analysis
+
+        Parameters
+        ----------
+            values (array_like): The series
+            period (int): The period of the analysis
+            top (int): The number of weirdest values to keep
+            up (bool): The trend before the first tick, up unless the series
+            continues another one
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+
+        Returns
+        -------
+            None
+        """
+        if np is None:
+            raise GroundhogError("numpy is required for the offline mode")
+        self.period = period
+        self.top = top
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        size = len(self.values)
+        self.g = np.full(size, np.nan)
+        self.r = np.full(size, np.nan)
+        self.s = np.full(size, np.nan)
+        self.mov_avg = np.full(size, np.nan)
+        self.switches = np.zeros(size, dtype=bool)
+        self.normalised = np.full(size, np.nan)
+        self.broken = None
+        self.up = up
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            self.increase()
+            if period > 0:
+                self.average_temp()
+                self.deviation()
+                self.normalize()
+
+    @staticmethod
+    def rolling_sum(data, period: int):
+        """rolling_sum function to sum every window of period values
+
+        Parameters
+        ----------
+            data (np.ndarray): The values to sum
+            period (int): The length of the windows
+
+        Logic
+        -----
+            1. Cut the data in blocks of period values
+            2. Take the prefix sums and the suffix sums inside each block
+            3. A window ending at i is the suffix of its first block plus the
+            prefix of its last block, or a whole block when it is aligned
+
+        Returns
+        -------
+            np.ndarray: Return the sums, nan for the first period - 1 positions
+        """
+        size = len(data)
+        out = np.full(size, np.nan)
+        if size < period:
+            return out
+        padded = np.zeros(-(-size // period) * period)
+        padded[:size] = data
+        blocks = padded.reshape(-1, period)
+        prefix = np.cumsum(blocks, axis=1).ravel()
+        suffix = np.cumsum(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+        end = np.arange(period - 1, size)
+        start = end - period + 1
+        out[period - 1:] = np.where(start % period == 0, prefix[end], suffix[start] + prefix[end])
+        return out
+
+    @staticmethod
+    def uncertain(value, error):
+        """uncertain function to find the values whose 2 decimals are not certain
+
+        Parameters
+        ----------
+            value (np.ndarray): The approximate values
+            error (np.ndarray): A bound of their absolute error
+
+        Returns
+        -------
+            np.ndarray: Return True where the interval crosses a rounding tie
+        """
+        error = error + abs(value) * 8 * EPSILON
+        low = np.floor((value - error) * 100 + .5)
+        high = np.floor((value + error) * 100 + .5)
+        return np.isfinite(value) & (low != high)
+
+    def exact(self, method, length: int, indexes, rounded: bool = False) -> list[float]:
+        """exact function to recompute some values with a RollingWindow formula
+
+        Parameters
+        ----------
+            method (Callable): The exact formula of RollingWindow
+            length (int): The number of values ending at each index it needs
+            indexes (np.ndarray): The positions to recompute
+            rounded (bool): Round the values to 2 decimals through their printed form
+
+        Returns
+        -------
+            list[float]: Return the recomputed values
+        """
+        values = self.values
+        exact = (method(values[i - length + 1:i + 1].tolist(), self.period) for i in indexes.tolist())
+        if rounded:
+            return list(float(f'{x:.2f}') for x in exact)
+        return list(exact)
+
+    @staticmethod
+    def relative(current_r, window_r):
+        """relative function to compute the relative increases with the sign rules of Groundhog.temperature_increase
+
+        Parameters
+        ----------
+            current_r (np.ndarray): The values
+            window_r (np.ndarray): The values period values before them
+
+        Returns
+        -------
+            np.ndarray: Return the increases in percent
+        """
+        return np.where(window_r == 0, ((current_r - window_r) / 1) * 100,
+            np.where(window_r < 0, (current_r - window_r) / -window_r * 100,
+            (current_r / window_r - 1) * 100))
+
+    def increase(self) -> None:
+        """increase function to compute r and the switches
+
+        Logic
+        -----
+            1. Apply the sign rules of Groundhog.temperature_increase element-wise
+            2. A tick goes up when its rounded increase is not negative
+            3. A switch occurs when a tick does not go the same way as the previous one,
+            the trend before the first tick being up, or self.up
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        current_r = self.values[period:]
+        window_r = self.values[:max(len(self.values) - period, 0)]
+        self.r[period:] = self.relative(current_r, window_r)
+        broken = np.flatnonzero(~np.isfinite(self.r[period:]))
+        if len(broken):
+            self.broken = int(broken[0]) + period
+        up = np.concatenate(([self.up], np.rint(self.r[period:]) >= 0))
+        self.switches[period:] = up[1:] != up[:-1]
+
+    def average_temp(self) -> None:
+        """average_temp function to compute g
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        rise = np.zeros(len(self.values))
+        rise[1:] = np.maximum(np.diff(self.values), 0)
+        total = self.rolling_sum(rise, period)
+        self.g[period:] = np.maximum(total[period:], 0) / period
+        error = 2 * (period + 2) * EPSILON * total / period
+        fix = np.flatnonzero(self.uncertain(self.g, error))
+        self.g[fix] = self.exact(RollingWindow.exact_average_temp, period + 1, fix)
+
+    def deviation(self) -> None:
+        """deviation function to compute the moving average and s, both rounded to 2 decimals
+
+        Logic
+        -----
+            1. Center the series on its median to limit the cancellation, the
+            median staying of the order of the data even next to a huge value
+            2. Take the window means and variances from the rolling sums
+            3. Fix the values whose rounding is not certain, then round them
+            4. Recompute exactly the windows of finite values whose sums overflowed,
+            such as the squares of a value around 1e200
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        finite = np.isfinite(self.values)
+        center = float(np.median(self.values[finite])) if finite.any() else 0.0
+        clean = self.rolling_sum(~finite, period) == 0
+        shifted = self.values - center
+        total = self.rolling_sum(shifted, period)
+        squares = self.rolling_sum(shifted * shifted, period)
+        magnitude = self.rolling_sum(abs(shifted), period)
+        mean = total / period
+        variance = np.maximum(squares / period - mean * mean, 0)
+        mov_avg = mean + center
+        error = 2 * (period + 2) * EPSILON * (magnitude / period + abs(center))
+        fix = np.flatnonzero(self.uncertain(mov_avg, error) | clean & ~np.isfinite(error))
+        self.mov_avg = np.rint(mov_avg * 100) / 100
+        self.mov_avg[fix] = self.exact(RollingWindow.exact_moving_average, period, fix, True)
+        bound = 4 * (period + 2) * EPSILON * (squares / period + mean * mean)
+        low = np.sqrt(np.maximum(variance - bound, 0))
+        high = np.sqrt(variance + bound)
+        fix = np.flatnonzero(self.uncertain((low + high) / 2, (high - low) / 2) | clean & ~np.isfinite(bound))
+        self.s = np.rint(np.sqrt(variance) * 100) / 100
+        self.s[fix] = self.exact(RollingWindow.exact_standard_deviation, period, fix, True)
+
+    def normalize(self) -> None:
+        """normalize function to place every value inside its bollinger bands
+
+        Logic
+        -----
+            1. Same operations as Anomaly.bollinger on the rounded bands
+            2. Empty bands give nan instead of None
+
+        Returns
+        -------
+            None
+        """
+        upper_bb = self.mov_avg + (2 * self.s)
+        lower_bb = self.mov_avg - (2 * self.s)
+        width = upper_bb - lower_bb
+        self.normalised = np.where(width != 0, (self.values - lower_bb) / width, np.nan)
+
+    def switch(self) -> int:
+        """switch function to count the switches
+
+        Returns
+        -------
+            int: Return the number of switches
+        """
+        return int(np.count_nonzero(self.switches))
+
+    def candidates(self, start: int = 0):
+        """candidates function to rank the weirdest values from a position on
+
+        Parameters
+        ----------
+            start (int): The first position ranked
+
+        Logic
+        -----
+            1. Rank the normalised values by their distance to 0.5, the earliest first on a tie
+
+        Returns
+        -------
+            np.ndarray: Return the positions of the top weirdest values, furthest first
+        """
+        distance = abs(self.normalised - .5)
+        indexes = np.flatnonzero(~np.isnan(distance[start:])) + start
+        if len(indexes) > self.top:
+            cut = np.partition(distance[indexes], len(indexes) - self.top)[len(indexes) - self.top]
+            indexes = indexes[distance[indexes] >= cut]
+        order = np.lexsort((indexes, -distance[indexes]))[:self.top]
+        return indexes[order]
+
+    def weirdest(self) -> list[float]:
+        """weirdest function to list the weirdest values like Anomaly.weirdest
+
+        Logic
+        -----
+            1. Take the ranked candidates
+            2. Fall back on the first values if nothing could be normalised
+
+        Returns
+        -------
+            list[float]: Return the weirdest values, furthest first
+        """
+        indexes = self.candidates()
+        if len(indexes) == 0:
+            return self.values[:self.top].tolist()
+        return self.values[indexes].tolist()
+
+    def lines(self, start: int = 0):
+        """lines function to format the output of every tick
+
+        Parameters
+        ----------
+            start (int): The first position formatted
+
+        Logic
+        -----
+            1. Stop before the first position whose increase is not a number,
+            where the streaming path raises an error
+
+        Returns
+        -------
+            Iterator[str]: Return the lines printed by Groundhog.formating
+        """
+        end = self.broken
+        for g, r, s, switch in zip(self.g[start:end].tolist(), self.r[start:end].tolist(),
+            self.s[start:end].tolist(), self.switches[start:end].tolist()):
+            line = f"g={g:.2f}\t\tr={r:.0f}%\t\ts={s:.2f}"
+            yield line + "\t\ta switch occurs" if switch else line
+
+    def write(self, out, prefix: str = "") -> None:
+        """write function to display the lines of every tick
+
+        Parameters
+        ----------
+            out (TextIO): The output stream
+            prefix (str): The start of every line
+
+        Returns
+        -------
+            None
+        """
+        for line in self.lines():
+            print(prefix + line, file=out)
@@ -0,0 +1,365 @@
+import heapq, math
+from collections import deque
+from .record import EMPTY
+
+class MonotonicQueue:
+    """MonotonicQueue class to keep the minimum or the maximum of a sliding window
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Keep the values that can still become the extreme of the window, in
+        the order they came, each one more extreme than the ones after it
+        2. A new value drops the values behind it that it beats, since they
+        will leave the window before it
+        3. The extreme is the first value, dropped once it leaves the window,
+        so a value costs O(1) amortized
+
+    Attributes
+    ----------
+        maximum (bool): True to keep the maximum, False for the minimum
+        queue (deque[tuple[int, float]]): The index and value of the candidates
+
+    Methods
+    -------
+        push(index: int, value: float, oldest: int) -> None
+        value() -> float
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("maximum", "queue")
+
+    def __init__(self, maximum: bool):
+        """Initialize the MonotonicQueue class
+
+        Parameters
+        ----------
+            maximum (bool): True to keep the maximum, False for the minimum
+
+        Returns
+        -------
+            None
+        """
+        self.maximum = maximum
+        self.queue = deque()
+
+    def push(self, index: int, value: float, oldest: int) -> None:
+        """push function to add a value and drop the ones out of the window
+
+        Parameters
+        ----------
+            index (int): The position of the value in the series
+            value (float): The value
+            oldest (int): The position of the oldest value of the window
+
+        Returns
+        -------
+            None
+        """
+        queue = self.queue
+        if self.maximum:
+            while queue and queue[-1][1] <= value:
+                queue.pop()
+        else:
+            while queue and queue[-1][1] >= value:
+                queue.pop()
+        queue.append((index, value))
+        while queue[0][0] < oldest:
+            queue.popleft()
+
+    def value(self) -> float:
+        """value function to read the extreme of the window
+
+        Returns
+        -------
+            float: Return the minimum or the maximum
+        """
+        return self.queue[0][1]
+
+class RollingQuantile:
+    """RollingQuantile class to keep a quantile of a sliding window with two heaps
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Split the window in a max-heap of the lowest values and a min-heap
+        of the others, the lowest heap holding the values up to the rank of
+        the quantile, so the quantile is read from the tops of the heaps
+        2. Entries are (value, index) pairs, so every entry is unique and a
+        value leaving the window is found in the low heap if it is not above
+        its top
+        3. A value leaving the window is only marked dead and counted out, then
+        dropped when it reaches the top of its heap (lazy deletion), the heaps
+        being rebuilt when the dead entries outnumber the live ones
+        4. A value costs O(log period)
+        5. The quantile is interpolated between the two values around its rank,
+        like numpy.quantile
+
+    Attributes
+    ----------
+        q (float): The quantile, between 0 and 1
+        low (list[tuple[float, int]]): The max-heap of the lowest values, negated
+        high (list[tuple[float, int]]): The min-heap of the other values
+        sizes (list[int]): The number of live entries of low and high
+        dead (set[int]): The index of the entries that left the window
+
+    Methods
+    -------
+        push(index: int, value: float) -> None
+        remove(index: int, value: float) -> None
+        value() -> float
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("q", "low", "high", "sizes", "dead")
+
+    def __init__(self, q: float):
+        """Initialize the RollingQuantile class
+
+        Parameters
+        ----------
+            q (float): The quantile, between 0 and 1
+
+        Returns
+        -------
+            None
+        """
+        self.q = q
+        self.low = []
+        self.high = []
+        self.sizes = [0, 0]
+        self.dead = set()
+
+    def prune(self) -> None:
+        """prune function to drop the dead entries from the tops of the heaps
+
+        Returns
+        -------
+            None
+        """
+        dead = self.dead
+        for heap in (self.low, self.high):
+            while heap and abs(heap[0][1]) in dead:
+                dead.discard(abs(heapq.heappop(heap)[1]))
+
+    def in_low(self, index: int, value: float) -> bool:
+        """in_low function to find the heap of a live entry
+
+        Parameters
+        ----------
+            index (int): The position of the value in the series
+            value (float): The value
+
+        Returns
+        -------
+            bool: Return True if the entry belongs to the low heap
+        """
+        return bool(self.low) and (value, index) <= (-self.low[0][0], -self.low[0][1])
+
+    def push(self, index: int, value: float) -> None:
+        """push function to add a value
+
+        Parameters
+        ----------
+            index (int): The position of the value in the series
+            value (float): The value
+
+        Returns
+        -------
+            None
+        """
+        self.prune()
+        if self.in_low(index, value):
+            heapq.heappush(self.low, (-value, -index))
+            self.sizes[0] += 1
+        else:
+            heapq.heappush(self.high, (value, index))
+            self.sizes[1] += 1
+        self.balance()
+
+    def remove(self, index: int, value: float) -> None:
+        """remove function to take out a value leaving the window
+
+        Parameters
+        ----------
+            index (int): The position of the value in the series
+            value (float): The value
+
+        Returns
+        -------
+            None
+        """
+        self.prune()
+        self.sizes[0 if self.in_low(index, value) else 1] -= 1
+        self.dead.add(index)
+        if len(self.dead) > sum(self.sizes) + 16:
+            self.compact()
+        self.balance()
+
+    def compact(self) -> None:
+        """compact function to rebuild the heaps without their dead entries
+
+        Returns
+        -------
+            None
+        """
+        dead = self.dead
+        self.low = [entry for entry in self.low if -entry[1] not in dead]
+        self.high = [entry for entry in self.high if entry[1] not in dead]
+        heapq.heapify(self.low)
+        heapq.heapify(self.high)
+        dead.clear()
+
+    def balance(self) -> None:
+        """balance function to move the tops between the heaps until the low heap ends at the rank of the quantile
+
+        Returns
+        -------
+            None
+        """
+        sizes = self.sizes
+        total = sum(sizes)
+        target = int((total - 1) * self.q) + 1 if total else 0
+        while sizes[0] > target:
+            self.prune()
+            value, index = heapq.heappop(self.low)
+            heapq.heappush(self.high, (-value, -index))
+            sizes[0] -= 1
+            sizes[1] += 1
+        while sizes[0] < target:
+            self.prune()
+            value, index = heapq.heappop(self.high)
+            heapq.heappush(self.low, (-value, -index))
+            sizes[0] += 1
+            sizes[1] -= 1
+        self.prune()
+
+    def value(self) -> float:
+        """value function to read the quantile
+
+        Returns
+        -------
+            float: Return the quantile of the live values, nan if there is none
+        """
+        total = sum(self.sizes)
+        if total == 0:
+            return math.nan
+        position = (total - 1) * self.q
+        fraction = position - int(position)
+        lower = -self.low[0][0]
+        if fraction == 0:
+            return lower
+        return lower + (self.high[0][0] - lower) * fraction
+
+class RollingOrder:
+    """RollingOrder class to keep the minimum, maximum, median and 95th percentile of a RollingWindow
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Follow the window: every value pushed to it is added, and the one
+        leaving it, read back from its ring buffer, is removed
+        2. The minimum and the maximum come from monotonic queues, the median
+        and the 95th percentile from two-heap quantiles
+        3. Start from the values already in the window, so a resumed state
+        does not need to save anything more
+
+    Attributes
+    ----------
+        window (RollingWindow): The window followed
+        minimum (MonotonicQueue): The minimum of the window
+        maximum (MonotonicQueue): The maximum of the window
+        quantiles (tuple[RollingQuantile]): The median and the 95th percentile
+
+    Methods
+    -------
+        push() -> None
+        read() -> tuple[float, float, float, float]
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, window):
+        """Initialize the RollingOrder class
+
+        Parameters
+        ----------
+            window (RollingWindow): The window to follow, maybe holding values already
+
+        Returns
+        -------
+            None
+        """
+        self.window = window
+        self.minimum = MonotonicQueue(False)
+        self.maximum = MonotonicQueue(True)
+        self.quantiles = (RollingQuantile(.5), RollingQuantile(.95))
+        period = window.period
+        values = window.values(period)
+        start = window.count - len(values)
+        for index, value in enumerate(values, start):
+            self.add(index, value)
+
+    def add(self, index: int, value: float) -> None:
+        """add function to add a value to every structure
+
+        Parameters
+        ----------
+            index (int): The position of the value in the series
+            value (float): The value
+
+        Returns
+        -------
+            None
+        """
+        oldest = index - self.window.period + 1
+        self.minimum.push(index, value, oldest)
+        self.maximum.push(index, value, oldest)
+        for quantile in self.quantiles:
+            quantile.push(index, value)
+
+    def push(self) -> None:
+        """push function to follow the latest value pushed to the window
+
+        Returns
+        -------
+            None
+        """
+        window = self.window
+        period = window.period
+        if period == 0:
+            return
+        count = window.count
+        if count > period:
+            old = window.last(period)
+            for quantile in self.quantiles:
+                quantile.remove(count - 1 - period, old)
+        self.add(count - 1, window.last(0))
+
+    def read(self) -> tuple[float, float, float, float]:
+        """read function to read the order statistics of the window
+
+        Returns
+        -------
+            tuple[float, float, float, float]: Return the minimum, maximum, median
+            and 95th percentile, nan if the window is not full
+        """
+        window = self.window
+        if window.period == 0 or window.count < window.period:
+            return EMPTY
+        median, p95 = self.quantiles
+        return self.minimum.value(), self.maximum.value(), median.value(), p95.value()
@@ -0,0 +1,233 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .offline import OfflineAnalysis
+from .wizard import GroundhogError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK = 1 << 20
+
+class ParallelAnalysis:
+    """ParallelAnalysis class to analyse one long series on several cores
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Copy the series once to shared memory, so the workers read it in
+        place and only names and positions are sent to them
+        2. Cut it in chunks, each worker running an OfflineAnalysis on its chunk
+        and the period values before it, so every window of the chunk is whole
+        3. Give each chunk the trend of the value before it, read from the
+        series, so its switches are the ones of a sequential run
+        4. Each worker writes the lines of its chunk to a shared memory block
+        and returns its switches, its first broken position and its top
+        weirdest candidates
+        5. Write the blocks in order as they are ready, a few chunks ahead at
+        most, stop at the first broken position, and merge the candidates
+
+    Attributes
+    ----------
+        period (int): The period of the analysis
+        top (int): The number of weirdest values to keep
+        values (np.ndarray): The series
+        jobs (int): The number of worker processes
+        chunk (int): The number of positions of a chunk
+        broken (int): The first position whose increase is not a number, None if
+        there is none, known once written
+        switches (int): The number of switches, known once written
+
+    Methods
+    -------
+        analyse(name: str, size: int, start: int, end: int, period: int, top: int, up: bool) -> tuple
+        write(out: TextIO, prefix: str) -> None
+        switch() -> int
+        weirdest() -> list[float]
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, values, period: int, top: int = 5, jobs: int = 2, chunk: int = CHUNK):
+        """Initialize the ParallelAnalysis class
+
+        Parameters
+        ----------
+            values (array_like): The series
+            period (int): The period of the analysis
+            top (int): The number of weirdest values to keep
+            jobs (int): The number of worker processes
+            chunk (int): The number of positions of a chunk, at least the period
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if numpy is not installed
+
+        Returns
+        -------
+            None
+        """
+        if np is None:
+            raise GroundhogError("numpy is required for the offline mode")
+        self.period = period
+        self.top = top
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.jobs = jobs
+        self.chunk = max(chunk, period, 1)
+        self.broken = None
+        self.switches = 0
+        self.found = []
+
+    @staticmethod
+    def analyse(name: str, size: int, start: int, end: int, period: int, top: int, up: bool) -> tuple:
+        """analyse function to analyse one chunk in a worker
+
+        Parameters
+        ----------
+            name (str): The shared memory block holding the series
+            size (int): The length of the series
+            start (int): The first position of the chunk
+            end (int): The position after the last one of the chunk
+            period (int): The period of the analysis
+            top (int): The number of weirdest values to keep
+            up (bool): The trend before the first tick of the chunk
+
+        Returns
+        -------
+            tuple: Return the shared memory block of the lines and its length,
+            the first broken position or None, the number of switches and the
+            (distance, position, value) of the top weirdest values
+        """
+        block = shared_memory.SharedMemory(name)
+        try:
+            series = np.ndarray((size,), dtype=np.float64, buffer=block.buf)
+            low = max(0, start - period)
+            values = series[low:end].copy()
+            del series
+        finally:
+            block.close()
+        offset = start - low
+        analysis = OfflineAnalysis(values, period, top, up)
+        text = "".join(line + "\n" for line in analysis.lines(offset)).encode()
+        lines = shared_memory.SharedMemory(create=True, size=max(len(text), 1))
+        lines.buf[:len(text)] = text
+        lines.close()
+        broken = None if analysis.broken is None else analysis.broken + low
+        distance = abs(analysis.normalised - .5)
+        found = list((float(distance[i]), i + low, float(values[i])) for i in analysis.candidates(offset).tolist())
+        return lines.name, len(text), broken, int(np.count_nonzero(analysis.switches[offset:])), found
+
+    def trend(self, start: int) -> bool:
+        """trend function to read the trend before a position
+
+        Parameters
+        ----------
+            start (int): The first position of a chunk
+
+        Returns
+        -------
+            bool: Return True if the tick before it goes up, or if there is none
+        """
+        period = self.period
+        if start - 1 < period:
+            return True
+        values = self.values
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            r = OfflineAnalysis.relative(values[start - 1:start], values[start - 1 - period:start - period])
+        return bool(np.rint(r)[0] >= 0)
+
+    @staticmethod
+    def flush(out, prefix: str, name: str, length: int) -> None:
+        """flush function to write the lines of a chunk and free their block
+
+        Parameters
+        ----------
+            out (TextIO): The output stream
+            prefix (str): The start of every line
+            name (str): The shared memory block of the lines
+            length (int): The length of the lines, in bytes
+
+        Returns
+        -------
+            None
+        """
+        block = shared_memory.SharedMemory(name)
+        try:
+            if out is None:
+                return
+            stream = getattr(out, "buffer", None)
+            if prefix or stream is None:
+                text = bytes(block.buf[:length]).decode()
+                out.write("".join(prefix + line + "\n" for line in text.splitlines()))
+            else:
+                out.flush()
+                stream.write(block.buf[:length])
+        finally:
+            block.close()
+            block.unlink()
+
+    def write(self, out, prefix: str = "") -> None:
+        """write function to run the analysis and display the lines of every tick
+
+        Parameters
+        ----------
+            out (TextIO): The output stream
+            prefix (str): The start of every line
+
+        Returns
+        -------
+            None
+        """
+        size = len(self.values)
+        block = shared_memory.SharedMemory(create=True, size=max(size * 8, 1))
+        try:
+            np.ndarray((size,), dtype=np.float64, buffer=block.buf)[:] = self.values
+            starts = iter(range(0, size, self.chunk))
+            pending = deque()
+            with ProcessPoolExecutor(self.jobs) as executor:
+                def submit():
+                    start = next(starts, None)
+                    if start is not None:
+                        pending.append(executor.submit(self.analyse, block.name, size, start,
+                            min(start + self.chunk, size), self.period, self.top, self.trend(start)))
+                for _ in range(self.jobs * 2):
+                    submit()
+                while pending:
+                    name, length, broken, switches, found = pending.popleft().result()
+                    self.flush(out if self.broken is None else None, prefix, name, length)
+                    if self.broken is not None:
+                        continue
+                    self.broken = broken
+                    self.switches += switches
+                    self.found.extend(found)
+                    if broken is None:
+                        submit()
+        finally:
+            block.close()
+            block.unlink()
+
+    def switch(self) -> int:
+        """switch function to count the switches
+
+        Returns
+        -------
+            int: Return the number of switches
+        """
+        return self.switches
+
+    def weirdest(self) -> list[float]:
+        """weirdest function to merge the candidates of the chunks like OfflineAnalysis.weirdest
+
+        Returns
+        -------
+            list[float]: Return the weirdest values, furthest first
+        """
+        if not self.found:
+            return self.values[:self.top].tolist()
+        return list(value for _, _, value in sorted(self.found, key=lambda entry: (-entry[0], entry[1]))[:self.top])
@@ -0,0 +1,220 @@
+import io, os, signal, sys
+from concurrent.futures import ProcessPoolExecutor
+from sys import exit
+from .binary import BinarySeries
+from .record import TextWriter
+from .stream import GroundhogStream
+from .wizard import GroundhogError
+
+class BatchDriver:
+    """BatchDriver class to analyse many series files in parallel
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Spread the files over a pool of worker processes, each one running
+        a GroundhogStream in-process on one file at a time
+        2. Collect the report lines and the exit status groundhog would give
+        for each file
+        3. Display them in the order of the files as soon as they are ready,
+        prefixed with the file name, followed by a summary line
+        4. On SIGINT or SIGTERM, cancel the files not started yet, wait for the
+        running ones and exit with 84
+
+    Attributes
+    ----------
+        period (int): The period of the analysis
+        files (list[str]): The files to analyse
+        jobs (int): The number of worker processes
+        top (int): The number of weirdest values to keep
+
+    Methods
+    -------
+        check_arg(args: list[str]) -> tuple[int, list[str], int, int]
+        analyse(path: str, period: int, top: int) -> tuple[int, list[str]]
+        drain(stream: GroundhogStream) -> None
+        run() -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, args: list[str]):
+        """Initialize the BatchDriver class
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Returns
+        -------
+            None
+        """
+        self.period, self.files, self.jobs, self.top = self.check_arg(args)
+
+    @staticmethod
+    def usage():
+        """
+        usage function to display the usage of the program
+        """
+        print("SYNOPSIS\n\t./groundhog-batch period file... [-j jobs] [--top n]\nDESCRIPTION\n\tperiod the number of days defining a period"
+            "\n\tfile a series file, one value per line, ended by STOP, or a binary series (.npy or converted)"
+            "\n\t-j jobs the number of worker processes (one per core by default)"
+            "\n\t--top n the number of weirdest values to display (5 by default)")
+
+    @staticmethod
+    def check_arg(args: list[str]) -> tuple[int, list[str], int, int]:
+        """check_arg function to check the arguments
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if an argument is invalid or missing
+
+        Returns
+        -------
+            tuple[int, list[str], int, int]: Return the period, the files, the number
+            of jobs and the number of weirdest values
+        """
+        positional = []
+        jobs, top = os.cpu_count() or 1, 5
+        args = iter(args)
+        try:
+            for arg in args:
+                if arg == "-j":
+                    jobs = int(next(args))
+                elif arg == "--top":
+                    top = int(next(args))
+                elif arg.startswith("-"):
+                    raise GroundhogError("Invalid argument")
+                else:
+                    positional.append(arg)
+            period = int(positional[0])
+        except (ValueError, StopIteration, IndexError):
+            raise GroundhogError("Invalid argument")
+        if period < 0:
+            raise GroundhogError("Invalid period")
+        if jobs < 1 or top < 1 or len(positional) < 2:
+            raise GroundhogError("Invalid argument")
+        return period, positional[1:], jobs, top
+
+    @staticmethod
+    def analyse(path: str, period: int, top: int) -> tuple[int, list[str]]:
+        """analyse function to run the groundhog analysis of one file
+
+        Parameters
+        ----------
+            path (str): The file to analyse, text or binary series
+            period (int): The period of the analysis
+            top (int): The number of weirdest values to keep
+
+        Logic
+        -----
+            1. Read the file like groundhog --input, a binary series being
+            mapped instead of parsed
+            2. Feed its lines to a silent GroundhogStream up to STOP
+            3. Keep the report lines, or the error line groundhog prints
+            4. Any other error, like bytes that cannot be decoded, fails this
+            file only, so the other files are still reported
+
+        Returns
+        -------
+            tuple[int, list[str]]: Return the exit status and the report lines
+        """
+        stream = GroundhogStream(period, top)
+        groundhog = stream.groundhog
+        try:
+            if BinarySeries.is_binary(path):
+                groundhog.lines = BinarySeries(path).lines()
+                BatchDriver.drain(stream)
+            else:
+                with open(path, "rb") as file:
+                    groundhog.lines = groundhog.read_lines(file, "utf-8")
+                    BatchDriver.drain(stream)
+            groundhog.out = io.StringIO()
+            TextWriter(groundhog).report(stream.finish())
+        except OSError:
+            return 84, ["GroundhogError: Invalid file"]
+        except GroundhogError as e:
+            return 84, [f"{type(e).__name__}: {e}"]
+        except EOFError as e:
+            return 1, [f"{type(e).__name__}: {e}"]
+        except ValueError:
+            return 84, ["GroundhogError: Invalid input, please enter a valid number"]
+        except Exception as e:
+            return 84, [f"{type(e).__name__}: {e}"]
+        return 0, groundhog.out.getvalue().splitlines()
+
+    @staticmethod
+    def drain(stream: GroundhogStream) -> None:
+        """drain function to feed the lines of a stream up to STOP
+
+        Parameters
+        ----------
+            stream (GroundhogStream): The stream, its Groundhog holding the lines
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a line is not a number
+            EOFError: Raise an exception if the lines end before STOP
+
+        Returns
+        -------
+            None
+        """
+        read_line = stream.groundhog.read_line
+        while True:
+            data = read_line()
+            if data == "STOP":
+                return
+            stream.feed(data)
+
+    @staticmethod
+    def ignore_interrupts() -> None:
+        """ignore_interrupts function to leave the cancellation to the parent process
+        """
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    @staticmethod
+    def interrupt(signum, frame) -> None:
+        """interrupt function to turn SIGTERM into a KeyboardInterrupt
+        """
+        raise KeyboardInterrupt
+
+    def run(self) -> None:
+        """run function to analyse every file and display the summary
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the analysis is interrupted
+
+        Returns
+        -------
+            None
+        """
+        failed = 0
+        out = sys.stdout
+        signal.signal(signal.SIGTERM, self.interrupt)
+        executor = ProcessPoolExecutor(self.jobs, initializer=self.ignore_interrupts)
+        try:
+            results = executor.map(self.analyse, self.files, [self.period] * len(self.files),
+                [self.top] * len(self.files), chunksize=max(1, min(64, len(self.files) // (self.jobs * 8))))
+            for path, (status, lines) in zip(self.files, results):
+                for line in lines:
+                    print(f"{path}\t{line}", file=out)
+                failed += status != 0
+        except KeyboardInterrupt:
+            executor.shutdown(wait=True, cancel_futures=True)
+            out.flush()
+            raise GroundhogError("Interrupted")
+        finally:
+            executor.shutdown(wait=True)
+        print(f"{len(self.files) - failed} files analysed, {failed} failed", file=out)
+        exit(84 if failed else 0)
@@ -0,0 +1,325 @@
+import math, struct, sys
+
+MAGIC = b"GHTICKS\0"
+VERSION = 3
+HEADER = struct.Struct("<8sHI")
+TICK = struct.Struct("<cQddddd??dddd")
+EMPTY = (math.nan,) * 4
+REPORT = struct.Struct("<cQI")
+
+class Tick:
+    """Tick class to hold everything computed for one value of a stream
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Attributes
+    ----------
+        index (int): The position of the value in the stream
+        value (float): The value
+        g (float): The average temperature increase, nan if not enough data
+        r (float): The relative temperature increase in percent, nan if not enough data
+        s (float): The standard deviation, nan if not enough data
+        switch (bool): True if the global tendency switched on this value
+        position (float): The position of the value inside its bollinger bands,
+        nan if the bands are empty
+        beyond (bool): True if the value is beyond the percentile threshold
+        rolling (tuple[float]): The minimum, maximum, median and 95th percentile
+        of the window, nan if they are not computed or not enough data
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("index", "value", "g", "r", "s", "switch", "position", "beyond", "rolling")
+
+    def __init__(self, index: int, value: float, g: float, r: float, s: float, switch: bool, position: float,
+        beyond: bool = False, rolling: tuple = EMPTY):
+        """Initialize the Tick class
+
+        Parameters
+        ----------
+            index (int): The position of the value in the stream
+            value (float): The value
+            g (float): The average temperature increase
+            r (float): The relative temperature increase
+            s (float): The standard deviation
+            switch (bool): True if the global tendency switched on this value
+            position (float): The position of the value inside its bollinger bands
+            beyond (bool): True if the value is beyond the percentile threshold
+            rolling (tuple[float]): The minimum, maximum, median and 95th percentile of the window
+
+        Returns
+        -------
+            None
+        """
+        self.index = index
+        self.value = value
+        self.g = g
+        self.r = r
+        self.s = s
+        self.switch = switch
+        self.position = position
+        self.beyond = beyond
+        self.rolling = rolling
+
+class Summary:
+    """Summary class to hold the end of stream report
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Attributes
+    ----------
+        switches (int): The number of switches of the global tendency
+        top (int): The number of weirdest values asked for
+        weirdest (list[float]): The weirdest values, furthest from their bands middle first
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("switches", "top", "weirdest")
+
+    def __init__(self, switches: int, top: int, weirdest: list[float]):
+        """Initialize the Summary class
+
+        Parameters
+        ----------
+            switches (int): The number of switches of the global tendency
+            top (int): The number of weirdest values asked for
+            weirdest (list[float]): The weirdest values
+
+        Returns
+        -------
+            None
+        """
+        self.switches = switches
+        self.top = top
+        self.weirdest = weirdest
+
+class TextWriter:
+    """TextWriter class to write the ticks as the tab separated lines of the program
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. The output goes to groundhog.out, each line starting with groundhog.prefix
+        2. g and s are printed with 2 decimals and r as an integer
+        3. With groundhog.order, the minimum, maximum, median and 95th percentile
+        follow with 2 decimals
+        4. The switch and a value beyond the percentile threshold are appended
+
+    Methods
+    -------
+        tick(tick: Tick) -> None
+        report(summary: Summary) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, groundhog):
+        """Initialize the TextWriter class
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog whose output and prefix are used
+
+        Returns
+        -------
+            None
+        """
+        self.groundhog = groundhog
+
+    def tick(self, tick: Tick) -> None:
+        """tick function to write the line of a value
+
+        Parameters
+        ----------
+            tick (Tick): The tick
+
+        Returns
+        -------
+            None
+        """
+        groundhog = self.groundhog
+        line = f"{groundhog.prefix}g={tick.g:.2f}\t\tr={tick.r:.0f}%\t\ts={tick.s:.2f}"
+        if groundhog.order is not None:
+            line += "\t\tmin={:.2f}\t\tmax={:.2f}\t\tmedian={:.2f}\t\tp95={:.2f}".format(*tick.rolling)
+        if tick.switch:
+            line += "\t\ta switch occurs"
+        if tick.beyond:
+            line += f"\t\tbeyond p{groundhog.threshold.percentile:g}"
+        print(line, file=groundhog.out)
+
+    def report(self, summary: Summary) -> None:
+        """report function to write the end of stream report
+
+        Parameters
+        ----------
+            summary (Summary): The report
+
+        Returns
+        -------
+            None
+        """
+        groundhog = self.groundhog
+        print(f"{groundhog.prefix}Global tendency switched {summary.switches} times", file=groundhog.out)
+        print(f"{groundhog.prefix}{summary.top} weirdest values are {summary.weirdest}", file=groundhog.out)
+
+class CsvWriter(TextWriter):
+    """CsvWriter class to write the ticks as CSV rows
+
+    Parameters
+    ----------
+        TextWriter (class): Inherit from TextWriter class
+
+    Logic
+    -----
+        1. Write a header row, unless the run resumes one that wrote it
+        already, then one row per value with the metrics at full
+        precision, an empty field for nan and 1 or 0 for the flags
+        2. Write the report as comment lines starting with #
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, groundhog):
+        """Initialize the CsvWriter class and write the header row of a fresh run
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog whose output is used
+
+        Returns
+        -------
+            None
+        """
+        super().__init__(groundhog)
+        if groundhog.resumed:
+            return
+        print("index,value,g,r,s,switch,position,beyond,min,max,median,p95", file=groundhog.out)
+
+    @staticmethod
+    def field(value: float) -> str:
+        """field function to format a float field
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            str: Return the shortest repr of the value, empty for nan
+        """
+        return "" if math.isnan(value) else repr(value)
+
+    def tick(self, tick: Tick) -> None:
+        field = self.field
+        print(f"{tick.index},{field(tick.value)},{field(tick.g)},{field(tick.r)},{field(tick.s)},"
+            f"{int(tick.switch)},{field(tick.position)},{int(tick.beyond)},{','.join(map(field, tick.rolling))}",
+            file=self.groundhog.out)
+
+    def report(self, summary: Summary) -> None:
+        out = self.groundhog.out
+        print(f"# switches,{summary.switches}", file=out)
+        print("# weirdest," + ",".join(map(self.field, summary.weirdest)), file=out)
+
+class JsonWriter(TextWriter):
+    """JsonWriter class to write the ticks as newline delimited JSON
+
+    Parameters
+    ----------
+        TextWriter (class): Inherit from TextWriter class
+
+    Logic
+    -----
+        1. Write one object per value, nan and infinity being null
+        2. Write the report as a last object with the switches and the weirdest values
+
+    Returns
+    -------
+        None
+    """
+    @staticmethod
+    def field(value: float) -> str:
+        """field function to format a float field
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            str: Return the shortest repr of the value, null for nan and infinity
+        """
+        return repr(value) if math.isfinite(value) else "null"
+
+    def tick(self, tick: Tick) -> None:
+        field = self.field
+        print(f'{{"index": {tick.index}, "value": {field(tick.value)}, "g": {field(tick.g)}, '
+            f'"r": {field(tick.r)}, "s": {field(tick.s)}, "switch": {"true" if tick.switch else "false"}, '
+            f'"position": {field(tick.position)}, "beyond": {"true" if tick.beyond else "false"}, '
+            f'"min": {field(tick.rolling[0])}, "max": {field(tick.rolling[1])}, "median": {field(tick.rolling[2])}, '
+            f'"p95": {field(tick.rolling[3])}}}', file=self.groundhog.out)
+
+    def report(self, summary: Summary) -> None:
+        print(f'{{"switches": {summary.switches}, "weirdest": [{", ".join(map(self.field, summary.weirdest))}]}}',
+            file=self.groundhog.out)
+
+class BinaryWriter(TextWriter):
+    """BinaryWriter class to write the ticks as packed little-endian records
+
+    Parameters
+    ----------
+        TextWriter (class): Inherit from TextWriter class
+
+    Logic
+    -----
+        1. Write a header: the magic GHTICKS\\0, the version (uint16) and the period (uint32)
+        2. Write one record per value: b"T", the index (uint64), the value, g, r,
+        s and the position (float64, nan if missing), the switch and beyond (bool),
+        the minimum, maximum, median and 95th percentile (float64, nan if missing)
+        3. Write the report as b"R", the switches (uint64), the number of
+        weirdest values (uint32) and the values (float64)
+        4. An error is still written as a text line after the records
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, groundhog):
+        """Initialize the BinaryWriter class and write the header
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog whose output is used
+
+        Returns
+        -------
+            None
+        """
+        super().__init__(groundhog)
+        out = groundhog.out or sys.stdout
+        out.flush()
+        self.stream = out.buffer
+        self.stream.write(HEADER.pack(MAGIC, VERSION, groundhog.window.period))
+
+    def tick(self, tick: Tick) -> None:
+        self.stream.write(TICK.pack(b"T", tick.index, tick.value, tick.g, tick.r, tick.s, tick.position, tick.switch,
+            tick.beyond, *tick.rolling))
+
+    def report(self, summary: Summary) -> None:
+        weirdest = summary.weirdest
+        self.stream.write(REPORT.pack(b"R", summary.switches, len(weirdest)))
+        self.stream.write(struct.pack(f"<{len(weirdest)}d", *weirdest))
+        self.stream.flush()
+
+WRITERS = {"text": TextWriter, "csv": CsvWriter, "ndjson": JsonWriter, "binary": BinaryWriter}
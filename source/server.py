@@ -0,0 +1,244 @@
+import asyncio, codecs, io, os, signal, stat
+from .record import TextWriter
+from .stream import GroundhogStream
+from .wizard import Groundhog, GroundhogError
+
+READ = 1 << 14
+
+class Session:
+    """Session class to run the streaming analysis of one connection
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Decode the received blocks and split them into lines like Groundhog.read_lines
+        2. Feed every line to a GroundhogStream like Groundhog.run, the output
+        going to a buffer
+        3. The session is over after STOP or the first error, like the program
+
+    Attributes
+    ----------
+        stream (GroundhogStream): The stream
+        groundhog (Groundhog): The state of the stream, writing to the buffer
+        done (bool): True once STOP or an error has been processed
+
+    Methods
+    -------
+        receive(block: bytes) -> str
+        process(line: str) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, period: int, top: int):
+        """Initialize the Session class
+
+        Parameters
+        ----------
+            period (int): The period of the data
+            top (int): The number of weirdest values to keep
+
+        Returns
+        -------
+            None
+        """
+        self.stream = GroundhogStream(period, top)
+        self.groundhog = self.stream.groundhog
+        self.groundhog.out = io.StringIO()
+        self.groundhog.writer = TextWriter(self.groundhog)
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self.rest = ""
+        self.done = False
+
+    def receive(self, block: bytes) -> str:
+        """receive function to process a block of the connection
+
+        Parameters
+        ----------
+            block (bytes): The block received, empty at the end of the connection
+
+        Returns
+        -------
+            str: Return the output of the lines completed by the block
+        """
+        text = self.rest + self.decoder.decode(block, final=not block)
+        if block:
+            lines, self.rest = Groundhog.split_block(text)
+        else:
+            lines, self.rest = ([text] if text else []), ""
+        for line in lines:
+            self.process(line)
+            if self.done:
+                break
+        out = self.groundhog.out
+        output = out.getvalue()
+        out.seek(0)
+        out.truncate()
+        return output
+
+    def process(self, line: str) -> None:
+        """process function to process a line like Groundhog.handle_input
+
+        Parameters
+        ----------
+            line (str): The line
+
+        Returns
+        -------
+            None
+        """
+        groundhog = self.groundhog
+        try:
+            if line == "STOP":
+                self.done = True
+                groundhog.writer.report(self.stream.finish())
+                return
+            self.stream.feed(line)
+        except GroundhogError as e:
+            self.done = True
+            print(f"{type(e).__name__}: {e}", file=groundhog.out)
+
+class GroundhogServer:
+    """GroundhogServer class to serve many streams from one process
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Listen on a unix socket or a localhost TCP port with asyncio
+        2. Give every connection its own Session, speaking the same line
+        protocol as the program: values, then STOP
+        3. Stop reading a connection until its output has been sent (backpressure)
+        4. After STOP or an error, end the output and drop the rest of the input
+        5. Refuse the connections beyond the session cap with an error line
+        6. Close everything on SIGINT or SIGTERM
+
+    Attributes
+    ----------
+        period (int): The period of every stream
+        options (dict): The command line options
+        sessions (int): The number of open sessions
+
+    Methods
+    -------
+        handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None
+        serve() -> None
+        run() -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, period: int, options: dict):
+        """Initialize the GroundhogServer class
+
+        Parameters
+        ----------
+            period (int): The period of every stream
+            options (dict): The command line options
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if no or both addresses are given
+
+        Returns
+        -------
+            None
+        """
+        if bool(options["unix"]) == bool(options["port"]) or options["sessions"] < 1:
+            raise GroundhogError("Invalid argument")
+        self.period = period
+        self.options = options
+        self.sessions = 0
+        self.writers = set()
+
+    async def handle(self, reader, writer) -> None:
+        """handle function to serve one connection
+
+        Parameters
+        ----------
+            reader (asyncio.StreamReader): The stream of the connection
+            writer (asyncio.StreamWriter): The output of the connection
+
+        Returns
+        -------
+            None
+        """
+        self.writers.add(writer)
+        try:
+            if self.sessions >= self.options["sessions"]:
+                writer.write(b"GroundhogError: Too many sessions\n")
+                await writer.drain()
+                return
+            self.sessions += 1
+            try:
+                session = Session(self.period, self.options["top"])
+                while not session.done:
+                    block = await reader.read(READ)
+                    output = session.receive(block)
+                    if output:
+                        writer.write(output.encode())
+                        await writer.drain()
+                    if not block:
+                        break
+                if session.done and block:
+                    writer.write_eof()
+                    while await reader.read(READ):
+                        pass
+            finally:
+                self.sessions -= 1
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def serve(self) -> None:
+        """serve function to listen until SIGINT or SIGTERM
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the address cannot be used
+
+        Returns
+        -------
+            None
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        path = self.options["unix"]
+        try:
+            if path:
+                if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                    os.unlink(path)
+                server = await asyncio.start_unix_server(self.handle, path)
+            else:
+                server = await asyncio.start_server(self.handle, "127.0.0.1", self.options["port"])
+        except OSError:
+            raise GroundhogError("Invalid address")
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            for writer in list(self.writers):
+                writer.close()
+            await server.wait_closed()
+            if path:
+                os.unlink(path)
+
+    def run(self) -> None:
+        """run function to start the server
+
+        Returns
+        -------
+            None
+        """
+        asyncio.run(self.serve())
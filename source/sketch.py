@@ -0,0 +1,255 @@
+import math
+
+class QuantileSketch:
+    """QuantileSketch class to estimate the quantiles of an unbounded stream in bounded memory
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. KLL sketch: a stack of compactors, the values of level h standing
+        for 2^h values each
+        2. A full compactor sorts itself and promotes one value out of two to
+        the level above, starting with the first or the second value in turn
+        so the runs are deterministic, and the rank error stays around 1 / k
+        3. The capacities shrink by 2/3 going down the stack, so the sketch
+        holds O(k) values whatever the length of the stream
+        4. Two sketches with the same k merge level by level, so the sketches
+        of the shards of a parallel run add up to the sketch of the whole
+        5. With high, a compactor only compacts its lower half and keeps its
+        largest values as they are, so the rank error shrinks near the top and
+        a percentile like 99.9 stays accurate with the same k
+
+    Attributes
+    ----------
+        k (int): The capacity of the top compactor, the accuracy of the sketch
+        high (bool): True if the sketch is accurate near its largest values
+        compactors (list[list[float]]): The values kept at every level
+        count (int): The number of values seen
+
+    Methods
+    -------
+        update(value: float) -> None
+        merge(other: QuantileSketch) -> None
+        rank(value: float) -> float
+        quantile(q: float) -> float
+
+    Returns
+    -------
+        None
+    """
+    __slots__ = ("k", "high", "compactors", "offsets", "count", "size", "limit")
+
+    def __init__(self, k: int = 200, high: bool = False):
+        """Initialize the QuantileSketch class
+
+        Parameters
+        ----------
+            k (int): The capacity of the top compactor
+            high (bool): Keep the largest values of every compactor when compacting it
+
+        Returns
+        -------
+            None
+        """
+        self.k = k
+        self.high = high
+        self.compactors = [[]]
+        self.offsets = [0]
+        self.count = 0
+        self.size = 0
+        self.limit = self.capacity(0)
+
+    def capacity(self, level: int) -> int:
+        """capacity function to read the capacity of a compactor
+
+        Parameters
+        ----------
+            level (int): The level of the compactor
+
+        Returns
+        -------
+            int: Return the number of values it holds before compacting
+        """
+        return int(math.ceil(self.k * (2 / 3) ** (len(self.compactors) - level - 1))) + 1
+
+    def update(self, value: float) -> None:
+        """update function to add a value to the sketch
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            None
+        """
+        self.compactors[0].append(value)
+        self.count += 1
+        self.size += 1
+        if self.size >= self.limit:
+            self.compress()
+
+    def compress(self) -> None:
+        """compress function to compact the lowest full compactor
+
+        Returns
+        -------
+            None
+        """
+        for level, compactor in enumerate(self.compactors):
+            if len(compactor) >= self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                    self.offsets.append(0)
+                compactor.sort()
+                cut = max(2, len(compactor) // 4 * 2) if self.high else len(compactor)
+                promoted = compactor[self.offsets[level]:cut:2]
+                self.offsets[level] ^= 1
+                self.compactors[level + 1].extend(promoted)
+                self.size -= cut - len(promoted)
+                del compactor[:cut]
+                break
+        self.limit = sum(self.capacity(level) for level in range(len(self.compactors)))
+
+    def merge(self, other) -> None:
+        """merge function to add the values of another sketch
+
+        Parameters
+        ----------
+            other (QuantileSketch): The sketch of another part of the stream
+
+        Returns
+        -------
+            None
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+            self.offsets.append(0)
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.count += other.count
+        self.size = sum(map(len, self.compactors))
+        self.limit = sum(self.capacity(level) for level in range(len(self.compactors)))
+        while self.size >= self.limit:
+            self.compress()
+
+    def weighted(self) -> list[tuple[float, int]]:
+        """weighted function to list the values kept with their weights
+
+        Returns
+        -------
+            list[tuple[float, int]]: Return the values, sorted, and how many values each stands for
+        """
+        return sorted((value, 1 << level) for level, compactor in enumerate(self.compactors) for value in compactor)
+
+    def rank(self, value: float) -> float:
+        """rank function to estimate the share of the values below or equal to a value
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            float: Return the rank, between 0 and 1, nan if the sketch is empty
+        """
+        total = sum(len(compactor) << level for level, compactor in enumerate(self.compactors))
+        if total == 0:
+            return math.nan
+        below = sum(sum(1 for x in compactor if x <= value) << level for level, compactor in enumerate(self.compactors))
+        return below / total
+
+    def quantile(self, q: float) -> float:
+        """quantile function to estimate a quantile
+
+        Parameters
+        ----------
+            q (float): The quantile, between 0 and 1
+
+        Returns
+        -------
+            float: Return the smallest value kept whose rank reaches q, nan if the sketch is empty
+        """
+        weighted = self.weighted()
+        if not weighted:
+            return math.nan
+        target = q * sum(weight for _, weight in weighted)
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+class Threshold:
+    """Threshold class to flag the values beyond a percentile of the values seen so far
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Compare each value with the percentile of the values before it, then
+        add it to the sketch
+        2. Flag nothing until the percentile can be told apart from the maximum,
+        after 1 / (1 - percentile) values
+        3. Read the percentile from the sketch again every k / 8 values only,
+        so the cost of a value stays constant
+        4. The sketch keeps the largest values of its compactors, the percentile
+        being near the top, and its k is at least 1 / (1 - percentile) so that
+        the values beyond the percentile weigh more than its rank error
+
+    Attributes
+    ----------
+        percentile (float): The percentile, between 0 and 100
+        sketch (QuantileSketch): The sketch of the values seen so far
+        limit (float): The last percentile read from the sketch
+
+    Methods
+    -------
+        beyond(value: float) -> bool
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, percentile: float, k: int = None):
+        """Initialize the Threshold class
+
+        Parameters
+        ----------
+            percentile (float): The percentile, between 0 and 100 excluded
+            k (int): The accuracy of the sketch, sized from the percentile by default
+
+        Returns
+        -------
+            None
+        """
+        self.percentile = percentile
+        self.warmup = math.ceil(100 / (100 - percentile))
+        if k is None:
+            k = max(200, self.warmup)
+        self.sketch = QuantileSketch(k, high=True)
+        self.every = max(1, k // 8)
+        self.limit = math.nan
+
+    def beyond(self, value: float) -> bool:
+        """beyond function to check a value against the percentile and add it
+
+        Parameters
+        ----------
+            value (float): The value
+
+        Returns
+        -------
+            bool: Return True if the value is beyond the percentile of the values before it
+        """
+        sketch = self.sketch
+        if sketch.count % self.every == 0 and sketch.count >= self.warmup:
+            self.limit = sketch.quantile(self.percentile / 100)
+        sketch.update(value)
+        return value > self.limit
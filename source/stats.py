@@ -0,0 +1,217 @@
+import json, signal, sys, time
+from .wizard import GroundhogError
+
+FORMATS = ("json", "prometheus")
+STAGES = ("read", "parse", "window", "metrics", "format", "switch", "report")
+
+class Stats:
+    """Stats class to instrument the hot path of a Groundhog
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Wrap the methods of one Groundhog instance with timers, so nothing
+        changes and nothing is paid when the instrumentation is off, a call
+        raising an error not being counted
+        2. Keep the cumulative time and the number of calls of every stage:
+        read (read_line), parse (check_input), window (RollingWindow.push),
+        metrics (evaluate, the bollinger normalization included), format
+        (formating and the writer), switch (switch_point) and report
+        3. The times are exclusive: a stage called inside another one, like
+        switch inside metrics inside format, is taken out of the outer stage,
+        so the stages add up to the time of the hot path
+        4. Dump them with the counters of the stream on SIGUSR1 and when the
+        stream ends, as JSON or Prometheus text, to the standard error or a file
+
+    Attributes
+    ----------
+        groundhog (Groundhog): The instrumented Groundhog
+        style (str): The dump format, json or prometheus
+        path (str): The file to write the dumps to, the standard error if empty
+        seconds (dict): The cumulative time of every stage, in nanoseconds
+        calls (dict): The number of calls of every stage
+        errors (int): The number of values that could not be parsed
+        nested (list[int]): The time spent in the stages called by the running
+        one, in nanoseconds
+
+    Methods
+    -------
+        install() -> None
+        snapshot() -> dict
+        render() -> str
+        dump() -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, groundhog, style: str, path: str = ""):
+        """Initialize the Stats class
+
+        Parameters
+        ----------
+            groundhog (Groundhog): The Groundhog to instrument
+            style (str): The dump format, json or prometheus
+            path (str): The file to write the dumps to, the standard error if empty
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the format is unknown
+
+        Returns
+        -------
+            None
+        """
+        if style not in FORMATS:
+            raise GroundhogError("Invalid stats format")
+        self.groundhog = groundhog
+        self.style = style
+        self.path = path
+        self.seconds = dict.fromkeys(STAGES, 0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.errors = 0
+        self.nested = [0]
+        self.previous = None
+
+    def timed(self, stage: str, function):
+        """timed function to wrap a function with the exclusive timer of a stage
+
+        Parameters
+        ----------
+            stage (str): The stage
+            function (Callable): The function to time
+
+        Returns
+        -------
+            Callable: Return the wrapped function
+        """
+        clock = time.perf_counter_ns
+        seconds, calls, nested = self.seconds, self.calls, self.nested
+        def wrapper(*args):
+            outer = nested[0]
+            nested[0] = 0
+            start = clock()
+            try:
+                result = function(*args)
+            except BaseException:
+                nested[0] = outer
+                raise
+            elapsed = clock() - start
+            seconds[stage] += elapsed - nested[0]
+            calls[stage] += 1
+            nested[0] = outer + elapsed
+            return result
+        return wrapper
+
+    def install(self) -> None:
+        """install function to wrap the methods of the Groundhog and handle SIGUSR1
+
+        Logic
+        -----
+            1. A SIGUSR1 handler already installed, like the one of Checkpoint,
+            is still called after the dump
+
+        Returns
+        -------
+            None
+        """
+        groundhog = self.groundhog
+        check_input = groundhog.check_input
+        def parse(data):
+            try:
+                return check_input(data)
+            except GroundhogError:
+                self.errors += 1
+                raise
+        groundhog.read_line = self.timed("read", groundhog.read_line)
+        groundhog.check_input = self.timed("parse", parse)
+        groundhog.window.push = self.timed("window", groundhog.window.push)
+        groundhog.evaluate = self.timed("metrics", groundhog.evaluate)
+        groundhog.formating = self.timed("format", groundhog.formating)
+        groundhog.switch_point = self.timed("switch", groundhog.switch_point)
+        groundhog.report = self.timed("report", groundhog.report)
+        self.previous = signal.signal(signal.SIGUSR1, self.handler)
+
+    def handler(self, signum, frame) -> None:
+        """handler function to dump the stats on SIGUSR1
+        """
+        self.dump()
+        if callable(self.previous):
+            self.previous(signum, frame)
+
+    def memory(self) -> int:
+        """memory function to measure the memory held by the streaming state
+
+        Returns
+        -------
+            int: Return the size in bytes of the window buffer, the first values
+            and the weirdest values, with the floats they hold
+        """
+        groundhog = self.groundhog
+        heap = groundhog.anomaly.heap
+        size = sys.getsizeof(groundhog.window.buffer) + sys.getsizeof(groundhog.head) + sys.getsizeof(heap)
+        size += sum(sys.getsizeof(value) for value in groundhog.window.buffer)
+        size += sum(sys.getsizeof(value) for value in groundhog.head)
+        return size + sum(sys.getsizeof(entry) + sum(map(sys.getsizeof, entry)) for entry in heap)
+
+    def snapshot(self) -> dict:
+        """snapshot function to collect the stats
+
+        Returns
+        -------
+            dict: Return the stages and the counters
+        """
+        window = self.groundhog.window
+        return {"stages": {stage: {"seconds": self.seconds[stage] / 1e9, "calls": self.calls[stage]}
+            for stage in STAGES},
+            "samples": window.count, "switches": self.groundhog.switch, "parse_errors": self.errors,
+            "window_fill": min(window.count, window.period) / window.period if window.period else 1.0,
+            "state_bytes": self.memory()}
+
+    def render(self) -> str:
+        """render function to format the stats
+
+        Returns
+        -------
+            str: Return the stats as JSON or Prometheus text
+        """
+        stats = self.snapshot()
+        if self.style == "json":
+            return json.dumps(stats) + "\n"
+        lines = ["# HELP groundhog_stage_seconds_total Time spent in each stage.",
+            "# TYPE groundhog_stage_seconds_total counter"]
+        lines.extend(f'groundhog_stage_seconds_total{{stage="{stage}"}} {value["seconds"]:.9f}'
+            for stage, value in stats["stages"].items())
+        lines.extend(["# HELP groundhog_stage_calls_total Calls of each stage.",
+            "# TYPE groundhog_stage_calls_total counter"])
+        lines.extend(f'groundhog_stage_calls_total{{stage="{stage}"}} {value["calls"]}'
+            for stage, value in stats["stages"].items())
+        for name, kind, text in (("samples", "counter", "Values processed."),
+            ("switches", "counter", "Switches of the global tendency."),
+            ("parse_errors", "counter", "Values that could not be parsed."),
+            ("window_fill", "gauge", "Fill ratio of the rolling window."),
+            ("state_bytes", "gauge", "Memory held by the streaming state.")):
+            metric = f"groundhog_{name}_total" if kind == "counter" else f"groundhog_{name}"
+            lines.extend([f"# HELP {metric} {text}", f"# TYPE {metric} {kind}", f"{metric} {stats[name]}"])
+        return "\n".join(lines) + "\n"
+
+    def dump(self) -> None:
+        """dump function to write the stats to the standard error or the stats file
+
+        Returns
+        -------
+            None
+        """
+        text = self.render()
+        if not self.path:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+            return
+        try:
+            with open(self.path, "w") as file:
+                file.write(text)
+        except OSError:
+            raise GroundhogError("Invalid stats file")
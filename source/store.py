@@ -0,0 +1,300 @@
+import os, struct
+from .binary import BinarySeries, HEADER as SERIES, MAGIC as SERIES_MAGIC
+from .checkpoint import Checkpoint, ENTRY, HEADER as STATE, SIZE, SUMS, CRC
+from .record import WRITERS
+from .stream import GroundhogStream
+from .wizard import Groundhog, GroundhogError
+
+MAGIC = b"GHINDEX\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHIII")
+RECORD = struct.Struct("<QI")
+EVERY = 1024
+CHUNK = 1 << 16
+
+class SeriesStore:
+    """SeriesStore class to keep a series on disk and recompute any range of it quickly
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. The values are appended to a binary series file (BinarySeries
+        format), so every other mode can read it with --input
+        2. Every `every` values, the streaming state of a GroundhogStream fed
+        with them is appended to path.idx as a Checkpoint snapshot, padded to the
+        largest snapshot of the period and top, so the snapshot before any
+        position is found by its offset alone
+        3. A range is recomputed by restoring the snapshot before it and
+        replaying at most `every` values before its first one, with the same
+        state as a full replay, so the output is the same
+        4. Appending restores the state at the end of the series the same way
+
+    Attributes
+    ----------
+        path (str): The file of the values, the index being path.idx
+        period (int): The period of the analysis
+        top (int): The number of weirdest values kept by the snapshots
+        every (int): The number of values between two snapshots
+        size (int): The size of a snapshot record
+
+    Methods
+    -------
+        append(lines: Iterator[str | float]) -> int
+        query(out: TextIO, start: int, end: int, style: str) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, path: str, period: int = None, top: int = 5, every: int = EVERY):
+        """Initialize the SeriesStore class, creating the store if it does not exist
+
+        Parameters
+        ----------
+            path (str): The file of the values
+            period (int): The period of a new store, or of an existing one to
+            check it, None to open an existing store
+            top (int): The number of weirdest values of a new store
+            every (int): The number of values between two snapshots of a new store
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the store cannot be read or
+            created, or was created with another period
+
+        Returns
+        -------
+            None
+        """
+        self.path = path
+        self.index = path + ".idx"
+        try:
+            if not os.path.exists(self.index) and period is not None:
+                self.create(period, top, every)
+            with open(self.index, "rb") as file:
+                magic, version, self.period, self.top, self.every = HEADER.unpack(file.read(HEADER.size))
+        except (OSError, struct.error):
+            raise GroundhogError("Invalid store")
+        if magic != MAGIC or version != VERSION or period is not None and period != self.period:
+            raise GroundhogError("Invalid store")
+        self.size = RECORD.size + self.largest(self.period, self.top)
+
+    @staticmethod
+    def largest(period: int, top: int) -> int:
+        """largest function to compute the size of the largest snapshot
+
+        Parameters
+        ----------
+            period (int): The period of the analysis
+            top (int): The number of weirdest values
+
+        Returns
+        -------
+            int: Return the size in bytes of a full Checkpoint.dump
+        """
+        return STATE.size + SUMS.size + 3 * SIZE.size + 8 * (period + 2) + 8 * top + ENTRY.size * top + CRC.size
+
+    @staticmethod
+    def fresh(period: int, top: int) -> GroundhogStream:
+        """fresh function to build a silent stream for the store
+
+        Parameters
+        ----------
+            period (int): The period of the analysis
+            top (int): The number of weirdest values
+
+        Returns
+        -------
+            GroundhogStream: Return the stream, its Groundhog without a writer
+        """
+        return GroundhogStream(period, top)
+
+    def create(self, period: int, top: int, every: int) -> None:
+        """create function to write an empty series and the snapshot of the empty state
+
+        Parameters
+        ----------
+            period (int): The period of the analysis
+            top (int): The number of weirdest values
+            every (int): The number of values between two snapshots
+
+        Returns
+        -------
+            None
+        """
+        with open(self.path, "wb") as file:
+            file.write(SERIES.pack(SERIES_MAGIC, 0))
+        self.size = RECORD.size + self.largest(period, top)
+        with open(self.index, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, period, top, every))
+            file.write(self.record(0, self.fresh(period, top).groundhog))
+
+    def record(self, position: int, groundhog: Groundhog) -> bytes:
+        """record function to pack the snapshot of a Groundhog
+
+        Parameters
+        ----------
+            position (int): The number of values fed to it
+            groundhog (Groundhog): The Groundhog
+
+        Returns
+        -------
+            bytes: Return the record, padded to the size of every record
+        """
+        state = Checkpoint.dump(groundhog)
+        return (RECORD.pack(position, len(state)) + state).ljust(self.size, b"\0")
+
+    def restore(self, position: int, values) -> GroundhogStream:
+        """restore function to rebuild the state after some values
+
+        Parameters
+        ----------
+            position (int): The number of values to replay
+            values (memoryview | np.ndarray): The values of the series
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the snapshot is missing or corrupted
+
+        Returns
+        -------
+            GroundhogStream: Return a silent stream fed with the first position values
+        """
+        slot = position // self.every
+        try:
+            with open(self.index, "rb") as file:
+                file.seek(HEADER.size + slot * self.size)
+                record = file.read(self.size)
+            start, length = RECORD.unpack_from(record)
+        except (OSError, struct.error):
+            raise GroundhogError("Invalid store")
+        if start != slot * self.every:
+            raise GroundhogError("Invalid store")
+        stream = self.fresh(self.period, self.top)
+        Checkpoint.load(record[RECORD.size:RECORD.size + length], stream.groundhog)
+        self.replay(stream, values[start:position].tolist())
+        return stream
+
+    @staticmethod
+    def replay(stream: GroundhogStream, values: list[float]) -> None:
+        """replay function to feed values to a stream
+
+        Parameters
+        ----------
+            stream (GroundhogStream): The stream
+            values (list[float]): The values
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if an increase is not a number
+
+        Returns
+        -------
+            None
+        """
+        for _ in stream.feed_many(values):
+            pass
+
+    def append(self, lines) -> int:
+        """append function to add values at the end of the series
+
+        Parameters
+        ----------
+            lines (Iterator[str | float]): The values, or lines holding them, up to STOP or the end
+
+        Logic
+        -----
+            1. Parse the lines by chunks, a chunk holding an invalid line not being stored
+            2. Write the values, then the snapshots they complete, then the new
+            count in the header of the series, so an interrupted append leaves
+            a valid store
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a line is not a number
+
+        Returns
+        -------
+            int: Return the number of values stored
+        """
+        series = BinarySeries(self.path)
+        count = series.count
+        stream = self.restore(count, series.view)
+        del series
+        chunk = []
+        with open(self.path, "r+b") as values, open(self.index, "r+b") as index:
+            for line in lines:
+                if line == "STOP":
+                    break
+                chunk.append(line)
+                if len(chunk) == CHUNK:
+                    count = self.extend(values, index, stream, chunk, count)
+                    chunk = []
+            return self.extend(values, index, stream, chunk, count)
+
+    def extend(self, values, index, stream: GroundhogStream, chunk: list, count: int) -> int:
+        """extend function to store a chunk of values
+
+        Parameters
+        ----------
+            values (BinaryIO): The file of the values
+            index (BinaryIO): The index
+            stream (GroundhogStream): The stream fed with the values stored
+            chunk (list[str | float]): The lines of the chunk
+            count (int): The number of values stored
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a line is not a number
+
+        Returns
+        -------
+            int: Return the new number of values stored
+        """
+        chunk = list(map(Groundhog.check_input, chunk))
+        values.seek(SERIES.size + 8 * count)
+        BinarySeries.write(values, chunk)
+        records = []
+        for _ in stream.feed_many(chunk):
+            count += 1
+            if count % self.every == 0:
+                records.append(self.record(count, stream.groundhog))
+        values.flush()
+        if records:
+            index.seek(HEADER.size + (count // self.every - len(records) + 1) * self.size)
+            index.write(b"".join(records))
+            index.flush()
+        values.seek(0)
+        values.write(SERIES.pack(SERIES_MAGIC, count))
+        values.flush()
+        return count
+
+    def query(self, out, start: int, end: int, style: str = "text") -> None:
+        """query function to write the ticks of a range of the series
+
+        Parameters
+        ----------
+            out (TextIO): The output stream, None for the standard output
+            start (int): The first position
+            end (int): The position after the last one
+            style (str): The output format, a key of WRITERS
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the range is outside the series
+
+        Returns
+        -------
+            None
+        """
+        series = BinarySeries(self.path)
+        if not 0 <= start <= end <= series.count:
+            raise GroundhogError("Invalid range")
+        stream = self.restore(start, series.view)
+        groundhog = stream.groundhog
+        groundhog.out = out
+        groundhog.writer = WRITERS[style](groundhog)
+        self.replay(stream, series.view[start:end].tolist())
@@ -0,0 +1,132 @@
+from .anomaly import Anomaly, DETECTORS, TRENDS
+from .record import Summary, Tick
+from .window import RollingWindow
+from .wizard import Groundhog, GroundhogError
+
+class GroundhogStream:
+    """GroundhogStream class to embed the streaming analysis in a program
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Hold the state of one stream, like the program between two values
+        2. Return a Tick for every value fed and a Summary at the end, without
+        reading the standard input, writing to the standard output or exiting
+        3. The program itself is an adapter over it, giving it the lines it
+        reads and writing what it returns
+
+    Attributes
+    ----------
+        groundhog (Groundhog): The state of the stream
+
+    Methods
+    -------
+        feed(value: float | str) -> Tick
+        feed_many(values: Iterable[float | str]) -> Iterator[Tick]
+        finish() -> Summary
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, period: int, top: int = 5, groundhog: Groundhog = None, detector: str = "bollinger",
+        trend: str = "switch", rolling: bool = False):
+        """Initialize the GroundhogStream class
+
+        Parameters
+        ----------
+            period (int): The period of the data
+            top (int): The number of weirdest values to keep
+            groundhog (Groundhog): The state to drive, with its writer and
+            detectors, a new silent one if None
+            detector (str): The detector ranking the weirdest values of a new
+            state, bollinger, ewma or zscore
+            trend (str): The detector of the switches of a new state, switch or cusum
+            rolling (bool): Compute the minimum, maximum, median and 95th
+            percentile of every window of a new state
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the period, top or a detector is invalid
+
+        Returns
+        -------
+            None
+        """
+        if groundhog is None:
+            if not isinstance(period, int) or period < 0:
+                raise GroundhogError("Invalid period")
+            if not isinstance(top, int) or top < 1:
+                raise GroundhogError("Invalid top")
+            groundhog = Groundhog()
+            groundhog.window = RollingWindow(period)
+            groundhog.anomaly = Anomaly(top)
+            groundhog.writer = None
+            groundhog.detector = Groundhog.build(DETECTORS, detector, period)
+            groundhog.trend = Groundhog.build(TRENDS, trend, period)
+            if rolling:
+                from .order import RollingOrder
+                groundhog.order = RollingOrder(groundhog.window)
+        self.groundhog = groundhog
+
+    def feed(self, value) -> Tick:
+        """feed function to analyse a new value
+
+        Parameters
+        ----------
+            value (float | str): The value, or a line holding it
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the value is not a number, or
+            if its increase is not a number
+
+        Returns
+        -------
+            Tick: Return g, r, s, the switch flag and the bollinger position of the value
+        """
+        groundhog = self.groundhog
+        try:
+            return groundhog.feed(groundhog.check_input(value))
+        except ValueError:
+            raise GroundhogError("Invalid input, please enter a valid number")
+
+    def feed_many(self, values):
+        """feed_many function to analyse values lazily
+
+        Parameters
+        ----------
+            values (Iterable[float | str]): The values
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a value is not a number, after
+            the ticks of the values before it
+
+        Returns
+        -------
+            Iterator[Tick]: Return the tick of every value, as it is analysed
+        """
+        feed = self.feed
+        for value in values:
+            yield feed(value)
+
+    def finish(self) -> Summary:
+        """finish function to build the end of stream report
+
+        Logic
+        -----
+            1. The stream is left as it is, so more values can still be fed
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the average is not enough
+
+        Returns
+        -------
+            Summary: Return the switches and the weirdest values
+        """
+        return self.groundhog.summary()
@@ -0,0 +1,195 @@
+import os
+from sys import exit
+from .anomaly import Anomaly
+from .stream import GroundhogStream
+from .window import RollingWindow
+from .wizard import BUFFER, Groundhog, GroundhogError
+
+class Sweep:
+    """Sweep class to analyse the same input with several periods in one pass
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Read and parse every input line once
+        2. Store each value once in a ring buffer sized for the longest period
+        3. Feed it to one GroundhogStream per period, whose rolling window
+        reads that shared buffer
+        4. Write each period to its own file, or prefix its lines with the period
+
+    Attributes
+    ----------
+        periods (list[int]): The periods to analyse
+        buffer (list[float]): The ring buffer shared by every window
+        count (int): The number of values read
+        groundhogs (list[Groundhog]): One analysis per period
+        streams (list[GroundhogStream]): The streams driving them
+
+    Methods
+    -------
+        check_periods(periods: str) -> list[int]
+        run(reader: Groundhog) -> None
+
+    Returns
+    -------
+        None
+    """
+    def __init__(self, periods: list[int], options: dict):
+        """Initialize the Sweep class
+
+        Parameters
+        ----------
+            periods (list[int]): The periods to analyse
+            options (dict): The command line options
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the output directory cannot be written
+
+        Returns
+        -------
+            None
+        """
+        self.periods = periods
+        self.options = options
+        self.buffer = [0.0] * (max(periods) + 2)
+        self.count = 0
+        self.groundhogs = []
+        for period in periods:
+            groundhog = Groundhog()
+            groundhog.window = RollingWindow(period, self.buffer)
+            groundhog.anomaly = Anomaly(options["top"])
+            if options["output"]:
+                try:
+                    os.makedirs(options["output"], exist_ok=True)
+                    groundhog.out = open(os.path.join(options["output"], f"groundhog_{period}.txt"),
+                        "w", buffering=BUFFER)
+                except OSError:
+                    raise GroundhogError("Invalid output directory")
+            else:
+                groundhog.prefix = f"{period}\t"
+            self.groundhogs.append(groundhog)
+        self.streams = list(GroundhogStream(period, options["top"], groundhog)
+            for period, groundhog in zip(periods, self.groundhogs))
+
+    @staticmethod
+    def check_periods(periods: str) -> list[int]:
+        """check_periods function to parse a list of periods
+
+        Parameters
+        ----------
+            periods (str): Comma separated periods or ranges (7,14,30 or 7-30 or 7-28:7)
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if a period or a range is invalid
+
+        Returns
+        -------
+            list[int]: Return the sorted periods, without duplicates
+        """
+        result = set()
+        try:
+            for item in periods.split(","):
+                span, _, step = item.partition(":")
+                start, _, end = span.partition("-")
+                start = int(start)
+                end = int(end) if end else start
+                step = int(step) if step else 1
+                if start < 0 or end < start or step < 1:
+                    raise GroundhogError("Invalid periods")
+                result.update(range(start, end + 1, step))
+        except ValueError:
+            raise GroundhogError("Invalid periods")
+        return sorted(result)
+
+    def finish(self, report) -> None:
+        """finish function to display the report of every period
+
+        Parameters
+        ----------
+            report (Callable[[int, Groundhog], None]): The function displaying the report
+            of the i-th period
+
+        Logic
+        -----
+            1. A period whose report fails gets the error line groundhog prints
+            2. The program exits with 84 if any period failed
+
+        Returns
+        -------
+            None
+        """
+        failed = False
+        for i, groundhog in enumerate(self.groundhogs):
+            try:
+                report(i, groundhog)
+            except GroundhogError as e:
+                print(f"{groundhog.prefix}{type(e).__name__}: {e}", file=groundhog.out)
+                failed = True
+            if self.options["output"]:
+                groundhog.out.close()
+        exit(84 if failed else 0)
+
+    def run(self, reader: Groundhog) -> None:
+        """run function to analyse the input of reader with every period
+
+        Parameters
+        ----------
+            reader (Groundhog): The Groundhog reading the input and owning the output
+
+        Logic
+        -----
+            1. A period whose increase is not a number stops there and ends with
+            the error line, like groundhog run with that period alone, while
+            the other periods go on
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the data is invalid.
+
+        Returns
+        -------
+            None
+        """
+        if not self.options["output"]:
+            for groundhog in self.groundhogs:
+                groundhog.out = reader.out
+        if self.options["command"] == "offline":
+            from .offline import OfflineAnalysis
+            data, error = reader.read_series()
+            analyses = list(OfflineAnalysis(data, period, self.options["top"]) for period in self.periods)
+            self.finish(lambda i, groundhog: groundhog.offline_report(analyses[i], error))
+        size = len(self.buffer)
+        errors = [None] * len(self.streams)
+        live = list(enumerate(self.streams))
+        broken = False
+        try:
+            while True:
+                data = reader.read_line()
+                if data == "STOP":
+                    break
+                data = reader.check_input(data)
+                self.buffer[self.count % size] = data
+                self.count += 1
+                for i, stream in live:
+                    try:
+                        stream.feed(data)
+                    except GroundhogError as e:
+                        errors[i] = e
+                        broken = True
+                if broken:
+                    live = list((i, stream) for i, stream in live if errors[i] is None)
+                    broken = False
+        finally:
+            if self.options["output"]:
+                for groundhog in self.groundhogs:
+                    groundhog.out.flush()
+        def report(i: int, groundhog: Groundhog) -> None:
+            if errors[i] is not None:
+                raise errors[i]
+            groundhog.writer.report(self.streams[i].finish())
+        self.finish(report)
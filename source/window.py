@@ -0,0 +1,329 @@
+import math
+
+class RollingWindow:
+    """RollingWindow class to keep the rolling metrics of a series up to date
+
+    Parameters
+    ----------
+        object (class): Inherit from object class
+
+    Logic
+    -----
+        1. Keep the last period + 2 values in a ring buffer
+        2. Keep a running sum of the window, a running sum of the positive
+        deltas and a running Welford variance, evicting the oldest value
+        once the window is full
+        3. Every metric is then read in constant time per sample
+        4. The running sums are rebuilt from the buffer every few periods
+        so that floating point drift stays bounded
+        5. A metric landing on a rounding tie of its printed form is recomputed
+        the way Groundhog does it, so the printed digits never differ
+        6. A value that is not finite or too large for the running sums, whose
+        squares would overflow, makes every metric be recomputed exactly until
+        it leaves the window, then the running sums are rebuilt from the buffer
+
+    Methods
+    -------
+        push(value: float) -> None
+        last(back: int) -> float
+        values(length: int) -> list[float]
+        exact_average_temp(data: list[float], period: int) -> float
+        exact_moving_average(data: list[float], period: int) -> float
+        exact_standard_deviation(data: list[float], period: int) -> float
+        average_temp() -> float
+        temperature_increase() -> float
+        moving_average() -> float
+        standard_deviation() -> float
+
+    Returns
+    -------
+        None
+    """
+    RESYNC = 16
+    TIE = 1e-9
+    LARGE = 1e140
+
+    def __init__(self, period: int, buffer: list[float] = None):
+        """Initialize the RollingWindow class
+
+        Parameters
+        ----------
+            period (int): The period defining the window
+            buffer (list[float]): A ring buffer of at least period + 2 values shared
+            with other windows, its owner storing the values before pushing them
+
+        Returns
+        -------
+            None
+        """
+        self.period = period
+        self.shared = buffer is not None
+        self.buffer = buffer if self.shared else [0.0] * (period + 2)
+        self.size = len(self.buffer)
+        self.count = 0
+        self.total = [0.0, 0.0]
+        self.rise = [0.0, 0.0]
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.clean = 0
+
+    @staticmethod
+    def accumulate(acc: list[float], value: float) -> None:
+        """accumulate function to add a value to a compensated sum
+
+        Parameters
+        ----------
+            acc (list[float]): The running sum and its compensation term
+            value (float): The value to add (negative to remove)
+
+        Logic
+        -----
+            1. Add the value to the running sum
+            2. Keep the lost low order bits in the compensation term (Neumaier)
+
+        Returns
+        -------
+            None
+        """
+        total = acc[0] + value
+        if abs(acc[0]) >= abs(value):
+            acc[1] += (acc[0] - total) + value
+        else:
+            acc[1] += (value - total) + acc[0]
+        acc[0] = total
+
+    def last(self, back: int) -> float:
+        """last function to read a value from the end of the window
+
+        Parameters
+        ----------
+            back (int): How many values to go back, 0 being the latest value
+
+        Returns
+        -------
+            float: Return the value
+        """
+        return self.buffer[(self.count - 1 - back) % self.size]
+
+    def values(self, length: int) -> list[float]:
+        """values function to copy the end of the window, oldest value first
+
+        Parameters
+        ----------
+            length (int): How many values to copy
+
+        Returns
+        -------
+            list[float]: Return the values
+        """
+        return [self.last(i) for i in range(min(self.count, length) - 1, -1, -1)]
+
+    @classmethod
+    def near_tie(cls, value: float, digits: int = 2) -> bool:
+        """near_tie function to check if a value is close to a rounding tie
+
+        Parameters
+        ----------
+            value (float): The value about to be formatted
+            digits (int): The number of decimals it will be printed with
+
+        Returns
+        -------
+            bool: Return True if the printed digits depend on the last bits of the value
+        """
+        scaled = abs(value) * 10 ** digits
+        return abs(scaled % 1 - .5) < cls.TIE * max(1.0, scaled)
+
+    def push(self, value: float) -> None:
+        """push function to feed a new value to the window
+
+        Parameters
+        ----------
+            value (float): The new value
+
+        Logic
+        -----
+            1. Store the value in the ring buffer, unless it is shared
+            2. Add the new positive delta and remove the one leaving the window
+            3. Update the window sum and the Welford mean and variance, evicting
+            the value leaving the window when it is full
+            4. Remember when a value too large for the running sums leaves the
+            window, and rebuild them from the buffer then
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        if not self.shared:
+            self.buffer[self.count % self.size] = value
+        self.count += 1
+        if period == 0:
+            return
+        count = self.count
+        if not -self.LARGE < value < self.LARGE:
+            self.clean = count + period + 1
+        if count > 1:
+            self.accumulate(self.rise, max(0, value - self.last(1)))
+            if count > period + 1:
+                self.accumulate(self.rise, -max(0, self.last(period) - self.last(period + 1)))
+        self.accumulate(self.total, value)
+        if count > period:
+            old = self.last(period)
+            self.accumulate(self.total, -old)
+            mean = self.mean + (value - old) / period
+            self.m2 += (value - old) * ((value - mean) + (old - self.mean))
+            self.mean = mean
+        else:
+            delta = value - self.mean
+            self.mean += delta / count
+            self.m2 += delta * (value - self.mean)
+        if count == self.clean or count % (self.RESYNC * period) == 0 and count > self.clean:
+            self.resync()
+
+    def resync(self) -> None:
+        """resync function to rebuild the running sums from the buffer
+
+        Returns
+        -------
+            None
+        """
+        period = self.period
+        window = self.values(period)
+        self.total = [math.fsum(window), 0.0]
+        self.mean = self.total[0] / len(window)
+        self.m2 = math.fsum((x - self.mean) ** 2 for x in window)
+        deltas = min(self.count - 1, period)
+        self.rise = [math.fsum(max(0, self.last(i) - self.last(i + 1)) for i in range(deltas)), 0.0]
+
+    def average_temp(self) -> float:
+        """average_temp function to read the average temperature increase (g)
+
+        Returns
+        -------
+            float: Return the average of the positive deltas, nan if not enough data
+        """
+        if self.period == 0 or self.count <= self.period:
+            return math.nan
+        period = self.period
+        if self.count < self.clean:
+            return self.exact_average_temp(self.values(period + 1), period)
+        average = max(0.0, self.rise[0] + self.rise[1]) / period
+        if self.near_tie(average):
+            average = self.exact_average_temp(self.values(period + 1), period)
+        return average
+
+    def temperature_increase(self) -> float:
+        """temperature_increase function to read the relative increase (r)
+
+        Logic
+        -----
+            1. Compare the latest value with the one period values before it
+            2. Use the same sign rules as Groundhog.temperature_increase
+
+        Returns
+        -------
+            float: Return the increase in percent, nan if not enough data
+        """
+        if self.count <= self.period:
+            return math.nan
+        current_r = self.last(0)
+        window_r = self.last(self.period)
+        if window_r == 0:
+            return ((current_r - window_r) / 1) * 100
+        elif window_r < 0:
+            return (current_r - window_r) / -window_r * 100
+        return (current_r / window_r - 1) * 100
+
+    def moving_average(self) -> float:
+        """moving_average function to read the moving average of the window
+
+        Returns
+        -------
+            float: Return the moving average, nan if not enough data
+        """
+        if self.period == 0 or self.count < self.period:
+            return math.nan
+        if self.count < self.clean:
+            return self.exact_moving_average(self.values(self.period), self.period)
+        average = (self.total[0] + self.total[1]) / self.period
+        if self.near_tie(average):
+            average = self.exact_moving_average(self.values(self.period), self.period)
+        return average
+
+    def standard_deviation(self) -> float:
+        """standard_deviation function to read the standard deviation (s)
+
+        Returns
+        -------
+            float: Return the population standard deviation, nan if not enough data
+        """
+        if self.period == 0 or self.count < self.period:
+            return math.nan
+        if self.count < self.clean:
+            return self.exact_standard_deviation(self.values(self.period), self.period)
+        stdev = math.sqrt(max(self.m2, 0.0) / self.period)
+        if self.near_tie(stdev):
+            stdev = self.exact_standard_deviation(self.values(self.period), self.period)
+        return stdev
+
+    @staticmethod
+    def exact_average_temp(data: list[float], period: int) -> float:
+        """exact_average_temp function to compute g exactly like Groundhog.average_temp
+
+        Parameters
+        ----------
+            data (list[float]): The last period + 1 values, oldest first
+            period (int): The period of the window
+
+        Returns
+        -------
+            float: Return the average of the positive deltas
+        """
+        return sum(max(0, x - y) for x, y in zip(data[1:], data[:-1])) / period
+
+    @staticmethod
+    def exact_moving_average(data: list[float], period: int) -> float:
+        """exact_moving_average function to compute the mean exactly like Anomaly.moving_average
+
+        Parameters
+        ----------
+            data (list[float]): The last period values, oldest first
+            period (int): The period of the window
+
+        Returns
+        -------
+            float: Return the moving average
+        """
+        return sum(data) / period
+
+    @staticmethod
+    def exact_standard_deviation(data: list[float], period: int) -> float:
+        """exact_standard_deviation function to compute s exactly like Groundhog.stdev_function
+
+        Parameters
+        ----------
+            data (list[float]): The last period values, oldest first
+            period (int): The period of the window
+
+        Logic
+        -----
+            1. The mean is the same for every term, so it is computed once
+            2. Scale the deviations by the largest one when the sum of their
+            squares overflows, so a window of finite values keeps a finite s
+
+        Returns
+        -------
+            float: Return the population standard deviation
+        """
+        import statistics
+        mean = statistics.mean(data)
+        deviations = [x - mean for x in data]
+        try:
+            variance = sum(x ** 2 for x in deviations) / period
+        except OverflowError:
+            variance = math.inf
+        if variance == math.inf and all(map(math.isfinite, deviations)):
+            scale = max(abs(x) for x in deviations)
+            return scale * math.sqrt(sum((x / scale) ** 2 for x in deviations) / period)
+        return math.sqrt(variance)
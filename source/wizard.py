@@ -1,6 +1,33 @@
-import statistics, math
+import codecs, math, sys
 from sys import argv
-from .anomaly import Anomaly
+from .anomaly import Anomaly, DETECTORS, TRENDS
+from .window import RollingWindow
+from .record import EMPTY, Summary, Tick, TextWriter, WRITERS
+
+OPTIONS = {
+    "top": 5,
+    "batch": False,
+    "input": "",
+    "periods": "",
+    "output": "",
+    "keyed": False,
+    "checkpoint": "",
+    "every": 0,
+    "resume": "",
+    "unix": "",
+    "port": 0,
+    "sessions": 1024,
+    "stats": "",
+    "stats-file": "",
+    "format": "text",
+    "beyond": 0.0,
+    "detector": "bollinger",
+    "trend": "switch",
+    "rolling": False,
+    "jobs": 1,
+}
+COMMANDS = ("offline", "convert", "serve", "store", "query")
+BUFFER = 1 << 20
 
 class GroundhogError(Exception):
     """GroundhogError class to handle exceptions
@@ -53,12 +80,25 @@ class Groundhog:
         -------
             None
         """
-        self.elem = []
         self.switch = 0
-        self.tab = []
-        self.tab1 = []
         self.check = True
         self.curr = True
+        self.window = None
+        self.head = []
+        self.anomaly = None
+        self.lines = None
+        self.series = None
+        self.reading = False
+        self.resumed = False
+        self.stats = None
+        self.out = None
+        self.prefix = ""
+        self.state = (math.nan, math.nan, math.nan)
+        self.writer = TextWriter(self)
+        self.threshold = None
+        self.detector = None
+        self.trend = None
+        self.order = None
 
     @staticmethod
     def average_temp(period: int, data: list[float | int]) -> float:
@@ -79,15 +119,15 @@ class Groundhog:
 
         Returns
         -------
-            float: Return the average temperature
+            float: Return the average temperature, nan if not enough data
         """
         try:
             if isinstance(data, (list, str)):
                 if len(data) > period:
-                    return f'{sum(max(0, x - y) for x, y in zip(data[-period:], data[-period - 1:-1])) / period:.2f}'
+                    return sum(max(0, x - y) for x, y in zip(data[-period:], data[-period - 1:-1])) / period
         except ZeroDivisionError:
             pass
-        return "nan"
+        return math.nan
 
     @staticmethod
     def stdev_function(data: list[float | int], period: int) -> float:
@@ -108,15 +148,16 @@ class Groundhog:
 
         Returns
         -------
-            float: Return the standard deviation
+            float: Return the standard deviation, nan if not enough data
         """
+        import statistics
         try:
             if isinstance(data, (list, str)):
                 if len(data) >= period:
-                    return f'{math.sqrt(sum((x - statistics.mean(data[-period:])) ** 2 for x in data[-period:]) / period):.2f}'
+                    return math.sqrt(sum((x - statistics.mean(data[-period:])) ** 2 for x in data[-period:]) / period)
         except ZeroDivisionError:
             pass
-        return "nan"
+        return math.nan
 
     def temperature_increase(self, data: list[float | int], period: int) -> float:
         """temperature_increase function to calculate the temperature increase
@@ -135,7 +176,7 @@ class Groundhog:
 
         Returns
         -------
-            float: Return the temperature increase
+            float: Return the temperature increase, nan if not enough data
         """
         if isinstance(data, (list, str)):
             if len(data) > period:
@@ -147,8 +188,8 @@ class Groundhog:
                     temperature_increase = (current_r - window_r) / -window_r * 100
                 else:
                     temperature_increase = (current_r / window_r - 1) * 100
-                return f'{temperature_increase:.0f}'
-        return "nan"
+                return temperature_increase
+        return math.nan
 
     def detect_switch_points(self, data: list[float | int], period: int) -> str:
         """detect_switch_points function to detect the switch points
@@ -172,48 +213,157 @@ class Groundhog:
         try:
             if isinstance(data, (list, str)):
                 if len(data) > period:
-                    r_1 = self.temperature_increase(data, period)
-                    self.tab.append(int(r_1))
-                    self.curr = False if self.tab[-1] < 0 else True
-                    if self.curr != self.check:
-                        self.check = self.curr
-                        self.switch += 1
-                        return "a switch occurs"
+                    return self.switch_point(self.temperature_increase(data, period))
         except (ZeroDivisionError, IndexError):
             return ""
         return ""
 
-    def formating(self, data: list[float | int], period: int) -> str:
-        """formating function to display the formatted data
+    def switch_point(self, r_1: float) -> str:
+        """switch_point function to update the switch state with a new increase
 
         Parameters
         ----------
-            data (list[float  |  int]): The data to display
-            period (int): The period to display
+            r_1 (float): The temperature increase of the current value
 
         Logic
         -----
-            1. Detect the switch points
-            2. Calculate the standard deviation
-            3. Display the formatted metrics
+            1. The increase is negative if it is printed as a negative integer,
+            so -0.5 and above, printed as -0 or 0, are not
+            2. An increase that is not a number cannot be printed as an integer
+
+        Raises
+        ------
+            ValueError: Raise an exception if the increase is nan or infinite
 
         Returns
         -------
-            str: Return the formatted metrics
+            str: Return a message if a switch occurs
         """
-        switch_message = self.detect_switch_points(data, period)
-        sdev = self.stdev_function(data, period)
-        if switch_message == "":
-            print(f"g={self.average_temp(period, data)}\t\tr={self.temperature_increase(data, period)}%\t\ts={sdev}")
+        if not math.isfinite(r_1):
+            raise ValueError("cannot convert float NaN or infinity to integer")
+        self.curr = False if r_1 < -.5 else True
+        if self.curr != self.check:
+            self.check = self.curr
+            self.switch += 1
+            return "a switch occurs"
+        return ""
+
+    def evaluate(self, window: RollingWindow) -> Tick:
+        """evaluate function to compute everything about the latest value, once
+
+        Parameters
+        ----------
+            window (RollingWindow): The rolling window holding the data
+
+        Logic
+        -----
+            1. Read the metrics of the window, as floats
+            2. Detect the switch points, from the sign of r or with the trend detector
+            3. Normalise the latest value inside its bollinger bands, rounded
+            to 2 decimals like they are printed, or give it to the detector,
+            and keep it if it is one of the weirdest values
+            4. With a threshold, check if its distance to the middle of the
+            bands is beyond the percentile of the distances so far
+            5. With order statistics, read the minimum, maximum, median and
+            95th percentile of the window
+
+        Returns
+        -------
+            Tick: Return the record of the value
+        """
+        g, r, s = self.state = self.metrics()
+        count = window.count
+        value = window.last(0)
+        if self.trend is None:
+            switch = self.switch_point(r) != "" if count > window.period else False
         else:
-            print(f"g={self.average_temp(period, data)}\t\tr={self.temperature_increase(data, period)}%\t\ts={sdev}\t\t{switch_message}")
+            if count > window.period and not math.isfinite(r):
+                raise ValueError("cannot convert float NaN or infinity to integer")
+            switch = self.trend.update(value)
+            self.switch += switch
+        rolling = EMPTY
+        if self.order is not None:
+            self.order.push()
+            rolling = self.order.read()
+        detector = self.detector
+        position = None
+        if detector is not None:
+            position = detector.update(value)
+            if math.isnan(position):
+                return Tick(count - 1, value, g, r, s, switch, position, False, rolling)
+            distance = detector.distance(position)
+            self.anomaly.keep(count - 1, distance, value)
+        elif not math.isnan(s):
+            position = self.anomaly.observe(count - 1, value, round(window.moving_average(), 2), round(s, 2))
+            if position is not None:
+                distance = abs(position - .5)
+        if position is None:
+            return Tick(count - 1, value, g, r, s, switch, math.nan, False, rolling)
+        beyond = self.threshold is not None and self.threshold.beyond(distance)
+        return Tick(count - 1, value, g, r, s, switch, position, beyond, rolling)
+
+    def formating(self, window: RollingWindow) -> str:
+        """formating function to display the formatted data
+
+        Parameters
+        ----------
+            window (RollingWindow): The rolling window holding the data
+
+        Logic
+        -----
+            1. Evaluate the latest value
+            2. Hand its record to the writer, the only place it is formatted,
+            unless there is no writer (library use)
+
+        Returns
+        -------
+            Tick: Return the record of the value
+        """
+        tick = self.evaluate(window)
+        if self.writer is not None:
+            self.writer.tick(tick)
+        return tick
 
     @staticmethod
     def usage():
         """
         usage function to display the usage of the program
         """
-        print("SYNOPSIS\n\t./groundhog period\nDESCRIPTION\n\tperiod the number of days defining a period")
+        print("SYNOPSIS\n\t./groundhog [offline] (period | --periods list) [--top n] [--batch] [--input file] [--output dir] [--keyed]"
+            "\n\t\t[--checkpoint file] [--every n] [--resume file] [--stats format] [--stats-file file] [--format format]"
+            "\n\t\t[--beyond percentile] [--detector detector] [--trend trend] [--rolling] [--jobs n]"
+            "\n\t./groundhog convert text binary"
+            "\n\t./groundhog store path period [--top n] [--every n] [--input file]"
+            "\n\t./groundhog query path start end [--format format]"
+            "\n\t./groundhog serve period (--unix path | --port port) [--sessions n] [--top n]\nDESCRIPTION\n\tperiod the number of days defining a period"
+            "\n\toffline analyse the whole series at once with numpy"
+            "\n\tconvert write a text series (- for the standard input) to a binary series file"
+            "\n\tserve analyse every connection as its own stream, speaking the same line protocol"
+            "\n\tstore append the values to the series stored at path, with a snapshot of the analysis every n values"
+            " (1024 by default)"
+            "\n\tquery write the lines of the values start to end (excluded) of a stored series"
+            "\n\t--top n the number of weirdest values to display (5 by default)"
+            "\n\t--batch read the standard input and write the output in large blocks"
+            "\n\t--input file read the values from a file, in batch mode, text or binary series (.npy or converted)"
+            "\n\t--periods list analyse several periods in one pass (7,14,30 or 7-30 or 7-28:7)"
+            "\n\t--output dir write the output of each period to dir/groundhog_<period>.txt"
+            "\n\t--keyed read \"key value\" lines and analyse each key as its own series, in batch mode"
+            "\n\t--checkpoint file save the streaming state to file on SIGUSR1 and SIGTERM (then exit), not with --batch or --input"
+            "\n\t--every n also save the streaming state every n values"
+            "\n\t--resume file restore the streaming state from file and keep saving it there"
+            "\n\t--stats format time every stage and dump the stats as json or prometheus on SIGUSR1 and at the end"
+            "\n\t--stats-file file write the stats to file instead of the standard error"
+            "\n\t--format format write the value lines as text, csv, ndjson or binary records"
+            "\n\t--beyond percentile flag the values further from the middle of their bands than this"
+            " percentile of the values so far (99.9 for instance), in bounded memory"
+            "\n\t--detector detector rank the weirdest values with bollinger bands (by default), or with the"
+            " ewma bands or zscore of an exponentially weighted mean and variance, in constant memory"
+            "\n\t--trend trend detect the switches from the sign of r (switch, by default) or with a cusum"
+            "\n\t--rolling also write the minimum, maximum, median and 95th percentile of every window"
+            "\n\t--jobs n analyse the series offline in chunks on n worker processes (1 by default)"
+            "\n\t--unix path serve on a unix socket"
+            "\n\t--port port serve on a localhost TCP port"
+            "\n\t--sessions n the number of concurrent connections served (1024 by default)")
 
     @staticmethod
     def check_input(data: list[float | int]) -> float:
@@ -238,7 +388,48 @@ class Groundhog:
         return data
 
     @staticmethod
-    def check_arg() -> int:
+    def check_options(args: list[str]) -> tuple[list[str], dict]:
+        """ check_options function to split the options from the positional arguments
+
+        Parameters
+        ----------
+            args (list[str]): The command line arguments, without the program name
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if an option is unknown or has no value
+            GroundhogError: Raise an exception if an option value is invalid
+
+        Returns
+        -------
+            tuple[list[str], dict]: Return the positional arguments and the options
+        """
+        positional = []
+        options = dict(OPTIONS)
+        args = iter(args)
+        for arg in args:
+            if not arg.startswith("--"):
+                positional.append(arg)
+                continue
+            name = arg[2:]
+            if name not in OPTIONS:
+                raise GroundhogError("Invalid argument")
+            if isinstance(OPTIONS[name], bool):
+                options[name] = True
+                continue
+            value = next(args, None)
+            if value is None:
+                raise GroundhogError(f"{arg} needs a value")
+            try:
+                options[name] = type(OPTIONS[name])(value)
+            except ValueError:
+                raise GroundhogError(f"{arg} must be an integer")
+        if options["top"] < 1:
+            raise GroundhogError("Invalid top")
+        return positional, options
+
+    @staticmethod
+    def check_arg() -> tuple[int, dict]:
         """ check_arg function to check the argument
 
         Raises
@@ -249,90 +440,393 @@ class Groundhog:
 
         Returns
         -------
-            int: Return the period
+            tuple[int, dict]: Return the period and the options
         """
-        if len(argv) != 2:
+        positional, options = Groundhog.check_options(argv[1:])
+        options["command"] = positional.pop(0) if positional and positional[0] in COMMANDS else ""
+        if options["keyed"] and (options["periods"] or options["command"]):
+            raise GroundhogError("Invalid argument")
+        if (options["checkpoint"] or options["resume"] or options["stats"] or options["beyond"] or options["rolling"]
+            or options["format"] != "text" and options["command"] != "query") and (options["periods"] or options["command"] or options["keyed"]):
+            raise GroundhogError("Invalid argument")
+        if options["beyond"] and (options["checkpoint"] or options["resume"] or not 0 < options["beyond"] < 100):
+            raise GroundhogError("Invalid argument")
+        if (options["checkpoint"] or options["resume"]) and (options["batch"] or options["input"]):
+            raise GroundhogError("Invalid argument")
+        if (options["detector"] != "bollinger" or options["trend"] != "switch") and (options["periods"]
+            or options["command"] or options["checkpoint"] or options["resume"]):
+            raise GroundhogError("Invalid argument")
+        if options["jobs"] < 1 or options["jobs"] > 1 and (options["command"] != "offline" or options["periods"]):
+            raise GroundhogError("Invalid argument")
+        if options["every"] < 0 or options["format"] not in WRITERS or options["detector"] not in DETECTORS \
+            or options["trend"] not in TRENDS:
+            raise GroundhogError("Invalid argument")
+        if options["command"] in ("serve", "query") and (options["periods"] or options["keyed"] or options["batch"] or options["input"]):
+            raise GroundhogError("Invalid argument")
+        if options["command"] == "store" and (options["periods"] or options["keyed"]):
+            raise GroundhogError("Invalid argument")
+        if options["command"] == "convert":
+            if len(positional) != 2:
+                raise GroundhogError("Invalid argument")
+            options["files"] = positional
+            return None, options
+        if options["command"] == "query":
+            if len(positional) != 3:
+                raise GroundhogError("Invalid argument")
+            options["files"] = positional[:1]
+            try:
+                options["range"] = (int(positional[1]), int(positional[2]))
+            except ValueError:
+                raise GroundhogError("Invalid range")
+            return None, options
+        if options["command"] == "store":
+            if len(positional) != 2:
+                raise GroundhogError("Invalid argument")
+            options["files"] = [positional.pop(0)]
+        if options["periods"]:
+            if positional != []:
+                raise GroundhogError("Invalid argument")
+            return None, options
+        if len(positional) != 1:
             raise GroundhogError("Invalid argument")
         try:
-            period = int(argv[1])
+            period = int(positional[0])
             if period < 0:
                 raise GroundhogError("Invalid period")
         except ValueError:
             raise GroundhogError("must be an integer")
-        return period
+        return period, options
+
+    def weirdest(self) -> str:
+        """ weirdest function to list the weirdest values
+
+        Logic
+        -----
+            1. Take the values kept by Anomaly.observe, furthest first
+            2. Fall back on the first inputs if nothing could be normalised
+
+        Returns
+        -------
+            list[float]: Return the weirdest values
+        """
+        fdata = self.anomaly.weirdest()
+        if fdata == []:
+            fdata = self.head
+        return fdata
 
     @staticmethod
-    def weirdest(normalised: list[float], data: list[float | int], period: int) -> str:
-        """ weirdest function to display the weirdest values
+    def build(kinds: dict, name: str, period: int):
+        """ build function to create a detector from its name
+
+        Parameters
+        ----------
+            kinds (dict): DETECTORS or TRENDS
+            name (str): The name of the detector
+            period (int): The period of the data
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the name is unknown
+
+        Returns
+        -------
+            EwmaBands | Cusum: Return the detector, None for the default one
+        """
+        if name not in kinds:
+            raise GroundhogError("Invalid detector")
+        return None if kinds[name] is None else kinds[name](period)
+
+    def metrics(self) -> tuple[float, float, float]:
+        """ metrics function to read the current g, r and s of the rolling window
+
+        Returns
+        -------
+            tuple[float, float, float]: Return the metrics, nan if not enough data
+        """
+        window = self.window
+        return window.average_temp(), window.temperature_increase(), window.standard_deviation()
+
+    def calculate_data(self, period: int) -> tuple[float, float, float]:
+        """ calculate_data function to calculate the data
 
         Parameters
         ----------
-            normalised (list[float]): list of normalised data
-            data (list[float  |  int]): The input data
             period (int): The period of the data
 
         Logic
         -----
-            1. Normalise the data
-            2. Calculate the weirdest values
-            3. Display the weirdest values
-            4. How are the weirdest values calculated? 
-            The weirdest values are calculated by sorting
-            the normalised data in ascending order and then
-            selecting the last 5 values based on their index in the list of inputs.
+            1. Everything is computed once per value by evaluate, when it is fed
+            2. Return g, r and s of the latest value
 
         Returns
         -------
-            str: Return the weirdest values
+            tuple[float, float, float]: Return the calculated data
         """
-        normalised = list(abs(x - .5) for x in normalised)
-        top_5 = sorted(normalised)[-5:]
-        fdata = list(data[normalised.index(x) + period - 1] for x in top_5)
-        if fdata == []:
-            fdata = data[0:5]
+        return self.state
+
+    def feed(self, data: float) -> Tick:
+        """ feed function to process a new value and display its metrics
+
+        Parameters
+        ----------
+            data (float): The new value
+
+        Returns
+        -------
+            Tick: Return the record of the value
+        """
+        if len(self.head) < self.anomaly.top:
+            self.head.append(data)
+        self.window.push(data)
+        return self.formating(self.window)
+
+    def summary(self) -> Summary:
+        """ summary function to build the end of stream report
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the average is not enough.
+
+        Returns
+        -------
+            Summary: Return the switches and the weirdest values
+        """
+        if all(math.isnan(elem) for elem in self.state):
+            raise GroundhogError("Not enough data to compute the average")
+        return Summary(self.switch, self.anomaly.top, self.weirdest())
+
+    def report(self, g: float, r: float, s: float) -> None:
+        """ report function to display the end of stream report
+
+        Parameters
+        ----------
+            g (float): The last average temperature
+            r (float): The last temperature increase
+            s (float): The last standard deviation
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the average is not enough.
+
+        Returns
+        -------
+            None
+        """
+        if all(math.isnan(elem) for elem in (g, r, s)):
+            raise GroundhogError("Not enough data to compute the average")
+        self.writer.report(self.summary())
+
+    def handle_input(self, stream):
+        data = self.read_line()
+        if data == "STOP":
+            self.report(*self.state)
+            exit(0)
+        stream.feed(data)
+
+    @staticmethod
+    def split_block(text: str) -> tuple[list[str], str]:
+        """ split_block function to split decoded text into complete lines
+
+        Parameters
+        ----------
+            text (str): The text, starting with the partial line of the previous block
+
+        Logic
+        -----
+            1. Split on LF only, a CR staying in its line like with input()
+
+        Returns
+        -------
+            tuple[list[str], str]: Return the complete lines and the partial last line
+        """
+        lines = text.split("\n")
+        return lines, lines.pop()
+
+    @staticmethod
+    def read_lines(stream, encoding: str):
+        """ read_lines function to split a binary stream into lines, block by block
+
+        Parameters
+        ----------
+            stream (BinaryIO): The stream to read
+            encoding (str): The encoding of the stream
+
+        Logic
+        -----
+            1. Read the stream in blocks of BUFFER bytes
+            2. Decode each block, keeping multibyte characters cut by the block intact
+            3. Split it with split_block, which splits on LF only like input() does
+            4. Yield every complete line and carry the last partial one over
+
+        Returns
+        -------
+            Iterator[str]: Return the lines, without their line ending
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        rest = ""
+        while True:
+            block = stream.read(BUFFER)
+            text = rest + decoder.decode(block, final=not block)
+            if not block:
+                break
+            lines, rest = Groundhog.split_block(text)
+            yield from lines
+        lines = text.split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        yield from lines
+
+    def read_line(self) -> str:
+        """ read_line function to read the next input line
+
+        Raises
+        ------
+            EOFError: Raise an exception if the input is exhausted, like input()
+
+        Returns
+        -------
+            str: Return the line
+        """
+        self.reading = True
+        try:
+            line = input() if self.lines is None else next(self.lines, None)
+        finally:
+            self.reading = False
+        if line is None:
+            raise EOFError("EOF when reading a line")
+        return line
+
+    def open_batch(self, options: dict) -> None:
+        """ open_batch function to switch to block reads and buffered writes
+
+        Parameters
+        ----------
+            options (dict): The command line options
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the input file cannot be opened
+
+        Returns
+        -------
+            None
+        """
+        from .binary import BinarySeries
+        if options["input"] and BinarySeries.is_binary(options["input"]):
+            if options["keyed"]:
+                raise GroundhogError("Invalid argument")
+            self.series = BinarySeries(options["input"])
+            self.lines = self.series.lines()
+        elif options["input"]:
+            try:
+                stream = open(options["input"], "rb")
+            except OSError:
+                raise GroundhogError("Invalid file")
+            self.lines = self.read_lines(stream, sys.stdin.encoding or "utf-8")
         else:
-            fdata = fdata[::-1]
-        print(f"5 weirdest values are {fdata}")
+            self.lines = self.read_lines(sys.stdin.buffer, sys.stdin.encoding or "utf-8")
+        sys.stdout.flush()
+        self.out = open(sys.stdout.fileno(), "w", buffering=BUFFER,
+            encoding=sys.stdout.encoding, closefd=False)
 
-    def calculate_data(self, period: int, abbrev: Anomaly,
-        mov_avg: list[float], stdev: list[float], normalised: 
-        list[float]) -> tuple[float, float, float, list[float], list[float], list[float]]:
-        """ calculate_data function to calculate the data
+    def read_series(self) -> tuple[list[float], GroundhogError]:
+        """ read_series function to read every value up to STOP or the end of the input
+
+        Returns
+        -------
+            tuple[list[float], GroundhogError]: Return the values before the first
+            invalid line, and the error it raises (None if every line is valid)
+        """
+        if self.series is not None:
+            return self.series.array(), None
+        lines = []
+        for line in self.lines:
+            if line == "STOP":
+                break
+            lines.append(line)
+        try:
+            return list(map(float, lines)), None
+        except ValueError:
+            data = []
+            for line in lines:
+                try:
+                    data.append(self.check_input(line))
+                except GroundhogError as e:
+                    return data, e
+        return data, None
+
+    def offline_report(self, analysis, error: GroundhogError) -> None:
+        """ offline_report function to display an offline analysis like the streaming path
+
+        Parameters
+        ----------
+            analysis (OfflineAnalysis): The analysis of the series
+            error (GroundhogError): The error raised while reading the series, or None
+
+        Raises
+        ------
+            GroundhogError: Raise the same errors as the streaming path, after the
+            lines it would have printed before them
+
+        Returns
+        -------
+            None
+        """
+        analysis.write(self.out, self.prefix)
+        if analysis.broken is not None:
+            raise GroundhogError("Invalid input, please enter a valid number")
+        if error is not None:
+            raise error
+        if len(analysis.values) == 0 or len(analysis.values) < analysis.period:
+            raise GroundhogError("Not enough data to compute the average")
+        print(f"{self.prefix}Global tendency switched {analysis.switch()} times", file=self.out)
+        print(f"{self.prefix}{analysis.top} weirdest values are {analysis.weirdest()}", file=self.out)
+
+    def offline(self, period: int, options: dict) -> None:
+        """ offline function to analyse the whole input at once
+
+        Parameters
+        ----------
+            period (int): The period of the data
+            options (dict): The command line options
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the data is invalid.
+            GroundhogError: Raise an exception if the average is not enough.
+        """
+        data, error = self.read_series()
+        if options["jobs"] > 1:
+            from .parallel import ParallelAnalysis
+            return self.offline_report(ParallelAnalysis(data, period, options["top"], options["jobs"]), error)
+        from .offline import OfflineAnalysis
+        self.offline_report(OfflineAnalysis(data, period, options["top"]), error)
+
+    def open_checkpoint(self, period: int, options: dict):
+        """ open_checkpoint function to restore the streaming state and set up its snapshots
 
         Parameters
         ----------
             period (int): The period of the data
-            abbrev (Anomaly): The Anomaly class
-            mov_avg (list[float]): The moving average
-            stdev (list[float]): The standard deviation
-            normalised (list[float]): The normalised data
+            options (dict): The command line options
+
+        Raises
+        ------
+            GroundhogError: Raise an exception if the state file is invalid or
+            was saved with another period or top
 
         Returns
         -------
-            tuple[float, float, float, list[float], list[float], list[float]]: Return the calculated data
+            Checkpoint: Return the snapshot writer, None without --checkpoint or --resume
         """
-        g, r, s = self.average_temp(self.elem, period), self.temperature_increase(self.elem, period), self.stdev_function(self.elem, period)
-        mov_avg.append(abbrev.moving_average(self.elem, period))
-        stdev.append(abbrev.standard_deviation(self.elem, period))
-        mov_avg = list(filter(None, mov_avg))
-        stdev = list(filter(None, stdev))
-        equalize = abbrev.normalize(self.elem, mov_avg, stdev)
-        if equalize is not None:
-            normalised.append(equalize)
-        return g, r, s, mov_avg, stdev, normalised
-
-    def handle_input(self, g, r, s, normalised, period):
-        data = input()
-        if data == "STOP":
-            if all(elem == "nan" for elem in [g, r, s]):
-                raise GroundhogError("Not enough data to compute the average")
-            else:
-                print(f"Global tendency switched {self.switch} times")
-                self.weirdest(normalised, self.elem, period)
-                exit(0)
-        data = self.check_input(data)
-        self.elem.append(data)
-        self.formating(self.elem, period)
+        if not options["checkpoint"] and not options["resume"]:
+            return None
+        from .checkpoint import Checkpoint
+        if options["resume"]:
+            Checkpoint.resume(self, options["resume"])
+            if self.window.period != period or self.anomaly.top != options["top"]:
+                raise GroundhogError("Invalid state file")
+        return Checkpoint(self, options["checkpoint"] or options["resume"], options["every"])
 
     def run(self):
         """ Run function to execute the groundhog program.
@@ -342,14 +836,60 @@ class Groundhog:
             GroundhogError: Raise an exception if the data is invalid.
             GroundhogError: Raise an exception if the average is not enough.
         """
-        period = self.check_arg()
-        abbrev = Anomaly()
-        mov_avg = []
-        stdev = []
-        normalised = []
-        while True:
-            try:
-                g, r, s, mov_avg, stdev, normalised = self.calculate_data(period, abbrev, mov_avg, stdev, normalised)
-                self.handle_input(g, r, s, normalised, period)
-            except ValueError:
-                raise GroundhogError("Invalid input, please enter a valid number")
\ No newline at end of file
+        period, options = self.check_arg()
+        if options["command"] == "convert":
+            from .binary import BinarySeries
+            return BinarySeries.convert(*options["files"])
+        if options["command"] == "serve":
+            from .server import GroundhogServer
+            return GroundhogServer(period, options).run()
+        if options["command"] == "query":
+            from .store import SeriesStore
+            return SeriesStore(options["files"][0]).query(None, *options["range"], options["format"])
+        if options["command"] == "store":
+            from .store import SeriesStore, EVERY
+            self.open_batch(options)
+            store = SeriesStore(options["files"][0], period, options["top"], options["every"] or EVERY)
+            return store.append(self.lines)
+        if options["batch"] or options["input"] or options["command"] == "offline" or options["keyed"]:
+            self.open_batch(options)
+        try:
+            if options["periods"]:
+                from .sweep import Sweep
+                return Sweep(Sweep.check_periods(options["periods"]), options).run(self)
+            if options["keyed"]:
+                from .keyed import KeyedGroundhog
+                return KeyedGroundhog(period, options["top"], detector=self.build(DETECTORS, options["detector"], period),
+                    trend=self.build(TRENDS, options["trend"], period)).run(self)
+            self.window = RollingWindow(period)
+            self.anomaly = Anomaly(options["top"])
+            if options["command"] == "offline":
+                return self.offline(period, options)
+            checkpoint = self.open_checkpoint(period, options)
+            self.writer = WRITERS[options["format"]](self)
+            self.detector = self.build(DETECTORS, options["detector"], period)
+            self.trend = self.build(TRENDS, options["trend"], period)
+            if options["rolling"]:
+                from .order import RollingOrder
+                self.order = RollingOrder(self.window)
+            if options["beyond"]:
+                from .sketch import Threshold
+                self.threshold = Threshold(options["beyond"])
+            from .stream import GroundhogStream
+            stream = GroundhogStream(period, options["top"], self)
+            if options["stats"]:
+                from .stats import Stats
+                self.stats = Stats(self, options["stats"], options["stats-file"])
+                self.stats.install()
+            while True:
+                try:
+                    self.handle_input(stream)
+                except ValueError:
+                    raise GroundhogError("Invalid input, please enter a valid number")
+                if checkpoint is not None:
+                    checkpoint.tick()
+        finally:
+            if self.out is not None:
+                self.out.flush()
+            if self.stats is not None:
+                self.stats.dump()
\ No newline at end of file
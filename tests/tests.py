@@ -1,5 +1,11 @@
-from code import Groundhog
-import unittest
+import io, json, math, os, random, subprocess, sys, tempfile, unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from source.wizard import Groundhog
+from source.window import RollingWindow
+from source.anomaly import Anomaly, EwmaBands, EwmaScore, Cusum
+from source import wizard, offline, sweep, keyed, pool, binary, checkpoint, server, stats, downsample, ingest, record, stream, sketch, order, parallel, store
+from benchmarks.bench import Series
+from bundle import Bundler
 
 class TestGroundhog(unittest.TestCase):
     def test_average(self):
@@ -8,30 +14,423 @@ class TestGroundhog(unittest.TestCase):
         data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3]
         data_1 = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2]
         period = 7
-        self.assertEqual(Groundhog.average_temp(period, r), 'nan')
-        self.assertEqual(float(Groundhog.average_temp(period, data)), 1.33)
-        self.assertEqual(float(Groundhog.average_temp(period, data_1)), 1.36)
+        self.assertTrue(math.isnan(Groundhog.average_temp(period, r)))
+        self.assertEqual(round(Groundhog.average_temp(period, data), 2), 1.33)
+        self.assertEqual(round(Groundhog.average_temp(period, data_1), 2), 1.36)
     
     def test_stdev(self):
         print("Testing calculation of stdev")
         data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2]
         data_ = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3]
         period = 7
-        self.assertEqual(float(Groundhog.stdev_function(data, period)), 2.40)
-        self.assertEqual(float(Groundhog.stdev_function(data_, period)), 2.06)
+        self.assertEqual(round(Groundhog.stdev_function(data, period), 2), 2.40)
+        self.assertEqual(round(Groundhog.stdev_function(data_, period), 2), 2.06)
     
     def test_temperature_increase(self):
         print("Testing calculation of temperature increase")
         data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2]
         period = 7
-        self.assertEqual(float(Groundhog.temperature_increase(data, period)), 29)
+        self.assertEqual(round(Groundhog().temperature_increase(data, period)), 29)
         
     def test_detect_switch_points(self):
         print("Testing swith")
         data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
         period = 7
-        self.assertEqual(Groundhog.detect_switch_points(data, period), "a switch occurs")
+        self.assertEqual(Groundhog().detect_switch_points(data, period), "a switch occurs")
         
+    def test_rolling_window(self):
+        print("Testing rolling window")
+        data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        period = 7
+        window = RollingWindow(period)
+        for i, value in enumerate(data):
+            window.push(value)
+            self.assertEqual(f'{window.average_temp():.2f}', f'{Groundhog.average_temp(period, data[:i + 1]):.2f}')
+            self.assertEqual(f'{window.standard_deviation():.2f}', f'{Groundhog.stdev_function(data[:i + 1], period):.2f}')
+        data = [1.0, -math.inf, 3.0, 4.0, 5.0, 6.0, 7.0]
+        window = RollingWindow(6)
+        for value in data:
+            window.push(value)
+        self.assertEqual(window.average_temp(), Groundhog.average_temp(6, data))
+        self.assertEqual(window.average_temp(), math.inf)
+        data = [27.7, 31.0, 32.7, 1e306, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        groundhog, restored = Groundhog(), Groundhog()
+        groundhog.window, groundhog.anomaly = RollingWindow(3), Anomaly(3)
+        for i, value in enumerate(data):
+            groundhog.window.push(value)
+            if i == 4:
+                checkpoint.Checkpoint.load(checkpoint.Checkpoint.dump(groundhog), restored)
+            elif i > 4:
+                restored.window.push(value)
+            exact = RollingWindow.exact_standard_deviation(data[max(0, i - 2):i + 1], 3)
+            self.assertEqual(f'{groundhog.window.standard_deviation():.2f}', "nan" if i < 2 else f'{exact:.2f}')
+            self.assertEqual(f'{groundhog.window.moving_average():.2f}', f'{sum(data[i - 2:i + 1]) / 3 if i >= 2 else math.nan:.2f}')
+        self.assertEqual((restored.window.standard_deviation(), restored.window.moving_average()),
+            (groundhog.window.standard_deviation(), groundhog.window.moving_average()))
+
+    def test_weirdest(self):
+        print("Testing weirdest values")
+        anomaly = Anomaly(3)
+        for index, value in enumerate([10.0, 20.0, 30.0, 40.0, 50.0]):
+            anomaly.observe(index, value, 30.0, 5.0)
+        self.assertEqual(anomaly.weirdest(), [10.0, 50.0, 20.0])
+
+    def test_read_lines(self):
+        print("Testing batch reading")
+        stream = io.BytesIO(b"27.7\r\n31.0\r32.7\nSTOP")
+        self.assertEqual(list(wizard.Groundhog.read_lines(stream, "utf-8")), ["27.7\r", "31.0\r32.7", "STOP"])
+
+    @unittest.skipIf(offline.np is None, "numpy is not installed")
+    def test_offline(self):
+        print("Testing offline analysis")
+        data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        period = 7
+        analysis = offline.OfflineAnalysis(data, period)
+        window = RollingWindow(period)
+        for i, value in enumerate(data):
+            window.push(value)
+            self.assertEqual(f'{analysis.g[i]:.2f}', f'{window.average_temp():.2f}')
+            self.assertEqual(f'{analysis.r[i]:.0f}', f'{window.temperature_increase():.0f}')
+            self.assertEqual(f'{analysis.s[i]:.2f}', f'{window.standard_deviation():.2f}')
+        self.assertEqual(analysis.switch(), 1)
+        data[3] = 1e306
+        analysis = offline.OfflineAnalysis(data, period)
+        for i in range(period - 1, len(data)):
+            s = RollingWindow.exact_standard_deviation(data[i - period + 1:i + 1], period)
+            self.assertTrue(math.isfinite(s))
+            self.assertEqual(f'{analysis.s[i]:.2f}', f'{s:.2f}')
+
+    @unittest.skipIf(offline.np is None, "numpy is not installed")
+    def test_parallel(self):
+        print("Testing parallel offline analysis")
+        data = list(Series.walk(600, 4))
+        for period, chunk, broken in ((0, 50, None), (7, 1, None), (7, 64, None), (30, 100, 450)):
+            values = list(data)
+            if broken is not None:
+                values[broken] = math.nan
+            sequential, chunked = offline.OfflineAnalysis(values, period, 3), parallel.ParallelAnalysis(values, period, 3, 2, chunk)
+            expected, result = io.StringIO(), io.StringIO()
+            sequential.write(expected)
+            chunked.write(result)
+            self.assertEqual(result.getvalue(), expected.getvalue())
+            self.assertEqual(chunked.broken, sequential.broken)
+            if broken is None:
+                self.assertEqual((chunked.switch(), chunked.weirdest()), (sequential.switch(), sequential.weirdest()))
+
+    @unittest.skipIf(keyed.np is None, "numpy is not installed")
+    def test_keyed(self):
+        print("Testing keyed analysis")
+        data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        period = 7
+        analysis = keyed.KeyedGroundhog(period, capacity=1)
+        lines = analysis.feed(["a", "b"] * len(data), [x for value in data for x in (value, -value)])
+        window = RollingWindow(period)
+        for i, value in enumerate(data):
+            window.push(value)
+            self.assertEqual(lines[2 * i].split("\t")[0], "a")
+            self.assertIn(f"g={window.average_temp():.2f}", lines[2 * i])
+            self.assertIn(f"s={window.standard_deviation():.2f}", lines[2 * i + 1])
+        self.assertEqual(analysis.keys, ["a", "b"])
+        self.assertEqual(analysis.switch.tolist(), [1, 2])
+        grouped = keyed.KeyedGroundhog(3, top=2, trend=Cusum(3))
+        series = {key: list(Series.walk(300, seed)) for seed, key in enumerate("xy")}
+        lines = grouped.feed([key for key in series for _ in series[key]], [x for key in series for x in series[key]])
+        for key in series:
+            expected = stream.GroundhogStream(3, 2, trend="cusum")
+            ticks = list(expected.feed_many(series[key]))
+            self.assertEqual(list(line.split("\t", 1)[1] for line in lines if line.startswith(key + "\t")),
+                list(f"g={t.g:.2f}\t\tr={t.r:.0f}%\t\ts={t.s:.2f}" + ("\t\ta switch occurs" if t.switch else "")
+                for t in ticks))
+            self.assertEqual(grouped.weirdest(grouped.rows[key]), expected.finish().weirdest)
+
+    def test_batch_driver(self):
+        print("Testing batch driver")
+        self.assertEqual(pool.BatchDriver.check_arg(["7", "a.txt", "b.txt", "-j", "3"])[:3], (7, ["a.txt", "b.txt"], 3))
+        self.assertRaises(wizard.GroundhogError, pool.BatchDriver.check_arg, ["7"])
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "series.txt")
+            with open(path, "w") as file:
+                file.write("\n".join(["1", "2", "3", "2", "STOP"]))
+            self.assertEqual(pool.BatchDriver.analyse(path, 1, 2), (0, ["Global tendency switched 1 times",
+                "2 weirdest values are [1.0, 2.0]"]))
+            self.assertEqual(pool.BatchDriver.analyse(path, 7, 2)[0], 84)
+            series = os.path.join(folder, "series.ghs")
+            binary.BinarySeries.convert(path, series)
+            self.assertEqual(pool.BatchDriver.analyse(series, 1, 2), pool.BatchDriver.analyse(path, 1, 2))
+            with open(path, "wb") as file:
+                file.write(b"1\n\xff\xfe\n2\nSTOP\n")
+            self.assertEqual(pool.BatchDriver.analyse(path, 1, 2),
+                (84, ["GroundhogError: Invalid input, please enter a valid number"]))
+
+    def test_binary_series(self):
+        print("Testing binary series")
+        with tempfile.TemporaryDirectory() as folder:
+            text, path = os.path.join(folder, "series.txt"), os.path.join(folder, "series.ghs")
+            with open(text, "w") as file:
+                file.write("\n".join(["27.7", "31", "-2.5e3", "STOP", "4"]))
+            self.assertEqual(binary.BinarySeries.convert(text, path), 3)
+            self.assertTrue(binary.BinarySeries.is_binary(path))
+            self.assertFalse(binary.BinarySeries.is_binary(text))
+            self.assertEqual(list(binary.BinarySeries(path).lines()), [27.7, 31.0, -2500.0, "STOP"])
+            self.assertRaises(wizard.GroundhogError, binary.BinarySeries, text)
+
+    def test_checkpoint(self):
+        print("Testing checkpoint")
+        data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        groundhog, restored = wizard.Groundhog(), wizard.Groundhog()
+        groundhog.window, groundhog.anomaly = RollingWindow(7), Anomaly(3)
+        groundhog.out = io.StringIO()
+        for value in data:
+            groundhog.feed(value)
+            groundhog.calculate_data(7)
+        state = checkpoint.Checkpoint.dump(groundhog)
+        checkpoint.Checkpoint.load(state, restored)
+        self.assertEqual(checkpoint.Checkpoint.dump(restored), state)
+        self.assertEqual(restored.metrics(), groundhog.metrics())
+        self.assertEqual(restored.anomaly.weirdest(), groundhog.anomaly.weirdest())
+        self.assertRaises(wizard.GroundhogError, checkpoint.Checkpoint.load, state[:-1] + b"x", restored)
+        result = subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+            "groundhog.py"), "7", "--batch", "--checkpoint", "state.bin"], input="1\nSTOP\n", capture_output=True, text=True)
+        self.assertEqual((result.returncode, result.stdout), (84, "GroundhogError: Invalid argument\n"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.bin")
+            outputs = []
+            for option, text in (("--checkpoint", "1\n2\n3\n"), ("--resume", "4\nSTOP\n")):
+                outputs.append(subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    "..", "groundhog.py"), "2", "--format", "csv", "--every", "1", option, path], input=text,
+                    capture_output=True, text=True).stdout.splitlines())
+        self.assertEqual(outputs[0][0], "index,value,g,r,s,switch,position,beyond,min,max,median,p95")
+        self.assertEqual(outputs[1][0], "3,4.0,1.0,100.0,0.5,0,0.75,0,,,,")
+
+    def test_server_session(self):
+        print("Testing server session")
+        session = server.Session(1, 5)
+        self.assertEqual(session.receive(b"1\r\n2"), "g=nan\t\tr=nan%\t\ts=0.00\n")
+        self.assertEqual(session.receive(b"\nSTOP\n3\n"), "g=1.00\t\tr=100%\t\ts=0.00\n"
+            "Global tendency switched 0 times\n5 weirdest values are [1.0, 2.0]\n")
+        self.assertTrue(session.done)
+        session = server.Session(1, 5)
+        self.assertEqual(session.receive(b"x\n"), "GroundhogError: Invalid Type\n")
+        self.assertTrue(session.done)
+
+    def test_not_finite(self):
+        print("Testing increases that are not numbers")
+        for value in ("inf", "nan", "1e308"):
+            result = subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                "groundhog.py"), "1"], input=f"1\n2\n{value}\n3\nSTOP\n", capture_output=True, text=True)
+            self.assertEqual(result.returncode, 84)
+            self.assertEqual(result.stdout.splitlines()[-1], "GroundhogError: Invalid input, please enter a valid number")
+            self.assertEqual(len(result.stdout.splitlines()), 3)
+        analysis = stream.GroundhogStream(1)
+        list(analysis.feed_many(["1", "2"]))
+        self.assertRaises(wizard.GroundhogError, analysis.feed, "inf")
+
+    def test_writers(self):
+        print("Testing output formats")
+        outputs = {}
+        for style in ("text", "csv", "ndjson"):
+            groundhog = wizard.Groundhog()
+            groundhog.window, groundhog.anomaly = RollingWindow(1), Anomaly(5)
+            groundhog.order = order.RollingOrder(groundhog.window)
+            groundhog.out = io.StringIO()
+            groundhog.writer = record.WRITERS[style](groundhog)
+            for value in [1.0, 2.0, 1.0]:
+                groundhog.feed(value)
+            groundhog.report(*groundhog.calculate_data(1))
+            outputs[style] = groundhog.out.getvalue().splitlines()
+        self.assertEqual(outputs["text"][2], "g=0.00\t\tr=-50%\t\ts=0.00\t\tmin=1.00\t\tmax=1.00"
+            "\t\tmedian=1.00\t\tp95=1.00\t\ta switch occurs")
+        self.assertEqual(outputs["csv"][3], "2,1.0,0.0,-50.0,0.0,1,,0,1.0,1.0,1.0,1.0")
+        self.assertEqual(outputs["csv"][-1], "# weirdest,1.0,2.0,1.0")
+        self.assertEqual(json.loads(outputs["ndjson"][1]), {"index": 1, "value": 2.0, "g": 1.0, "r": 100.0,
+            "s": 0.0, "switch": False, "position": None, "beyond": False, "min": 2.0, "max": 2.0, "median": 2.0,
+            "p95": 2.0})
+        self.assertEqual(json.loads(outputs["ndjson"][-1]), {"switches": 1, "weirdest": [1.0, 2.0, 1.0]})
+
+    def test_stream(self):
+        print("Testing library stream")
+        data = [27.7, 31.0, 32.7, 34.7, 35.9, 37.4, 38.2, 39.5, 40.3, 42.2, 41.3, 40.4, 39.8, 38.7, 36.5]
+        analysis = stream.GroundhogStream(7, 3)
+        self.assertRaises(wizard.GroundhogError, analysis.finish)
+        ticks = list(analysis.feed_many(data[:-1]))
+        tick = analysis.feed(str(data[-1]))
+        self.assertEqual(f"{ticks[9].g:.2f} {ticks[9].r:.0f} {ticks[9].s:.2f}", "1.36 29 2.40")
+        self.assertFalse(any(tick.switch for tick in ticks))
+        self.assertEqual((tick.index, tick.switch), (len(data) - 1, True))
+        summary = analysis.finish()
+        self.assertEqual((summary.switches, summary.top, summary.weirdest), (1, 3, [36.5, 42.2, 38.7]))
+        self.assertRaises(wizard.GroundhogError, analysis.feed, "x")
+        self.assertRaises(wizard.GroundhogError, stream.GroundhogStream, -1)
+
+    @unittest.skipIf(keyed.np is None, "numpy is not installed")
+    def test_detectors(self):
+        print("Testing constant state detectors")
+        data = list(Series.walk(500, 11))
+        for kind in (EwmaBands, EwmaScore, Cusum):
+            single, rows = kind(7), kind(7)
+            state = keyed.np.array([kind.INITIAL] * 2)
+            for value in data:
+                output, state = rows.batch(state, keyed.np.array([value, value]))
+                expected = single.update(value)
+                self.assertEqual(list(map(repr, output.tolist())), [repr(expected)] * 2)
+        bands, score = EwmaBands(3), EwmaScore(3)
+        for value in (10.0, 11.0, 10.0):
+            self.assertTrue(math.isnan(bands.update(value)) and math.isnan(score.update(value)))
+        self.assertAlmostEqual((bands.update(12.0) - .5) * 4, score.update(12.0))
+        trend = Cusum(5)
+        switches = [trend.update(value) for value in [10.0, 11.0] * 10 + [float(value) for value in range(12, 40)]
+            + [float(value) for value in range(40, 0, -1)]]
+        self.assertEqual(sum(switches), 1)
+        analysis = stream.GroundhogStream(5, 2, detector="zscore", trend="cusum")
+        ticks = list(analysis.feed_many(data))
+        self.assertEqual(analysis.finish().switches, sum(tick.switch for tick in ticks))
+        self.assertRaises(wizard.GroundhogError, stream.GroundhogStream, 5, detector="x")
+
+    def test_order(self):
+        print("Testing rolling order statistics")
+        data = [float(value % 13) for value in Series.walk(2000, 5)] + [4.0] * 30
+        for period in (1, 2, 7, 20):
+            analysis = stream.GroundhogStream(period, rolling=True)
+            for i, tick in enumerate(analysis.feed_many(data)):
+                if i + 1 < period:
+                    self.assertTrue(all(math.isnan(value) for value in tick.rolling))
+                    continue
+                window = sorted(data[i + 1 - period:i + 1])
+                expected = [window[0], window[-1]]
+                for q in (.5, .95):
+                    position = (period - 1) * q
+                    lower = window[int(position)]
+                    fraction = position - int(position)
+                    expected.append(lower + (window[int(position) + 1] - lower) * fraction if fraction else lower)
+                self.assertEqual(list(tick.rolling), expected)
+            for quantile in analysis.groundhog.order.quantiles:
+                self.assertLessEqual(len(quantile.low) + len(quantile.high), 2 * period + 16)
+
+    def test_store(self):
+        print("Testing indexed store")
+        data = list(Series.walk(300, 6))
+        groundhog = wizard.Groundhog()
+        groundhog.window, groundhog.anomaly, groundhog.out = RollingWindow(7), Anomaly(5), io.StringIO()
+        for value in data:
+            groundhog.feed(value)
+        expected = groundhog.out.getvalue().splitlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "series")
+            self.assertEqual(store.SeriesStore(path, 7, 5, 16).append(iter(data[:100] + ["STOP"])), 100)
+            self.assertEqual(store.SeriesStore(path, 7).append(map(str, data[100:])), 300)
+            self.assertEqual(binary.BinarySeries(path).view.tolist(), data)
+            self.assertRaises(wizard.GroundhogError, store.SeriesStore, path, 8)
+            self.assertRaises(wizard.GroundhogError, store.SeriesStore(path).append, ["1", "x"])
+            for start, end in ((0, 300), (0, 5), (15, 17), (16, 48), (250, 300), (300, 300)):
+                out = io.StringIO()
+                store.SeriesStore(path).query(out, start, end)
+                self.assertEqual(out.getvalue().splitlines(), expected[start:end])
+            self.assertRaises(wizard.GroundhogError, store.SeriesStore(path).query, io.StringIO(), 10, 301)
+
+    def test_sketch(self):
+        print("Testing quantile sketch")
+        values = [(i * 7919) % 10007 for i in range(20000)]
+        whole, first, second = sketch.QuantileSketch(), sketch.QuantileSketch(), sketch.QuantileSketch()
+        for i, value in enumerate(values):
+            whole.update(value)
+            (first if i % 2 else second).update(value)
+        first.merge(second)
+        for estimate in (whole, first):
+            self.assertLess(sum(map(len, estimate.compactors)), 1000)
+            self.assertEqual(estimate.count, 20000)
+            self.assertAlmostEqual(estimate.quantile(.9) / 10007, .9, delta=.02)
+            self.assertAlmostEqual(estimate.rank(5003), .5, delta=.02)
+        threshold = sketch.Threshold(99)
+        flags = [threshold.beyond(value) for value in values]
+        self.assertFalse(any(flags[:100]))
+        self.assertAlmostEqual(sum(flags) / len(flags), .01, delta=.01)
+        rng = random.Random(7)
+        values = [rng.random() for _ in range(200000)]
+        threshold = sketch.Threshold(99.9)
+        flags = [threshold.beyond(value) for value in values]
+        self.assertAlmostEqual(sum(flags) / len(flags), .001, delta=.0003)
+        self.assertAlmostEqual(sum(value <= threshold.limit for value in values) / len(values), .999, delta=.0003)
+
+    def test_stats(self):
+        print("Testing stats")
+        groundhog = wizard.Groundhog()
+        groundhog.window, groundhog.anomaly = RollingWindow(3), Anomaly()
+        groundhog.out = io.StringIO()
+        instrument = stats.Stats(groundhog, "prometheus")
+        instrument.install()
+        for value in ["1", "5", "2", "8"]:
+            groundhog.feed(groundhog.check_input(value))
+            groundhog.calculate_data(3)
+        self.assertRaises(wizard.GroundhogError, groundhog.check_input, "x")
+        snapshot = instrument.snapshot()
+        self.assertEqual((snapshot["samples"], snapshot["parse_errors"], snapshot["switches"]), (4, 1, groundhog.switch))
+        self.assertEqual(snapshot["stages"]["window"]["calls"], 4)
+        before = sum(instrument.seconds.values())
+        start = stats.time.perf_counter_ns()
+        groundhog.feed(9.0)
+        elapsed = stats.time.perf_counter_ns() - start
+        self.assertLessEqual(sum(instrument.seconds.values()) - before, elapsed)
+        self.assertIn('groundhog_stage_calls_total{stage="parse"} 4', instrument.render())
+        self.assertRaises(wizard.GroundhogError, stats.Stats, groundhog, "xml")
+
+    @unittest.skipIf(downsample.np is None, "numpy is not installed")
+    def test_downsample(self):
+        print("Testing downsampling")
+        values = [float(x % 17) for x in range(10000)]
+        values[4321] = 100.0
+        for method in ("minmax", "lttb"):
+            indexes = downsample.Downsample.select(values, 100, [42], method=method).tolist()
+            self.assertLessEqual(len(indexes), 203)
+            self.assertTrue({0, 42, 4321, 9999} <= set(indexes))
+            self.assertEqual(indexes, sorted(set(indexes)))
+        self.assertEqual(downsample.Downsample.select(values, 100, [5], 10, 20).tolist(), list(range(10, 20)))
+
+    def test_bulk_parser(self):
+        print("Testing bulk parsing")
+        content = "\n".join(["temperature"] + [str(x / 4) for x in range(20000)] + ["", "12,5", " 3 "]).encode()
+        values, rejected = ingest.BulkParser.parse(content)
+        self.assertEqual(values.tolist(), [x / 4 for x in range(20000)] + [3.0])
+        self.assertEqual(rejected, [1, 20003])
+        values, rejected = ingest.BulkParser.parse(b"1.5\r\n-2\r\n")
+        self.assertEqual((values.tolist(), rejected), ([1.5, -2.0], []))
+
+    def test_series(self):
+        print("Testing benchmark series")
+        series = list(Series.walk(10000, 1))
+        self.assertEqual(series, list(Series.walk(10000, 1)))
+        self.assertNotEqual(series, list(Series.walk(10000, 2)))
+        self.assertEqual(len(series), 10000)
+
+    def test_bundle(self):
+        print("Testing single file build")
+        entry = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "groundhog.py")
+        self.assertTrue({"__main__", "source", "source.wizard", "source.stream"} <= set(Bundler.modules(entry)))
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, "groundhog")
+            Bundler.build(entry, target)
+            result = subprocess.run([sys.executable, target, "1"], input="1\n2\nSTOP\n", capture_output=True,
+                text=True, cwd=directory)
+        self.assertEqual((result.returncode, result.stdout.splitlines()[-2]), (0, "Global tendency switched 0 times"))
+
+    def test_check_periods(self):
+        print("Testing periods parsing")
+        self.assertEqual(sweep.Sweep.check_periods("30,7,14-16,20-28:4,7"), [7, 14, 15, 16, 20, 24, 28, 30])
+        self.assertRaises(wizard.GroundhogError, sweep.Sweep.check_periods, "7,x")
+
+    def test_sweep_errors(self):
+        print("Testing periods failing alone")
+        program = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "groundhog.py")
+        text = "1\n2\n3\nnan\n5\n6\n7\n8\nSTOP\n"
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run([sys.executable, program, "--periods", "1,5", "--output", directory], input=text,
+                capture_output=True, text=True)
+            self.assertEqual(result.returncode, 84)
+            for period in (1, 5):
+                with open(os.path.join(directory, f"groundhog_{period}.txt")) as file:
+                    alone = subprocess.run([sys.executable, program, str(period)], input=text, capture_output=True,
+                        text=True)
+                    self.assertEqual(file.read(), alone.stdout)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file